@@ -231,7 +231,7 @@ async def main():
                     print_target_hist=False,
                 )
 
-        # Federate models (note that this will also change the model in models[0]
+        # Federate models
         for worker_id, worker_model, worker_loss in results:
             if worker_model is not None:
                 models[worker_id] = worker_model
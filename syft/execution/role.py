@@ -11,6 +11,7 @@ from syft.execution.action import Action
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.placeholder_id import PlaceholderId
 from syft.execution.state import State
+from syft.generic import communication
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.workers.abstract import AbstractWorker
 
@@ -203,11 +204,12 @@ class Role(SyftSerializable):
         kwargs_ = self._fetch_placeholders_from_ids(kwargs_)
         return_placeholder = self._fetch_placeholders_from_ids(return_placeholder)
 
-        if _self is None:
-            method = self._fetch_package_method(cmd)
-            response = method(*args_, **kwargs_)
-        else:
-            response = getattr(_self, cmd)(*args_, **kwargs_)
+        with communication.tracking(f"Plan action {cmd}"):
+            if _self is None:
+                method = self._fetch_package_method(cmd)
+                response = method(*args_, **kwargs_)
+            else:
+                response = getattr(_self, cmd)(*args_, **kwargs_)
 
         if not isinstance(response, (tuple, list)):
             response = (response,)
@@ -1,12 +1,27 @@
-import numpy as np
+import inspect
 import torch as th
+from torch.nn.utils import parameters_to_vector
 from torch.utils.data import BatchSampler, RandomSampler, SequentialSampler
 from typing import Union
 
 from syft.generic.object_storage import ObjectStore
+from syft.federated.metrics import EvaluationMetrics
 from syft.federated.train_config import TrainConfig
 
 
+class _BatchedDataset(th.utils.data.Dataset):
+    """Dataset whose items are the batches of a dataset with a get_batch method."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, indices):
+        return self.dataset.get_batch(indices)
+
+
 class FederatedClient:
     """A Client able to execute federated learning in local datasets."""
 
@@ -16,6 +31,10 @@ class FederatedClient:
         self.optimizer = None
         self.train_config = None
         self.object_store = ObjectStore(owner=self)
+        self.update_encoder = None
+        self._initial_params = None
+        # Version and parameters of the models received, see apply_model_delta
+        self.model_snapshots = {}
 
     def add_dataset(self, dataset, key: str):
         if key not in self.datasets:
@@ -100,26 +119,135 @@ class FederatedClient:
             self.train_config.optimizer, model, optimizer_args=self.train_config.optimizer_args
         )
 
+        if self.update_encoder is not None:
+            self._initial_params = parameters_to_vector(model.parameters()).detach().clone()
+
         return self._fit(model=model, dataset_key=dataset_key, loss_fn=loss_fn, device=device)
 
-    def _create_data_loader(self, dataset_key: str, shuffle: bool = False):
-        data_range = range(len(self.datasets[dataset_key]))
+    def set_update_encoder(self, encoder_args: dict = None):
+        """Compress the model updates returned by get_encoded_update.
+
+        Args:
+            encoder_args: The arguments of the UpdateEncoder, like bits and top_k.
+                If None, the updates are not compressed anymore.
+        """
+        from syft.frameworks.torch.fl.compression import UpdateEncoder
+
+        self.update_encoder = None if encoder_args is None else UpdateEncoder(**encoder_args)
+        self._initial_params = None
+
+    def get_encoded_update(self) -> dict:
+        """Returns the compressed update of the model of the TrainConfig by the last fit.
+
+        The update is the difference between the parameters after and before the
+        last fit. The compression error is kept by the encoder and added to the
+        next update, see UpdateEncoder.
+
+        Returns:
+            The encoded update, see decode_update.
+        """
+        self._check_train_config()
+        if self._initial_params is None:
+            raise ValueError("get_encoded_update needs an update encoder set before the fit.")
+
+        model = self.object_store.get_obj(self.train_config._model_id).obj
+        update = parameters_to_vector(model.parameters()).detach() - self._initial_params
+        self._initial_params = None
+        return self.update_encoder.encode(update)
+
+    def set_model_version(self, obj_id: Union[str, int], version: int):
+        """Records the version of a model received, to which deltas can then be applied.
+
+        Args:
+            obj_id: The id of the ObjectWrapper of the model.
+            version: The version of the model.
+        """
+        model = self.object_store.get_obj(obj_id).obj
+        params = parameters_to_vector(model.parameters()).detach().clone()
+        self.model_snapshots[obj_id] = (version, params)
+
+    def apply_model_delta(
+        self, obj_id: Union[str, int], version: int, encoded: dict, new_version: int
+    ) -> bool:
+        """Updates in place a model received before with the delta to a new version.
+
+        The delta is relative to the parameters of the model as received, so the
+        training since then is overwritten.
+
+        Args:
+            obj_id: The id of the ObjectWrapper of the model.
+            version: The version the delta is relative to.
+            encoded: The delta, encoded by an UpdateEncoder.
+            new_version: The version of the model after the delta.
+
+        Returns:
+            False if the model or its version is not held, in which case the
+            model must be sent again, True otherwise.
+        """
+        from syft.frameworks.torch.fl.compression import decode_update
+
+        wrapper = self.object_store.find_by_id(obj_id)
+        snapshot = self.model_snapshots.get(obj_id)
+        if wrapper is None or snapshot is None or snapshot[0] != version:
+            self.model_snapshots.pop(obj_id, None)
+            return False
+
+        params = snapshot[1] + decode_update(encoded)
+        offset = 0
+        with th.no_grad():
+            for param in wrapper.obj.parameters():
+                param.copy_(params[offset : offset + param.numel()].view_as(param))
+                offset += param.numel()
+
+        self.model_snapshots[obj_id] = (new_version, params)
+        return True
+
+    def _create_data_loader(
+        self, dataset_key: str, shuffle: bool = False, pin_memory: bool = False
+    ):
+        """Creates a data loader on a local dataset, as specified in the TrainConfig.
+
+        Datasets with a get_batch method, like BaseDataset and MemmapDataset, are
+        read batch by batch instead of item by item.
+
+        Args:
+            dataset_key: Identifier of the local dataset.
+            shuffle: If True, the dataset is accessed randomly.
+            pin_memory: If True, the batches are copied to pinned memory, which
+                speeds up their copy to a CUDA device.
+        """
+        dataset = self.datasets[dataset_key]
+        data_range = range(len(dataset))
         if shuffle:
             sampler = RandomSampler(data_range)
         else:
             sampler = SequentialSampler(data_range)
+
+        loader_args = {"num_workers": self.train_config.num_workers, "pin_memory": pin_memory}
+        if self.train_config.num_workers > 0:
+            # Only available from torch 1.7
+            supported_args = inspect.signature(th.utils.data.DataLoader).parameters
+            for name in ("prefetch_factor", "persistent_workers"):
+                if name in supported_args:
+                    loader_args[name] = getattr(self.train_config, name)
+
+        if hasattr(dataset, "get_batch"):
+            batch_sampler = BatchSampler(sampler, self.train_config.batch_size, drop_last=False)
+            return th.utils.data.DataLoader(
+                _BatchedDataset(dataset), batch_size=None, sampler=batch_sampler, **loader_args
+            )
+
         data_loader = th.utils.data.DataLoader(
-            self.datasets[dataset_key],
-            batch_size=self.train_config.batch_size,
-            sampler=sampler,
-            num_workers=0,
+            dataset, batch_size=self.train_config.batch_size, sampler=sampler, **loader_args
         )
         return data_loader
 
     def _fit(self, model, dataset_key, loss_fn, device="cpu"):
         model.train()
         data_loader = self._create_data_loader(
-            dataset_key=dataset_key, shuffle=self.train_config.shuffle
+            dataset_key=dataset_key,
+            shuffle=self.train_config.shuffle,
+            pin_memory=th.device(device).type == "cuda",
         )
 
         loss = None
@@ -170,51 +298,58 @@ class FederatedClient:
                 * histogram_predictions: histogram of predictions.
                 * histogram_target: histogram of target values in the dataset.
         """
+        nr_bins = nr_bins if return_histograms else -1
+        metrics = self._evaluate(dataset_key, nr_bins, device, compute_loss=return_loss)
+
+        eval_result = dict()
+        if return_loss:
+            eval_result["loss"] = metrics.loss
+        if return_raw_accuracy:
+            eval_result["nr_correct_predictions"] = metrics.nr_correct.item()
+            eval_result["nr_predictions"] = metrics.nr_predictions
+        if return_histograms:
+            eval_result["histogram_predictions"] = metrics.histogram_pred.double().cpu().numpy()
+            eval_result["histogram_target"] = metrics.histogram_target.double().cpu().numpy()
+
+        return eval_result
+
+    def evaluate_metrics(self, dataset_key: str, nr_bins: int = -1, device: str = "cpu") -> dict:
+        """Evaluates a model on the local dataset and returns mergeable metrics.
+
+        Args:
+            dataset_key: Identifier of the local dataset that shall be used for evaluation.
+            nr_bins: Number of classes/bins of the histograms and the confusion
+                matrix, -1 to skip them.
+            device: "cuda" or "cpu"
+
+        Returns:
+            The state of the EvaluationMetrics, see EvaluationMetrics.from_state.
+        """
+        return self._evaluate(dataset_key, nr_bins, device).state()
+
+    def _evaluate(self, dataset_key: str, nr_bins: int, device: str, compute_loss: bool = True):
         self._check_train_config()
 
         if dataset_key not in self.datasets:
             raise ValueError(f"Dataset {dataset_key} unknown.")
 
-        eval_result = dict()
         model = self.object_store.get_obj(self.train_config._model_id).obj
         loss_fn = self.object_store.get_obj(self.train_config._loss_fn_id).obj
         model.eval()
         device = "cuda" if device == "cuda" else "cpu"
-        data_loader = self._create_data_loader(dataset_key=dataset_key, shuffle=False)
-        test_loss = 0.0
-        correct = 0
-        if return_histograms:
-            hist_target = np.zeros(nr_bins)
-            hist_pred = np.zeros(nr_bins)
+        data_loader = self._create_data_loader(
+            dataset_key=dataset_key, shuffle=False, pin_memory=device == "cuda"
+        )
+        metrics = EvaluationMetrics(nr_bins, device=device)
 
         with th.no_grad():
             for data, target in data_loader:
                 data, target = data.to(device), target.to(device)
                 output = model(data)
-                if return_loss:
-                    test_loss += loss_fn(output, target).item()  # sum up batch loss
-                pred = output.argmax(
-                    dim=1, keepdim=True
-                )  # get the index of the max log-probability
-                if return_histograms:
-                    hist, _ = np.histogram(target, bins=nr_bins, range=(0, nr_bins))
-                    hist_target += hist
-                    hist, _ = np.histogram(pred, bins=nr_bins, range=(0, nr_bins))
-                    hist_pred += hist
-                if return_raw_accuracy:
-                    correct += pred.eq(target.view_as(pred)).sum().item()
-
-        if return_loss:
-            test_loss /= len(data_loader.dataset)
-            eval_result["loss"] = test_loss
-        if return_raw_accuracy:
-            eval_result["nr_correct_predictions"] = correct
-            eval_result["nr_predictions"] = len(data_loader.dataset)
-        if return_histograms:
-            eval_result["histogram_predictions"] = hist_pred
-            eval_result["histogram_target"] = hist_target
+                loss = loss_fn(output, target) if compute_loss else None
+                metrics.update(output, target, loss=loss)
 
-        return eval_result
+        return metrics
 
     def _log_msgs(self, value):
         self.log_msgs = value
@@ -0,0 +1,169 @@
+import asyncio
+import functools
+import logging
+from typing import Dict
+from typing import List
+
+import torch
+
+from syft.federated.train_config import TrainConfig
+from syft.workers.base import BaseWorker
+
+logger = logging.getLogger(__name__)
+
+# The tensors accumulating the metrics
+ACCUMULATORS = ("loss_sum", "nr_correct", "histogram_target", "histogram_pred", "confusion_matrix")
+
+
+class EvaluationMetrics:
+    """Mergeable accumulators of the evaluation of a classification model.
+
+    The accumulators are tensors which stay on the device of the evaluation
+    until the results are read. Their state is a small dict of tensors whatever
+    the size of the dataset, so the metrics of several workers can be merged
+    without moving their data.
+    """
+
+    def __init__(self, nr_bins: int = -1, device: str = "cpu"):
+        """Initializer for EvaluationMetrics.
+
+        Args:
+            nr_bins: Number of classes/bins of the histograms and the confusion
+                matrix, -1 to skip them.
+            device: The device of the accumulators.
+        """
+        self.nr_bins = nr_bins
+        self.loss_sum = torch.zeros((), device=device)
+        self.nr_correct = torch.zeros((), dtype=torch.long, device=device)
+        self.nr_predictions = 0
+        self.histogram_target = None
+        self.histogram_pred = None
+        self.confusion_matrix = None
+        if nr_bins > 0:
+            self.histogram_target = torch.zeros(nr_bins, dtype=torch.long, device=device)
+            self.histogram_pred = torch.zeros(nr_bins, dtype=torch.long, device=device)
+            self.confusion_matrix = torch.zeros(nr_bins, nr_bins, dtype=torch.long, device=device)
+
+    def update(self, output: torch.Tensor, target: torch.Tensor, loss: torch.Tensor = None):
+        """Accumulates the metrics of a batch.
+
+        Args:
+            output: The output of the model, with the scores of the classes along dim 1.
+            target: The target classes.
+            loss: The loss of the batch, None to skip it.
+        """
+        pred = output.argmax(dim=1).view(-1).long()
+        target = target.view(-1).long()
+
+        if loss is not None:
+            self.loss_sum += loss.detach()
+        self.nr_correct += pred.eq(target).sum()
+        self.nr_predictions += target.numel()
+
+        if self.nr_bins > 0:
+            # The classes out of range are counted with a weight of 0 instead of
+            # being masked out, which hooked tensors don't support
+            nr_bins = self.nr_bins
+            target_in_range = ((target >= 0) * (target < nr_bins)).long()
+            pred_in_range = ((pred >= 0) * (pred < nr_bins)).long()
+            target = target.clamp(0, nr_bins - 1)
+            pred = pred.clamp(0, nr_bins - 1)
+            self.histogram_target.scatter_add_(0, target, target_in_range)
+            self.histogram_pred.scatter_add_(0, pred, pred_in_range)
+            self.confusion_matrix.view(-1).scatter_add_(
+                0, target * nr_bins + pred, target_in_range * pred_in_range
+            )
+
+    def merge(self, other: "EvaluationMetrics") -> "EvaluationMetrics":
+        """Adds the metrics of another evaluation, like the one of another worker."""
+        if other.nr_bins != self.nr_bins:
+            raise ValueError("Only metrics with the same number of bins can be merged.")
+
+        for name in ACCUMULATORS:
+            accumulator = getattr(self, name)
+            if accumulator is not None:
+                accumulator += getattr(other, name).to(accumulator.device)
+        self.nr_predictions += other.nr_predictions
+        return self
+
+    def state(self) -> Dict:
+        """Returns the accumulators in a compact dict which can be sent, see from_state."""
+        state = {"nr_bins": self.nr_bins, "nr_predictions": self.nr_predictions}
+        for name in ACCUMULATORS:
+            accumulator = getattr(self, name)
+            state[name] = None if accumulator is None else accumulator.cpu()
+        return state
+
+    @staticmethod
+    def from_state(state: Dict) -> "EvaluationMetrics":
+        """Builds the metrics from their state."""
+        metrics = EvaluationMetrics()
+        for name, value in state.items():
+            setattr(metrics, name, value)
+        return metrics
+
+    @property
+    def loss(self) -> float:
+        """Sum of the losses of the batches over the number of predictions."""
+        return self.loss_sum.item() / self.nr_predictions if self.nr_predictions else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        """Fraction of correct predictions."""
+        return self.nr_correct.item() / self.nr_predictions if self.nr_predictions else 0.0
+
+
+async def evaluate_workers(
+    workers: List[BaseWorker],
+    dataset_key: str,
+    nr_bins: int = -1,
+    model: torch.jit.ScriptModule = None,
+    loss_fn: torch.jit.ScriptModule = None,
+    device: str = "cpu",
+) -> tuple:
+    """Evaluates a model on the datasets of several workers and merges the metrics.
+
+    Workers with their own connection, like WebsocketClientWorker, are evaluated
+    concurrently in threads. The evaluation of the other workers, like
+    VirtualWorker, runs in the event loop one worker at a time.
+
+    Args:
+        workers: The workers holding the evaluation datasets.
+        dataset_key: Identifier of the dataset used on each worker.
+        nr_bins: Number of classes/bins of the histograms and the confusion
+            matrix, -1 to skip them.
+        model: If not None, the model is sent to the workers in a TrainConfig with
+            loss_fn. Otherwise the model of the TrainConfig last sent is evaluated.
+        loss_fn: The loss function sent with model.
+        device: "cuda" or "cpu"
+
+    Returns:
+        A tuple with the merged EvaluationMetrics and a dict with the
+        EvaluationMetrics of each worker id.
+    """
+    loop = asyncio.get_event_loop()
+
+    async def evaluate_worker(worker):
+        if model is not None:
+            TrainConfig(model=model, loss_fn=loss_fn).send(worker)
+        evaluate = functools.partial(
+            worker.evaluate_metrics, dataset_key=dataset_key, nr_bins=nr_bins, device=device
+        )
+        if hasattr(worker, "async_fit"):
+            state = await loop.run_in_executor(None, evaluate)
+        else:
+            state = evaluate()
+        return worker.id, EvaluationMetrics.from_state(state)
+
+    results = await asyncio.gather(*[evaluate_worker(worker) for worker in workers])
+
+    metrics = EvaluationMetrics(nr_bins)
+    for _, worker_metrics in results:
+        metrics.merge(worker_metrics)
+    logger.info(
+        "Evaluated %s predictions on %s workers, accuracy %.4f",
+        metrics.nr_predictions,
+        len(workers),
+        metrics.accuracy,
+    )
+    return metrics, dict(results)
@@ -0,0 +1,98 @@
+import logging
+
+import torch
+from torch.nn.utils import parameters_to_vector
+
+import syft as sy
+from syft.frameworks.torch.fl.compression import UpdateEncoder
+from syft.frameworks.torch.fl.compression import decode_update
+from syft.frameworks.torch.fl.compression import encoded_size
+from syft.generic.pointers.object_wrapper import ObjectWrapper
+from syft.workers.abstract import AbstractWorker
+from syft.workers.base import BaseWorker
+
+logger = logging.getLogger(__name__)
+
+
+class ModelBroadcaster:
+    """Send the successive versions of a model to workers as deltas.
+
+    The first time a model is sent to a worker, it is sent in full in an
+    ObjectWrapper. The next times, only the difference between the new
+    parameters and the parameters the worker received last is sent, optionally
+    compressed, and the worker applies it in place to the model it holds. If the
+    worker doesn't hold the version the delta is relative to anymore, for
+    instance because the model was retrieved with get(), the model is sent in
+    full again.
+
+    The deltas are relative to the parameters received, not to the parameters
+    after training, so the workers keep a copy of the parameters of the models
+    received, see FederatedClient.apply_model_delta.
+
+    Example:
+        ```
+        broadcaster = ModelBroadcaster(encoder_args={"bits": 8})
+        for curr_round in range(rounds):
+            train_config = sy.TrainConfig(model=model, loss_fn=loss_fn)
+            train_config.send(alice, broadcaster=broadcaster)
+            ...
+        ```
+    """
+
+    def __init__(self, owner: AbstractWorker = None, encoder_args: dict = None):
+        """Initializer for ModelBroadcaster.
+
+        Args:
+            owner: The worker sending the models, the local worker by default.
+            encoder_args: If not None, the deltas are compressed by an UpdateEncoder
+                with these arguments, like bits and top_k. The compression errors
+                are sent with the next delta.
+        """
+        self.owner = owner if owner else sy.hook.local_worker
+        self.encoder_args = encoder_args
+
+        # worker id -> (pointer to the model, version, parameters held by the worker)
+        self.states = {}
+
+        self.full_sends = 0
+        self.delta_sends = 0
+        self.sent_bytes = 0
+
+    def _encode(self, delta: torch.Tensor) -> dict:
+        # The errors are kept in the parameters held by the worker, which are
+        # known here, so the encoder doesn't need to keep them
+        encoder_args = dict(self.encoder_args or {}, error_feedback=False)
+        return UpdateEncoder(**encoder_args).encode(delta)
+
+    def send(self, model: torch.nn.Module, location: BaseWorker):
+        """Send a model to a worker, as a delta if the worker holds a previous version.
+
+        Args:
+            model: The model to send.
+            location: The worker to send it to.
+        Returns:
+            A tuple with the pointer to the ObjectWrapper of the model and its id at
+            location.
+        """
+        params = parameters_to_vector(model.parameters()).detach()
+
+        if location.id in self.states:
+            ptr, version, held_params = self.states[location.id]
+            encoded = self._encode(params - held_params)
+            if location.apply_model_delta(ptr.id_at_location, version, encoded, version + 1):
+                held_params = held_params + decode_update(encoded)
+                self.states[location.id] = (ptr, version + 1, held_params)
+                self.delta_sends += 1
+                self.sent_bytes += encoded_size(encoded)
+                return ptr, ptr.id_at_location
+
+            logger.info("Worker %s doesn't hold version %s, sending it again", location.id, version)
+
+        obj_with_id = ObjectWrapper(id=sy.ID_PROVIDER.pop(), obj=model)
+        ptr = self.owner.send(obj_with_id, location)
+        location.set_model_version(ptr.id_at_location, 0)
+        # The pointer is kept so that the model isn't garbage collected on the worker
+        self.states[location.id] = (ptr, 0, params.clone())
+        self.full_sends += 1
+        self.sent_bytes += params.numel() * params.element_size()
+        return ptr, ptr.id_at_location
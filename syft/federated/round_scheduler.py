@@ -0,0 +1,213 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import List
+
+import torch
+
+import syft as sy
+from syft.federated.model_broadcaster import ModelBroadcaster
+from syft.federated.train_config import TrainConfig
+from syft.frameworks.torch.fl.compression import encoded_size
+from syft.frameworks.torch.fl.utils import StreamingAggregator
+from syft.workers.base import BaseWorker
+
+logger = logging.getLogger(__name__)
+
+
+class RoundScheduler:
+    """Schedule federated training rounds over many workers.
+
+    In each round, the model is sent to every worker in a TrainConfig and
+    trained on the worker's dataset, with at most max_concurrency workers
+    training at the same time. The trained models are aggregated as soon as
+    they are received with a StreamingAggregator. Failed or timed out fits are
+    retried and the workers which still fail are left out of the round.
+
+    Workers with an async_fit method, like WebsocketClientWorker, train
+    concurrently, and the model is sent to them and retrieved in a thread so
+    that the other workers keep training meanwhile. The calls to the other
+    workers, like VirtualWorker, block the event loop and run one worker at a time.
+
+    Example:
+        ```
+        scheduler = RoundScheduler(
+            workers, loss_fn, "mnist", max_concurrency=50, timeout=60, batch_size=32
+        )
+        model = asyncio.get_event_loop().run_until_complete(scheduler.fit(traced_model, 10))
+        scheduler.history[-1]["latencies"]  # worker id -> seconds
+        ```
+    """
+
+    def __init__(
+        self,
+        workers: List[BaseWorker],
+        loss_fn: torch.jit.ScriptModule,
+        dataset_key: str,
+        max_concurrency: int = 10,
+        timeout: float = None,
+        retries: int = 0,
+        aggregator_args: dict = None,
+        encoder_args: dict = None,
+        broadcaster: ModelBroadcaster = None,
+        **train_config_args,
+    ):
+        """Initializer for RoundScheduler.
+
+        Args:
+            workers: The workers holding the training datasets.
+            loss_fn: A jit function representing the loss function.
+            dataset_key: Identifier of the dataset used for training on each worker.
+            max_concurrency: Maximum number of workers training at the same time.
+            timeout: Maximum number of seconds of each fit, None for no limit.
+            retries: Number of times a failed or timed out fit is retried.
+            aggregator_args: Arguments of the StreamingAggregator of each round, like
+                weights, deadline, quorum and late_weight.
+            encoder_args: If not None, the workers send their updates compressed by an
+                UpdateEncoder with these arguments, like bits and top_k.
+            broadcaster: If not None, the model is sent to the workers which hold
+                the model of the previous round as a delta, see ModelBroadcaster.
+                The workers then send their updates with an UpdateEncoder, without
+                compression if encoder_args is None, so that they keep their model.
+            **train_config_args: Arguments of the TrainConfig sent to the workers, like
+                batch_size, epochs, optimizer and optimizer_args.
+        """
+        self.workers = workers
+        self.loss_fn = loss_fn
+        self.dataset_key = dataset_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.aggregator_args = aggregator_args or {}
+        self.encoder_args = encoder_args
+        if broadcaster is not None and encoder_args is None:
+            self.encoder_args = {}
+        self.broadcaster = broadcaster
+        self.train_config_args = train_config_args
+
+        # Ids of the workers whose update encoder is set
+        self._encoding_workers = set()
+
+        # One report per round
+        self.history = []
+
+    @staticmethod
+    async def _call(worker: BaseWorker, function, *args, **kwargs):
+        """Run a blocking call to a worker, in a thread if the worker has an async_fit method."""
+        call = functools.partial(function, *args, **kwargs)
+        if hasattr(worker, "async_fit"):
+            return await asyncio.get_event_loop().run_in_executor(None, call)
+        return call()
+
+    async def _fit(self, worker: BaseWorker):
+        """Run the fit of the TrainConfig already sent to a worker."""
+        if hasattr(worker, "async_fit"):
+            return await worker.async_fit(
+                dataset_key=self.dataset_key, return_ids=[sy.ID_PROVIDER.pop()]
+            )
+        return worker.fit(dataset_key=self.dataset_key)
+
+    async def _fit_worker(
+        self, worker: BaseWorker, model: torch.jit.ScriptModule, semaphore, report: dict
+    ):
+        """Train the model on a worker and return the trained model and its last loss.
+
+        The trained model is its encoded update if encoder_args is set, and None if
+        all the attempts failed.
+        """
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                start = time.time()
+                try:
+                    train_config = TrainConfig(
+                        model=model, loss_fn=self.loss_fn, **self.train_config_args
+                    )
+                    await self._call(
+                        worker, train_config.send, worker, broadcaster=self.broadcaster
+                    )
+                    if self.encoder_args is not None and worker.id not in self._encoding_workers:
+                        # The encoder keeps its residual on the worker between the rounds
+                        await self._call(worker, worker.set_update_encoder, self.encoder_args)
+                        self._encoding_workers.add(worker.id)
+                    loss = await asyncio.wait_for(self._fit(worker), self.timeout)
+                    if self.encoder_args is None:
+                        trained_model = (await self._call(worker, train_config.model_ptr.get)).obj
+                    else:
+                        trained_model = await self._call(worker, worker.get_encoded_update)
+                        report["upload_bytes"][worker.id] = encoded_size(trained_model)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(
+                        "Fit on worker %s failed (attempt %s/%s): %r",
+                        worker.id,
+                        attempt + 1,
+                        self.retries + 1,
+                        e,
+                    )
+                    report["failures"][worker.id] = repr(e)
+                    if isinstance(e, asyncio.TimeoutError) and hasattr(worker, "connect"):
+                        # async_fit was cancelled while its standard connection was closed
+                        try:
+                            await self._call(worker, worker.connect)
+                        except Exception as e:
+                            logger.warning("Reconnection to worker %s failed: %r", worker.id, e)
+                    continue
+
+                report["latencies"][worker.id] = time.time() - start
+                report["losses"][worker.id] = loss
+                report["failures"].pop(worker.id, None)
+                return trained_model, loss
+
+        return None, None
+
+    async def run_round(self, model: torch.jit.ScriptModule) -> torch.jit.ScriptModule:
+        """Run a training round on all the workers.
+
+        Args:
+            model: The model to train.
+        Returns:
+            The aggregated model, or the model given if no worker succeeded.
+        """
+        report = {"latencies": {}, "losses": {}, "failures": {}, "upload_bytes": {}}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        aggregator = StreamingAggregator(model, **self.aggregator_args)
+        start = time.time()
+
+        if not self.workers:
+            raise ValueError("At least one worker is needed to run a round.")
+
+        updates = {
+            worker.id: self._fit_worker(worker, model, semaphore, report) for worker in self.workers
+        }
+        try:
+            model = await aggregator.aggregate(updates)
+        except ValueError:
+            logger.error("No model was received in this round, the model is not updated.")
+
+        report["dropped"] = list(aggregator.dropped)
+        report["round_time"] = time.time() - start
+        self.history.append(report)
+        logger.info(
+            "Round %s: %s/%s workers in %.2fs, slowest %.2fs",
+            len(self.history),
+            len(aggregator.received),
+            len(self.workers),
+            report["round_time"],
+            max(report["latencies"].values(), default=0.0),
+        )
+        return model
+
+    async def fit(self, model: torch.jit.ScriptModule, rounds: int = 1) -> torch.jit.ScriptModule:
+        """Run several training rounds, each one starting from the previous aggregated model.
+
+        Args:
+            model: The initial model.
+            rounds: The number of rounds.
+        Returns:
+            The model aggregated in the last round.
+        """
+        for _ in range(rounds):
+            model = await self.run_round(model)
+        return model
@@ -31,6 +31,9 @@ class TrainConfig(SyftSerializable):
         shuffle: bool = True,
         loss_fn_id: int = None,
         model_id: int = None,
+        num_workers: int = 0,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
     ):
         """Initializer for TrainConfig.
 
@@ -51,6 +54,11 @@ class TrainConfig(SyftSerializable):
             loss_fn_id: The id_at_location of (the ObjectWrapper of) a loss function which
                         shall be used to calculate the loss. This is used internally for train config deserialization.
             model_id: id_at_location of a traced torch nn.Module instance (objectwrapper). . This is used internally for train config deserialization.
+            num_workers: Number of processes loading the batches on the worker, 0 to load them
+                         in the training thread.
+            prefetch_factor: Number of batches loaded in advance by each loading process.
+            persistent_workers: If True, the loading processes are kept between the epochs.
+                                prefetch_factor and persistent_workers need torch >= 1.7.
         """
         # syft related attributes
         self.owner = owner if owner else sy.hook.local_worker
@@ -66,6 +74,9 @@ class TrainConfig(SyftSerializable):
         self.optimizer_args = optimizer_args
         self.max_nr_batches = max_nr_batches
         self.shuffle = shuffle
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self.persistent_workers = persistent_workers
 
         # pointers
         self.model_ptr = None
@@ -99,7 +110,7 @@ class TrainConfig(SyftSerializable):
         obj_id = obj_ptr.id_at_location
         return obj_ptr, obj_id
 
-    def send(self, location: BaseWorker) -> weakref:
+    def send(self, location: BaseWorker, broadcaster=None) -> weakref:
         """Gets the pointer to a new remote object.
 
         One of the most commonly used methods in PySyft, this method serializes
@@ -111,11 +122,16 @@ class TrainConfig(SyftSerializable):
             location: The BaseWorker object which you want to send this object
                 to. Note that this is never actually the BaseWorker but instead
                 a class which instantiates the BaseWorker abstraction.
+            broadcaster: An optional ModelBroadcaster, which sends the model as a
+                delta to the model sent before to location.
         Returns:
             A weakref instance.
         """
         # Send traced model
-        self.model_ptr, self._model_id = self._wrap_and_send_obj(self.model, location)
+        if broadcaster is None:
+            self.model_ptr, self._model_id = self._wrap_and_send_obj(self.model, location)
+        else:
+            self.model_ptr, self._model_id = broadcaster.send(self.model, location)
 
         # Send loss function
         self.loss_fn_ptr, self._loss_fn_id = self._wrap_and_send_obj(self.loss_fn, location)
@@ -161,6 +177,9 @@ class TrainConfig(SyftSerializable):
             sy.serde.msgpack.serde._simplify(worker, train_config.id),
             train_config.max_nr_batches,
             train_config.shuffle,
+            train_config.num_workers,
+            train_config.prefetch_factor,
+            train_config.persistent_workers,
         )
 
     @staticmethod
@@ -184,6 +203,9 @@ class TrainConfig(SyftSerializable):
             id,
             max_nr_batches,
             shuffle,
+            num_workers,
+            prefetch_factor,
+            persistent_workers,
         ) = train_config_tuple
 
         id = sy.serde.msgpack.serde._detail(worker, id)
@@ -203,6 +225,9 @@ class TrainConfig(SyftSerializable):
             optimizer_args=detailed_optimizer_args,
             max_nr_batches=max_nr_batches,
             shuffle=shuffle,
+            num_workers=num_workers,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
         )
 
         return train_config
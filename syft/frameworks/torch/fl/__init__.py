@@ -1,3 +1,4 @@
 from .dataset import BaseDataset
 from .dataset import FederatedDataset
+from .dataset import MemmapDataset
 from .dataloader import FederatedDataLoader
@@ -0,0 +1,167 @@
+"""
+Compression of the model updates sent by the workers
+
+An update, the difference between the parameters of a model after and before
+training flattened in a vector, is encoded by an UpdateEncoder with:
+    - top-k sparsification: only the top_k fraction of the values with the
+        largest magnitude are kept, with their indices
+    - threshold sparsification: only the values whose magnitude is at least
+        threshold are kept, with their indices
+    - stochastic quantization: the (kept) values are rounded up or down at
+        random to one of 2 ** bits levels between their min and max, so that
+        the rounding is unbiased. 4 bit levels are packed 2 per byte.
+
+With error feedback, the encoder keeps what was lost by the compression and
+adds it to the next update, so that nothing is lost over the rounds.
+
+The encoded update is a dict of tensors and numbers, which can be sent by any
+worker, and is decoded by decode_update.
+
+Example:
+    ```
+    encoder = UpdateEncoder(bits=8, top_k=0.01)
+    encoded = encoder.encode(new_params - params)
+    update = decode_update(encoded)
+    encoder.compression_ratio  # ~ 80
+    ```
+"""
+import torch
+
+BITS = (4, 8)
+
+
+def _quantize(values: torch.Tensor, bits: int) -> dict:
+    """Stochastically quantize values on 2 ** bits levels"""
+    levels = 2 ** bits - 1
+    low = values.min().item() if values.numel() else 0.0
+    high = values.max().item() if values.numel() else 0.0
+    scale = (high - low) / levels or 1.0
+
+    rounded = ((values - low) / scale + torch.rand_like(values)).floor_().clamp_(0, levels)
+    quantized = rounded.to(torch.uint8)
+    if bits == 4:
+        if quantized.numel() % 2:
+            quantized = torch.cat([quantized, quantized.new_zeros(1)])
+        quantized = quantized[0::2] + quantized[1::2] * 16
+
+    return {"bits": bits, "low": low, "scale": scale, "count": values.numel(), "values": quantized}
+
+
+def _dequantize(encoded: dict) -> torch.Tensor:
+    quantized = encoded["values"]
+    if encoded["bits"] == 4:
+        quantized = torch.stack([quantized % 16, quantized // 16], dim=1).view(-1)
+        quantized = quantized[: encoded["count"]]
+    return quantized.float() * encoded["scale"] + encoded["low"]
+
+
+def decode_update(encoded: dict) -> torch.Tensor:
+    """Return the dense update vector of an update encoded by an UpdateEncoder"""
+    if encoded["bits"] is None:
+        values = encoded["values"]
+    else:
+        values = _dequantize(encoded)
+
+    if encoded["indices"] is None:
+        return values
+
+    update = torch.zeros(encoded["size"], dtype=values.dtype)
+    update.index_copy_(0, encoded["indices"].long().view(-1), values)
+    return update
+
+
+def encoded_size(encoded: dict) -> int:
+    """Return the number of bytes of the tensors of an encoded update"""
+    return sum(
+        value.numel() * value.element_size()
+        for value in encoded.values()
+        if isinstance(value, torch.Tensor)
+    )
+
+
+class UpdateEncoder:
+    """
+    Compress the successive updates of a worker
+
+    Args:
+        bits (int): if not None, the values are quantized on 4 or 8 bits
+        top_k (float): if not None, the fraction of the values which are kept
+        threshold (float): if not None, the values with a smaller magnitude are
+            dropped. Can't be used with top_k.
+        error_feedback (bool): if True, the compression error of each update is
+            added to the next one
+
+    Attributes:
+        residual (torch.Tensor): the compression error carried to the next update
+        raw_bytes (int): the number of bytes of the updates encoded
+        encoded_bytes (int): the number of bytes of the encoded updates
+        relative_error (float): the relative L2 error of the last encoded update
+    """
+
+    def __init__(
+        self,
+        bits: int = None,
+        top_k: float = None,
+        threshold: float = None,
+        error_feedback: bool = True,
+    ):
+        if bits is not None and bits not in BITS:
+            raise ValueError(f"Updates can only be quantized on {BITS} bits, not {bits}.")
+        if top_k is not None and threshold is not None:
+            raise ValueError("top_k and threshold sparsification can't be used together.")
+        if top_k is not None and not 0 < top_k <= 1:
+            raise ValueError("top_k is the fraction of the values kept, in ]0, 1].")
+
+        self.bits = bits
+        self.top_k = top_k
+        self.threshold = threshold
+        self.error_feedback = error_feedback
+
+        self.residual = None
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.relative_error = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Number of bytes of the updates over number of bytes of the encoded updates"""
+        return self.raw_bytes / self.encoded_bytes if self.encoded_bytes else 1.0
+
+    def encode(self, update: torch.Tensor) -> dict:
+        """
+        Encode an update
+
+        Args:
+            update (torch.Tensor): the update, flattened if it isn't a vector
+
+        Returns:
+            the encoded update, see decode_update
+        """
+        update = update.detach().reshape(-1)
+        if self.error_feedback and self.residual is not None:
+            update = update + self.residual
+
+        indices = None
+        if self.top_k is not None:
+            k = max(1, int(round(self.top_k * update.numel())))
+            indices = update.abs().topk(k, sorted=False)[1]
+        elif self.threshold is not None:
+            indices = (update.abs() >= self.threshold).nonzero().view(-1)
+        values = update if indices is None else update.index_select(0, indices.view(-1))
+
+        if self.bits is None:
+            encoded = {"bits": None, "values": values}
+        else:
+            encoded = _quantize(values, self.bits)
+        encoded["size"] = update.numel()
+        encoded["indices"] = None if indices is None else indices.int()
+
+        error = update - decode_update(encoded)
+        if self.error_feedback:
+            self.residual = error
+        norm = update.norm().item()
+        self.relative_error = error.norm().item() / norm if norm else 0.0
+
+        self.raw_bytes += update.numel() * update.element_size()
+        self.encoded_bytes += encoded_size(encoded)
+        return encoded
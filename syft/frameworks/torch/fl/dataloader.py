@@ -2,9 +2,14 @@ import torch
 from torch.utils.data import SequentialSampler, RandomSampler, BatchSampler
 from torch._six import string_classes, int_classes, container_abcs
 
+from collections import deque
+import itertools
 import logging
 import math
 
+from syft.frameworks.torch.fl.dataset import BaseDataset
+from syft.generic.pointers.pointer_dataset import PointerDataset
+
 numpy_type_map = {
     "float64": torch.DoubleTensor,
     "float32": torch.FloatTensor,
@@ -50,6 +55,77 @@ def default_collate(batch):
     raise TypeError((error_msg.format(type(batch[0]))))
 
 
+def collate_samples(dataset, indices, collate_fn=default_collate):
+    """
+    Builds the batch of the samples of a dataset at the given indices
+
+    With the default collate function, the samples of a BaseDataset or of a
+    pointer to it are fetched at once with get_batch, instead of indexing the
+    dataset once per sample and stacking the results, which costs one remote
+    command per sample when the data is remote.
+    """
+    if collate_fn is default_collate and isinstance(dataset, (BaseDataset, PointerDataset)):
+        return dataset.get_batch(indices)
+
+    return collate_fn([dataset[i] for i in indices])
+
+
+def collate_batches(dataset, batches_indices, collate_fn=default_collate):
+    """
+    Builds several batches of a dataset at once, see collate_samples
+
+    With the default collate function, a pointer to a BaseDataset fetches the
+    items of all the batches with a single remote get_batch command.
+    """
+    if collate_fn is default_collate and isinstance(dataset, (BaseDataset, PointerDataset)):
+        return dataset.get_batches(batches_indices)
+
+    return [collate_samples(dataset, indices, collate_fn) for indices in batches_indices]
+
+
+class _BatchQueue(object):
+    """
+    Iterates over the batches of the dataset of a worker. If prefetch_factor > 0,
+    the queue is refilled with the next prefetch_factor batches at once when it
+    is empty, so that their items are fetched in a single request. The refill is
+    synchronous: it doesn't overlap with the training, it only saves the round
+    trips of the batches which follow the first one.
+    """
+
+    def __init__(self, dataset, sample_iter, collate_fn, prefetch_factor=0):
+        self.dataset = dataset
+        self.sample_iter = sample_iter
+        self.collate_fn = collate_fn
+        self.prefetch_factor = prefetch_factor
+        self.batches = deque(maxlen=max(1, prefetch_factor))
+
+    def __next__(self):
+        if not self.batches:
+            self._fill()
+        if not self.batches:
+            raise StopIteration
+        return self.batches.popleft()
+
+    def __iter__(self):
+        return self
+
+    def _fill(self):
+        if self.prefetch_factor == 0:
+            indices = next(self.sample_iter, None)
+            if indices is not None:
+                self.batches.append(collate_samples(self.dataset, indices, self.collate_fn))
+            return
+
+        batches_indices = list(itertools.islice(self.sample_iter, self.prefetch_factor))
+        if batches_indices:
+            self.batches.extend(collate_batches(self.dataset, batches_indices, self.collate_fn))
+
+    def close(self):
+        """Drop the batches prefetched, which releases the remote data they point to"""
+        self.batches.clear()
+        self.sample_iter = iter(())
+
+
 class _DataLoaderIter(object):
     """Iterates once over the DataLoader's dataset, as specified by the samplers"""
 
@@ -65,10 +141,16 @@ class _DataLoaderIter(object):
         # The function used to stack all samples together
         self.collate_fn = loader.collate_fn
 
-        # Create a sample iterator for each worker
+        # Create a sample iterator and a queue of batches for each worker
         self.sample_iter = {
             worker: iter(batch_sampler) for worker, batch_sampler in loader.batch_samplers.items()
         }
+        self.batch_queues = {
+            worker: _BatchQueue(
+                self.federated_dataset[worker], sample_iter, self.collate_fn, loader.prefetch_factor
+            )
+            for worker, sample_iter in self.sample_iter.items()
+        }
 
     def __len__(self):
         return len(self.federated_dataset)
@@ -81,8 +163,7 @@ class _DataLoaderIter(object):
         worker = self.workers[self.worker_idx]
 
         try:
-            indices = next(self.sample_iter[worker])
-            batch = self.collate_fn([self.federated_dataset[worker][i] for i in indices])
+            batch = next(self.batch_queues[worker])
             return batch
         # All the data for this worker has been used
         except StopIteration:
@@ -105,8 +186,16 @@ class _DataLoaderIter(object):
     def __iter__(self):
         return self
 
+    def close(self):
+        for batch_queue in self.batch_queues.values():
+            batch_queue.close()
+
+    def __del__(self):
+        self.close()
+
     def stop(self):
         self.worker_idx = -1
+        self.close()
         raise StopIteration
 
 
@@ -123,8 +212,14 @@ class _DataLoaderOneWorkerIter(object):
         # The function used to stack all samples together
         self.collate_fn = loader.collate_fn
 
-        # Create a sample iterator for each worker
+        # Create a sample iterator and a queue of batches for the worker
         self.sample_iter = iter(loader.batch_samplers[self.worker])
+        self.batch_queue = _BatchQueue(
+            self.federated_dataset[self.worker],
+            self.sample_iter,
+            self.collate_fn,
+            loader.prefetch_factor,
+        )
 
     def _get_batch(self):
         # If all workers have been used, end the iterator
@@ -132,8 +227,7 @@ class _DataLoaderOneWorkerIter(object):
             self.stop()
 
         try:
-            indices = next(self.sample_iter)
-            batch = self.collate_fn([self.federated_dataset[self.worker][i] for i in indices])
+            batch = next(self.batch_queue)
             return batch
         # All the data for this worker has been used
         except StopIteration:
@@ -151,8 +245,15 @@ class _DataLoaderOneWorkerIter(object):
     def __iter__(self):
         return self
 
+    def close(self):
+        self.batch_queue.close()
+
+    def __del__(self):
+        self.close()
+
     def stop(self):
         self.worker = None
+        self.close()
         raise StopIteration
 
 
@@ -177,6 +278,10 @@ class FederatedDataLoader(object):
             the effect is to retrieve num_iterators epochs of data but at each step data from num_iterators distinct
             workers is returned.
         iter_per_worker (bool): if set to true, __next__() will return a dictionary containing one batch per worker
+        prefetch_factor (int): number of batches fetched at once from each worker, in a
+            single request, when the batches fetched before are used up. The request
+            blocks the iterator, no batch is fetched in the background. 0 fetches
+            each batch with its own request. (default: ``0``)
     """
 
     __initialized = False
@@ -190,6 +295,7 @@ class FederatedDataLoader(object):
         drop_last=False,
         collate_fn=default_collate,
         iter_per_worker=False,
+        prefetch_factor=0,
         **kwargs,
     ):
         if len(kwargs) > 0:
@@ -208,6 +314,7 @@ class FederatedDataLoader(object):
         self.batch_size = batch_size
         self.drop_last = drop_last
         self.collate_fn = collate_fn
+        self.prefetch_factor = prefetch_factor
         self.iter_class = _DataLoaderOneWorkerIter if iter_per_worker else _DataLoaderIter
 
         # Build a batch sampler per worker
@@ -232,6 +339,10 @@ class FederatedDataLoader(object):
                 self.num_iterators = min(num_iterators, len(self.workers) - 1)
 
     def __iter__(self):
+        # Release the batches prefetched by the previous iterators
+        for iterator in getattr(self, "iterators", []):
+            iterator.close()
+
         self.iterators = list()
         for idx in range(self.num_iterators):
             self.iterators.append(self.iter_class(self, worker_idx=idx))
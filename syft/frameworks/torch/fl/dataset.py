@@ -1,8 +1,10 @@
 import math
 import logging
+import numpy as np
 from syft.generic.object import AbstractObject
 from syft.workers.base import BaseWorker
 from syft.generic.pointers.pointer_dataset import PointerDataset
+from syft.generic.pointers.pointer_tensor import PointerTensor
 import torch
 from torch.utils.data import Dataset
 import syft
@@ -22,16 +24,20 @@ class BaseDataset(AbstractObject):
         data[list,torch tensors]: the data points
         targets: Corresponding labels of the data points
         transform: Function to transform the datapoints
+        batch_transform[bool]: if True, the transform is applied to the tensor of a
+            whole batch of datapoints, stacked along the first dimension, instead
+            of the NumPy array of each datapoint
 
     """
 
-    def __init__(self, data, targets, transform=None, owner=None, **kwargs):
+    def __init__(self, data, targets, transform=None, owner=None, batch_transform=False, **kwargs):
         if owner is None:
             owner = syft.framework.hook.local_worker
         super().__init__(owner=owner, **kwargs)
         self.data = data
         self.targets = targets
         self.transform_ = transform
+        self.batch_transform = batch_transform
 
     def __len__(self):
         return len(self.data)
@@ -50,11 +56,67 @@ class BaseDataset(AbstractObject):
         """
         data_elem = self.data[index]
         if self.transform_ is not None:
-            # TODO: avoid passing through numpy domain
-            data_elem = torch.tensor(self.transform_(data_elem.numpy()))
+            data_elem = self._transform_item(data_elem)
 
         return data_elem, self.targets[index]
 
+    def _transform_item(self, data_elem):
+        """Apply the transform to a single datapoint"""
+        if self.batch_transform:
+            return self.transform_(data_elem.unsqueeze(0))[0]
+        # TODO: avoid passing through numpy domain
+        return torch.tensor(self.transform_(data_elem.numpy()))
+
+    def get_batch(self, indices):
+
+        """
+        Gets several items at once, stacked like the default collate function
+        of the FederatedDataLoader does. When the data is remote, the indices are
+        sent once and each of data and targets is indexed with a single command.
+        A batch transform is applied once to the whole batch.
+
+        Args:
+
+            indices[list of integers, LongTensor]: indices of the items to get
+
+        Returns:
+
+            data: Data points corresponding to the given indices
+            targets: Targets correspoding to given datapoints
+        """
+        tensors = isinstance(self.data, torch.Tensor) and isinstance(self.targets, torch.Tensor)
+        item_transform = self.transform_ is not None and not self.batch_transform
+        if item_transform or not tensors:
+            items = zip(*[self[int(index)] for index in indices])
+            return tuple(
+                torch.stack(elems) if isinstance(elems[0], torch.Tensor) else torch.tensor(elems)
+                for elems in items
+            )
+
+        indices = torch.as_tensor(indices, dtype=torch.long)
+        if hasattr(self.data, "child") and isinstance(self.data.child, PointerTensor):
+            indices = indices.send(self.data.location)
+
+        data = self.data.index_select(0, indices)
+        if self.transform_ is not None:
+            data = self.transform_(data)
+        return data, self.targets.index_select(0, indices)
+
+    def get_batches(self, batches_indices):
+
+        """
+        Gets several batches at once, see get_batch
+
+        Args:
+
+            batches_indices[list]: the indices of the items of each batch
+
+        Returns:
+
+            a list of (data, targets) pairs, one per batch
+        """
+        return [self.get_batch(indices) for indices in batches_indices]
+
     def transform(self, transform):
 
         """
@@ -196,6 +258,106 @@ class BaseDataset(AbstractObject):
         return dataset
 
 
+class MemmapDataset(BaseDataset):
+    """
+    A BaseDataset whose data and targets are NumPy arrays memory-mapped from .npy
+    files, so that only the items read are loaded in memory instead of the whole
+    dataset. It is meant to be added to the datasets of a worker with add_dataset,
+    where it is read batch by batch with get_batch, and can't be sent.
+
+    Args:
+
+        data_path[str]: the .npy file of the data points
+        targets_path[str]: the .npy file of the corresponding labels
+        transform: Function to transform the datapoints
+
+    """
+
+    def __init__(self, data_path, targets_path, transform=None, owner=None, **kwargs):
+        self.data_path = data_path
+        self.targets_path = targets_path
+        super().__init__(
+            np.load(data_path, mmap_mode="r"),
+            np.load(targets_path, mmap_mode="r"),
+            transform=transform,
+            owner=owner,
+            **kwargs,
+        )
+
+    @staticmethod
+    def create(data, targets, data_path, targets_path, transform=None, **kwargs):
+
+        """
+        Saves data and targets to .npy files and memory-maps them
+
+        Args:
+
+            data[torch tensor, numpy array]: the data points
+            targets[torch tensor, numpy array]: the corresponding labels
+            data_path[str]: the .npy file to save the data points to
+            targets_path[str]: the .npy file to save the labels to
+
+        Returns:
+
+            a MemmapDataset reading the files saved
+        """
+        for array, path in ((data, data_path), (targets, targets_path)):
+            if isinstance(array, torch.Tensor):
+                array = array.detach().cpu().numpy()
+            np.save(path, array)
+        return MemmapDataset(data_path, targets_path, transform=transform, **kwargs)
+
+    def __getitem__(self, index):
+        data_elem = torch.from_numpy(np.array(self.data[index]))
+        if self.transform_ is not None:
+            data_elem = self._transform_item(data_elem)
+
+        return data_elem, torch.from_numpy(np.array(self.targets[index]))
+
+    def get_batch(self, indices):
+
+        """
+        Reads several items at once from the files, in the order of their offsets.
+
+        Args:
+
+            indices[list of integers, LongTensor]: indices of the items to get
+
+        Returns:
+
+            data: Data points corresponding to the given indices
+            targets: Targets correspoding to given datapoints
+        """
+        if self.transform_ is not None and not self.batch_transform:
+            return super().get_batch(indices)
+
+        indices = np.asarray(indices, dtype=np.int64)
+        order = np.argsort(indices)
+        inverse = np.argsort(order)
+        sorted_indices = indices[order]
+
+        data = torch.from_numpy(np.asarray(self.data[sorted_indices][inverse]))
+        targets = torch.from_numpy(np.asarray(self.targets[sorted_indices][inverse]))
+        if self.transform_ is not None:
+            data = self.transform_(data)
+        return data, targets
+
+    def send(self, location: BaseWorker):
+        raise TypeError("A MemmapDataset can't be sent, its files must be created on the worker")
+
+    def __getstate__(self):
+        # The arrays are memory-mapped again instead of being copied, like for the
+        # processes of a DataLoader
+        state = self.__dict__.copy()
+        state["data"] = state["targets"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.data = np.load(self.data_path, mmap_mode="r")
+        self.targets = np.load(self.targets_path, mmap_mode="r")
+
+
 def dataset_federate(dataset, workers):
     """
     Add a method to easily transform a torch.Dataset or a sy.BaseDataset
@@ -1,5 +1,12 @@
+import asyncio
+import copy
+import io
+import time
 import syft as sy
 import torch
+from syft.frameworks.torch.fl.compression import decode_update
+from torch.nn.utils import parameters_to_vector
+from typing import Awaitable
 from typing import Dict
 from typing import Any
 import logging
@@ -69,7 +76,239 @@ def scale_model(model, scale):
     return model
 
 
-def federated_avg(models: Dict[Any, torch.nn.Module]) -> torch.nn.Module:
+def copy_model(model: torch.nn.Module) -> torch.nn.Module:
+    """Return a copy of a model with its own parameters.
+
+    Script modules can't be deep copied, so they are copied through their
+    serialized form, like when they are sent to a worker.
+
+    Args:
+        model (torch.nn.Module): the model to copy, a torch.jit.ScriptModule or not.
+    Returns:
+        torch.nn.Module: the copy.
+    """
+    if isinstance(model, torch.jit.ScriptModule):
+        return torch.jit.load(io.BytesIO(model.save_to_buffer()))
+    return copy.deepcopy(model)
+
+
+class ModelAverager:
+    """Weighted average of the parameters of models which arrive one at a time.
+
+    Each model is flattened once into a contiguous vector which is accumulated in
+    place into a preallocated buffer, so the models added are never modified and
+    can be released as soon as they are added.
+
+    Args:
+        model (torch.nn.Module): optional model with the architecture of the models
+            to average, used to preallocate the buffer and as template of the result.
+            If None, a copy of the first model added is used, so that the model itself
+            can be released.
+    """
+
+    def __init__(self, model: torch.nn.Module = None):
+        self.template = model
+        self.total = None
+        self.total_weight = 0.0
+        self.nr_models = 0
+        self._base = None
+        if model is not None:
+            nr_params = sum(param.numel() for param in model.parameters())
+            self.total = torch.zeros(nr_params, device=next(model.parameters()).device)
+
+    def add(self, model: torch.nn.Module, weight: float = 1.0):
+        """Add the parameters of a model to the average.
+
+        Args:
+            model (torch.nn.Module): the model to add, which is not modified.
+            weight (float): the weight of the model, like its number of training samples.
+        """
+        with torch.no_grad():
+            vector = parameters_to_vector(model.parameters())
+            if self.total is None:
+                self.template = copy_model(model)
+                self.total = torch.zeros_like(vector)
+            self.total.add_(vector, alpha=weight)
+        self.total_weight += weight
+        self.nr_models += 1
+
+    def add_encoded(self, encoded: dict, weight: float = 1.0):
+        """Add a model given by its update from the template, encoded by an UpdateEncoder.
+
+        Args:
+            encoded (dict): the encoded update, see decode_update.
+            weight (float): the weight of the model, like its number of training samples.
+        """
+        if self.template is None:
+            raise ValueError("Encoded updates can only be added to an averager with a template.")
+        with torch.no_grad():
+            if self._base is None:
+                self._base = parameters_to_vector(self.template.parameters())
+            self.total.add_(self._base, alpha=weight)
+            self.total.add_(decode_update(encoded).to(self.total.device), alpha=weight)
+        self.total_weight += weight
+        self.nr_models += 1
+
+    def average(self) -> torch.Tensor:
+        """Return the weighted average of the parameters added as a flat vector."""
+        if not self.total_weight:
+            raise ValueError("At least one model with a non zero weight must be added.")
+        return self.total / self.total_weight
+
+    def result(self, model: torch.nn.Module = None) -> torch.nn.Module:
+        """Return a model whose parameters are the weighted average.
+
+        Args:
+            model (torch.nn.Module): the model in which the average is written. If None,
+                a copy of the template is returned, see copy_model.
+        Returns:
+            torch.nn.Module: the module with averaged parameters.
+        """
+        average = self.average()
+        if model is None:
+            model = copy_model(self.template)
+        # Parameters are written in place, which also works for the parameters of
+        # script modules which can't be reassigned
+        offset = 0
+        with torch.no_grad():
+            for param in model.parameters():
+                nr_params = param.numel()
+                param.copy_(average[offset : offset + nr_params].view_as(param))
+                offset += nr_params
+        return model
+
+    def reset(self):
+        """Start a new average, keeping the buffer allocated."""
+        if self.total is not None:
+            self.total.zero_()
+        self.total_weight = 0.0
+        self.nr_models = 0
+
+
+class StreamingAggregator:
+    """Aggregate the models of the workers as soon as each of them finishes training.
+
+    Each update is folded into a running weighted average and no reference to the
+    model is kept, so at most one client model is in memory at a time. A deadline
+    and a quorum decide what happens with the workers which are late:
+
+        * before the deadline, every update is averaged with its weight.
+        * after the deadline, the aggregation stops as soon as quorum updates have
+          been received and the remaining workers are dropped. Updates received
+          after the deadline are discounted by late_weight.
+
+    Args:
+        model (torch.nn.Module): optional model with the architecture of the updates,
+            see ModelAverager. Required for encoded updates, which are relative to it.
+        weights (Dict[Any, float]): optional weight of the update of each worker id,
+            like its number of training samples. Defaults to 1.
+        deadline (float): seconds after the start of the aggregation after which
+            the updates are late. If None, all the updates are waited for.
+        quorum (int): minimal number of updates to wait for after the deadline.
+        late_weight (float): factor applied to the weight of the late updates.
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module = None,
+        weights: Dict[Any, float] = None,
+        deadline: float = None,
+        quorum: int = 1,
+        late_weight: float = 1.0,
+    ):
+        self.averager = ModelAverager(model)
+        self.weights = weights or {}
+        self.deadline = deadline
+        self.quorum = quorum
+        self.late_weight = late_weight
+        self.received = []
+        self.late = []
+        self.dropped = []
+        self.results = {}
+
+    def add(self, worker_id, model: torch.nn.Module, *results, late: bool = False):
+        """Fold the update of a worker into the average.
+
+        Args:
+            worker_id: the id of the worker which sent the update.
+            model (torch.nn.Module): the model trained by the worker, or its update
+                encoded by an UpdateEncoder from the model given to the aggregator.
+                If None, the worker is dropped.
+            *results: any other results of the worker, like its loss, which are kept
+                in self.results.
+            late (bool): if True, the weight of the update is discounted by late_weight.
+        """
+        if model is None:
+            self.dropped.append(worker_id)
+            return
+
+        weight = self.weights.get(worker_id, 1.0)
+        if late:
+            weight *= self.late_weight
+            self.late.append(worker_id)
+        if isinstance(model, dict):
+            self.averager.add_encoded(model, weight)
+        else:
+            self.averager.add(model, weight)
+        self.received.append(worker_id)
+        if results:
+            self.results[worker_id] = results[0] if len(results) == 1 else results
+
+    async def aggregate(self, updates: Dict[Any, Awaitable]) -> torch.nn.Module:
+        """Consume the updates of the workers as they complete.
+
+        Args:
+            updates (Dict[Any, Awaitable]): the awaitable update of each worker id, like
+                a coroutine calling WebsocketClientWorker.async_fit, which returns the
+                trained model or a tuple (model, *results).
+        Returns:
+            torch.nn.Module: the module with averaged parameters.
+        """
+        start = time.time()
+        pending = {
+            asyncio.ensure_future(update): worker_id for worker_id, update in updates.items()
+        }
+        try:
+            while pending:
+                timeout = None
+                if self.deadline is not None:
+                    remaining = self.deadline - (time.time() - start)
+                    timeout = remaining if remaining > 0 else None
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                late = self.deadline is not None and time.time() - start >= self.deadline
+                for future in done:
+                    update = future.result()
+                    update = update if isinstance(update, tuple) else (update,)
+                    self.add(pending.pop(future), *update, late=late)
+                # Release the client models
+                done = update = None
+
+                if late and self.averager.nr_models >= self.quorum:
+                    break
+        finally:
+            for future, worker_id in pending.items():
+                future.cancel()
+                self.dropped.append(worker_id)
+
+        logger.debug(
+            "Aggregated %s updates (%s late), dropped %s",
+            len(self.received),
+            len(self.late),
+            len(self.dropped),
+        )
+        return self.result()
+
+    def result(self, model: torch.nn.Module = None) -> torch.nn.Module:
+        """Return a model whose parameters are the weighted average, see ModelAverager."""
+        return self.averager.result(model)
+
+
+def federated_avg(
+    models: Dict[Any, torch.nn.Module], weights: Dict[Any, float] = None
+) -> torch.nn.Module:
     """Calculate the federated average of a dictionary containing models.
        The models are extracted from the dictionary
        via the models.values() command.
@@ -77,17 +316,17 @@ def federated_avg(models: Dict[Any, torch.nn.Module]) -> torch.nn.Module:
     Args:
         models (Dict[Any, torch.nn.Module]): a dictionary of models
         for which the federated average is calculated.
+        weights (Dict[Any, float]): optional weights of the models, with the same
+        keys as models, like the number of samples each model was trained on.
 
     Returns:
-        torch.nn.Module: the module with averaged parameters.
+        torch.nn.Module: a new module with averaged parameters, the models
+        given are not modified.
     """
-    nr_models = len(models)
-    model_list = list(models.values())
-    model = model_list[0]
-    for i in range(1, nr_models):
-        model = add_model(model, model_list[i])
-    model = scale_model(model, 1.0 / nr_models)
-    return model
+    averager = ModelAverager()
+    for key, model in models.items():
+        averager.add(model, 1.0 if weights is None else weights[key])
+    return averager.result()
 
 
 def accuracy(pred_softmax, target):
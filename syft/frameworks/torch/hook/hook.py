@@ -22,6 +22,7 @@ from syft.frameworks.torch.tensors.decorators.logging import LoggingTensor
 from syft.frameworks.torch.tensors.interpreters.precision import FixedPrecisionTensor
 from syft.frameworks.torch.tensors.interpreters.additive_shared import AdditiveSharingTensor
 from syft.frameworks.torch.tensors.interpreters.private import PrivateTensor
+from syft.frameworks.torch.mpc.spdz import PersistentMask
 from syft.execution.placeholder import PlaceHolder
 from syft.frameworks.torch.torch_attributes import TorchAttributes
 from syft.generic.pointers.multi_pointer import MultiPointerTensor
@@ -518,6 +519,14 @@ class TorchHook(FrameworkHook):
                 wrap_args=self.get_class_attributes(),
             )
 
+            # A fixed value keeps its persistent mask through shape changes, and
+            # loses it when it is modified in place
+            if self.mask is not None:
+                if attr in PersistentMask.shape_methods:
+                    response.mask = self.mask.apply(attr, *args, **kwargs)
+                elif PersistentMask.is_inplace(attr):
+                    self.mask = None
+
             return response
 
         return overloaded_attr
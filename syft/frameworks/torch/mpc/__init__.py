@@ -1,3 +1,5 @@
+from syft.frameworks.torch.mpc.cost_model import cost_model
+
 protocol_store = {}
 
 
@@ -11,6 +13,9 @@ def crypto_protocol(protocol_name):
             - snn: SecureNN
             - fss: Function Secret Sharing
 
+    Tensors with the "auto" protocol run the implementation selected by the
+    cost model, see cost_model.py
+
     Example in a tensor file:
         ```
         @crypto_protocol("snn")
@@ -30,8 +35,18 @@ def crypto_protocol(protocol_name):
         protocol_store[(name, protocol_name)] = f
 
         def method(self, *args, **kwargs):
-            f = protocol_store[(name, self.protocol)]
-            return f(self, *args, **kwargs)
+            if self.protocol != "auto":
+                f = protocol_store[(name, self.protocol)]
+                return f(self, *args, **kwargs)
+
+            protocols = [protocol for (n, protocol) in protocol_store if n == name]
+            protocol = cost_model.select(name.split(".")[-1], self, protocols)
+            f = protocol_store[(name, protocol)]
+            # The operations run on self by this implementation use the same protocol,
+            # so it is given a tensor with the same shares and this protocol
+            attributes = dict(self.get_class_attributes(), protocol=protocol)
+            self_with_protocol = type(self)(self.child, owner=self.owner, **attributes)
+            return f(self_with_protocol, *args, **kwargs)
 
         return method
 
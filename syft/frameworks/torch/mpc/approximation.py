@@ -0,0 +1,327 @@
+"""
+Piecewise polynomial approximation of elementwise functions on fixed precision tensors
+
+A function is approximated on each piece [lo, hi] of its domain by the
+polynomial interpolating it at the Chebyshev nodes, which is close to the
+minimax polynomial of the same degree. The coefficients are computed once per
+(function, pieces, degree) and cached.
+
+On an additively shared tensor, the evaluation costs:
+    - one batched comparison of x with the bounds of the pieces, if there are
+        several pieces or if x is clamped to the domain
+    - the powers of x, computed by batched multiplications in log2(degree) rounds,
+        or with the Paterson-Stockmeyer scheme which needs about 2 * sqrt(degree)
+        multiplications instead of degree
+    - one batched multiplication to select the piece x belongs to
+
+Example:
+    ```
+    x = torch.tensor([0.1, 0.5]).fix_prec().share(alice, bob, crypto_provider=james)
+    y = approximate(x, "sigmoid")
+    z = approximate(x, torch.erf, intervals=((-3, 3),), degree=8)
+    ```
+"""
+import math
+
+import torch
+
+from syft.generic.utils import memorize
+
+# Default pieces and degree for some usual functions
+FUNCTIONS = {
+    "exp": (torch.exp, ((-4, 4),), 10),
+    "log": (torch.log, ((0.1, 0.5), (0.5, 2), (2, 10)), 6),
+    "sigmoid": (torch.sigmoid, ((-8, -2), (-2, 2), (2, 8)), 6),
+    "tanh": (torch.tanh, ((-4, -1), (-1, 1), (1, 4)), 6),
+}
+
+METHODS = ("powers", "paterson_stockmeyer")
+
+
+def chebyshev_fit(function, lo: float, hi: float, degree: int):
+    """
+    Interpolate a function on [lo, hi] at the Chebyshev nodes
+
+    Args:
+        function (callable): the function to approximate, applied to a float64 tensor
+        lo (float): lower bound of the interval
+        hi (float): upper bound of the interval
+        degree (int): degree of the polynomial
+
+    Returns:
+        the float64 coefficients c_0, ..., c_degree of the polynomial in the
+        variable t = (x - mid) / half, which lies in [-1, 1]
+    """
+    n_nodes = degree + 1
+    mid, half = (lo + hi) / 2, (hi - lo) / 2
+
+    angles = (torch.arange(n_nodes, dtype=torch.float64) + 0.5) * math.pi / n_nodes
+    values = function(mid + half * torch.cos(angles))
+    degrees = torch.arange(n_nodes, dtype=torch.float64)
+    cheb_coeffs = (2 / n_nodes) * (values * torch.cos(torch.ger(degrees, angles))).sum(dim=1)
+    cheb_coeffs[0] /= 2
+
+    # Convert to the power basis with T_{n+1}(t) = 2t T_n(t) - T_{n-1}(t)
+    basis = [torch.zeros(n_nodes, dtype=torch.float64) for _ in range(n_nodes)]
+    basis[0][0] = 1
+    if degree > 0:
+        basis[1][1] = 1
+    for n in range(2, n_nodes):
+        basis[n][1:] = 2 * basis[n - 1][:-1]
+        basis[n] -= basis[n - 2]
+
+    return (cheb_coeffs.unsqueeze(1) * torch.stack(basis)).sum(dim=0)
+
+
+class Approximation:
+    """
+    Piecewise polynomial approximation of a function
+
+    Attributes:
+        function (callable): the function approximated
+        intervals (tuple): contiguous pieces (lo, hi) of the domain, in increasing order
+        degree (int): degree of the polynomial on each piece
+        coeffs (torch.Tensor): float64 coefficients of shape (degree + 1, n_pieces),
+            in the variable t = (x - mid) / half of each piece
+        max_error (float): maximum error of the approximation on the domain, in
+            floating point arithmetic
+    """
+
+    def __init__(self, function, intervals: tuple, degree: int):
+        assert degree >= 1, "The degree of the approximation must be at least 1"
+        for (_, hi), (lo, _) in zip(intervals[:-1], intervals[1:]):
+            assert hi == lo, "The pieces of the approximation must be contiguous"
+
+        self.function = function
+        self.intervals = intervals
+        self.degree = degree
+        self.coeffs = torch.stack(
+            [chebyshev_fit(function, lo, hi, degree) for lo, hi in intervals], dim=1
+        )
+        self.mids = torch.tensor([(lo + hi) / 2 for lo, hi in intervals], dtype=torch.float64)
+        self.halves = torch.tensor([(hi - lo) / 2 for lo, hi in intervals], dtype=torch.float64)
+
+        lo, hi = intervals[0][0], intervals[-1][1]
+        grid = torch.linspace(lo, hi, 10000, dtype=torch.float64)
+        self.max_error = (self.evaluate_plain(grid) - function(grid)).abs().max().item()
+
+    @property
+    def bounds(self) -> list:
+        """All the bounds of the pieces, in increasing order"""
+        return [lo for lo, _ in self.intervals] + [self.intervals[-1][1]]
+
+    def evaluate_plain(self, x: torch.Tensor) -> torch.Tensor:
+        """Evaluate the approximation on a plain tensor, clamped to the domain"""
+        x = x.double().clamp(self.bounds[0], self.bounds[-1])
+        inner_bounds = torch.tensor(self.bounds[1:-1], dtype=torch.float64)
+        pieces = (x.unsqueeze(-1) > inner_bounds).sum(dim=-1)
+        t = (x - self.mids[pieces]) / self.halves[pieces]
+        result = torch.zeros_like(x)
+        for degree in range(self.degree, -1, -1):
+            result = result * t + self.coeffs[degree][pieces]
+        return result
+
+    def cost(self, method: str = "powers", clamp: bool = True) -> dict:
+        """
+        Return the cost of an evaluation on an additively shared tensor
+
+        Returns:
+            a dict with the number of comparisons, of multiplication rounds and of
+            private multiplications per element of the input
+        """
+        n_pieces = len(self.intervals)
+        comparisons = n_pieces + 1 if clamp else n_pieces - 1
+        rounds = multiplications = 0
+        if clamp:
+            rounds, multiplications = 1, 2
+
+        if method == "powers":
+            rounds += math.ceil(math.log2(self.degree))
+            multiplications += (self.degree - 1) * n_pieces
+        elif method == "paterson_stockmeyer":
+            k, m = _paterson_stockmeyer_split(self.degree)
+            rounds += math.ceil(math.log2(k)) + (math.ceil(math.log2(m - 1)) + 1 if m > 1 else 0)
+            multiplications += (k - 1 + 2 * (m - 1) - (m > 1)) * n_pieces
+        else:
+            raise ValueError(f"Unknown evaluation method {method}, use one of {METHODS}")
+
+        if n_pieces > 1:
+            rounds += 1
+            multiplications += n_pieces - 1
+
+        return {"comparisons": comparisons, "rounds": rounds, "multiplications": multiplications}
+
+    def evaluate(self, tensor, method: str = "powers", clamp: bool = True):
+        """
+        Evaluate the approximation on a fixed precision tensor
+
+        Args:
+            tensor: a FixedPrecisionTensor or a wrapper of one, usually shared
+            method (str): "powers" or "paterson_stockmeyer", to compute the polynomial
+            clamp (bool): if True, the input is first clamped to the domain of the
+                approximation, which matters for functions like sigmoid or tanh
+                which saturate outside of it
+
+        Returns:
+            a tensor of the same type as the input
+        """
+        n_pieces = len(self.intervals)
+        bounds = self.bounds if clamp else self.bounds[1:-1]
+
+        gates = None
+        if bounds:
+            # All the comparisons are independent and run as a single batch. The
+            # bounds are subtracted first, as a shared tensor can only be compared
+            # with a public scalar
+            public_bounds = torch.tensor(bounds, dtype=torch.float).view(-1, *[1] * tensor.dim())
+            gates = (_stack(tensor, len(bounds)) - _public(public_bounds, tensor)) > 0
+
+        x = tensor
+        if clamp:
+            lo, hi = self.bounds[0], self.bounds[-1]
+            # x + (1 - [x > lo]) * (lo - x) + [x > hi] * (hi - x)
+            shifts = torch.cat([(x * -1 + lo).unsqueeze(0), (x * -1 + hi).unsqueeze(0)])
+            selectors = torch.cat([(1 - gates[0]).unsqueeze(0), gates[-1:]])
+            x = x + (selectors * shifts).sum(0)
+            gates = gates[1:-1]
+
+        shape = [-1] + [1] * tensor.dim()
+        # Map each piece to [-1, 1]
+        t = (_stack(x, n_pieces) - _public(self.mids.float().view(*shape), tensor)) * _public(
+            (1 / self.halves).float().view(*shape), tensor
+        )
+
+        if method == "powers":
+            values = self._evaluate_powers(t)
+        elif method == "paterson_stockmeyer":
+            values = self._evaluate_paterson_stockmeyer(t)
+        else:
+            raise ValueError(f"Unknown evaluation method {method}, use one of {METHODS}")
+
+        if n_pieces == 1:
+            return values[0]
+
+        # Select the piece of each element: p_0 + sum_i [x > b_i] * (p_i - p_{i-1})
+        return values[0] + (gates * (values[1:] - values[:-1])).sum(0)
+
+    def _coeffs(self, degrees, t):
+        """The coefficients of the given degrees, encoded to be multiplied with t"""
+        shape = [len(degrees), -1] + [1] * (t.dim() - 1)
+        return _public(self.coeffs[degrees].float().view(*shape), t)
+
+    def _evaluate_powers(self, t):
+        """Evaluate sum_i c_i t^i with all the powers of t"""
+        powers = _powers(t, self.degree)
+        constant = self._coeffs([0], t)[0]
+        return constant + (powers * self._coeffs(list(range(1, self.degree + 1)), t)).sum(0)
+
+    def _evaluate_paterson_stockmeyer(self, t):
+        """
+        Evaluate sum_i c_i t^i as sum_j q_j(t) * (t^k)^j, where the polynomials q_j
+        of degree k - 1 only need public multiplications
+        """
+        k, m = _paterson_stockmeyer_split(self.degree)
+        powers = _powers(t, k)
+
+        blocks = []
+        for j in range(m):
+            degrees = list(range(j * k, min((j + 1) * k, self.degree + 1)))
+            block = self._coeffs(degrees[:1], t)[0]
+            if len(degrees) > 1:
+                block = block + (powers[: len(degrees) - 1] * self._coeffs(degrees[1:], t)).sum(0)
+            blocks.append(block.unsqueeze(0))
+
+        if m == 1:
+            return blocks[0][0]
+
+        giant_steps = _powers(powers[k - 1], m - 1)
+
+        # The last block can be made of its constant coefficient only: it is public,
+        # so it can't be concatenated with the shared blocks and is added on its own
+        last_term = None
+        if (m - 1) * k == self.degree:
+            last_term = blocks.pop()[0] * giant_steps[m - 2]
+
+        result = blocks[0][0]
+        if len(blocks) > 1:
+            result = result + (torch.cat(blocks[1:]) * giant_steps[: len(blocks) - 1]).sum(0)
+        if last_term is not None:
+            result = result + last_term
+        return result
+
+
+def _paterson_stockmeyer_split(degree: int):
+    """Return the baby step k and the number of giant steps m such that k * m > degree"""
+    k = max(1, math.ceil(math.sqrt(degree + 1)))
+    m = math.ceil((degree + 1) / k)
+    return k, m
+
+
+def _public(values: torch.Tensor, tensor):
+    """Encode public values with the fixed precision of tensor"""
+    if isinstance(tensor, torch.Tensor):
+        # tensor is a wrapper
+        return values.fix_precision(**tensor.child.get_class_attributes())
+    return values.fix_precision(**tensor.get_class_attributes()).child
+
+
+def _stack(tensor, n: int):
+    """Stack n copies of tensor on a new first dimension"""
+    return torch.cat([tensor.unsqueeze(0)] * n)
+
+
+def _powers(tensor, n: int):
+    """
+    Compute tensor, tensor ** 2, ..., tensor ** n, stacked on a new first dimension
+
+    The powers known are all multiplied by the highest one in a single batch, so
+    this takes ceil(log2(n)) rounds of multiplications.
+    """
+    powers = tensor.unsqueeze(0)
+    while powers.shape[0] < n:
+        n_known = powers.shape[0]
+        n_new = min(n_known, n - n_known)
+        powers = torch.cat([powers, powers[:n_new] * _stack(powers[n_known - 1], n_new)])
+    return powers
+
+
+@memorize
+def _fit(function, intervals: tuple, degree: int) -> Approximation:
+    return Approximation(function, intervals, degree)
+
+
+def get_approximation(function, intervals=None, degree: int = None) -> Approximation:
+    """
+    Return the cached approximation of a function
+
+    Args:
+        function: the name of a function of FUNCTIONS, or a callable on float64 tensors
+        intervals: contiguous pieces (lo, hi) of the domain, mandatory for callables
+        degree (int): degree of the polynomial on each piece, mandatory for callables
+    """
+    if isinstance(function, str):
+        function, default_intervals, default_degree = FUNCTIONS[function]
+        intervals = intervals or default_intervals
+        degree = degree or default_degree
+
+    assert intervals is not None and degree is not None, "Specify the intervals and the degree"
+
+    return _fit(function, tuple(tuple(interval) for interval in intervals), degree)
+
+
+def approximate(
+    tensor, function, intervals=None, degree: int = None, method: str = "powers", clamp=True
+):
+    """
+    Approximate an elementwise function on a fixed precision tensor
+
+    Args:
+        tensor: a FixedPrecisionTensor or a wrapper of one, usually shared
+        function: the name of a function of FUNCTIONS, or a callable on float64 tensors
+        intervals: contiguous pieces (lo, hi) of the domain, mandatory for callables
+        degree (int): degree of the polynomial on each piece, mandatory for callables
+        method (str): "powers" or "paterson_stockmeyer", see Approximation.evaluate
+        clamp (bool): if True, the input is first clamped to the domain of the approximation
+    """
+    approximation = get_approximation(function, intervals, degree)
+    return approximation.evaluate(tensor, method=method, clamp=clamp)
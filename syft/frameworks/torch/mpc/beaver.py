@@ -12,6 +12,9 @@ def request_triple(
     a_size: tuple,
     b_size: tuple,
     locations: list,
+    seeded: bool = False,
+    a=None,
+    b=None,
 ):
     """Generates a multiplication triple and sends it to all locations.
 
@@ -25,21 +28,75 @@ def request_triple(
         b_size: A tuple which is the size that b should be or
                 a torch.Size intance
         locations: A list of workers where the triple should be shared between.
+        seeded: If True, the crypto provider sends PRG seeds instead of full shares
+            to all locations but one.
+        a: An optional pointer to a persistent mask held by the crypto provider,
+            see request_mask. It is used instead of a fresh a and isn't shared again.
+        b: Same as a, for b.
 
     Returns:
         A triple of AdditiveSharedTensors such that c_shared = cmd(a_shared, b_shared).
+        a_shared (resp. b_shared) is None when a (resp. b) is a persistent mask.
     """
-    a = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, a_size)
-    b = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, b_size)
+    fresh_a, fresh_b = a is None, b is None
+    if fresh_a:
+        a = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, a_size)
+    if fresh_b:
+        b = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, b_size)
     c = cmd(a, b)
 
-    res = torch.cat((a.view(-1), b.view(-1), c.view(-1)))
+    fresh_values = [v for v, fresh in ((a, fresh_a), (b, fresh_b), (c, True)) if fresh]
+    res = torch.cat([v.view(-1) for v in fresh_values])
 
     shares = (
-        res.share(*locations, field=field, dtype=dtype, crypto_provider=crypto_provider).get().child
+        res.share(
+            *locations, field=field, dtype=dtype, crypto_provider=crypto_provider, seeded=seeded
+        )
+        .get()
+        .child
     )
-    a_shared = shares[: a.numel()].reshape(a_size)
-    b_shared = shares[a.numel() : -c.numel()].reshape(b_size)
+    a_shared = shares[: a.numel()].reshape(a_size) if fresh_a else None
+    b_start = a.numel() if fresh_a else 0
+    b_shared = shares[b_start : b_start + b.numel()].reshape(b_size) if fresh_b else None
     c_shared = shares[-c.numel() :].reshape(c.shape)
 
     return a_shared, b_shared, c_shared
+
+
+def request_mask(
+    crypto_provider: AbstractWorker,
+    field: int,
+    dtype: str,
+    size: tuple,
+    locations: list,
+    seeded: bool = False,
+):
+    """Generates a persistent random mask and sends it to all locations.
+
+    The crypto provider keeps the mask, so that it can generate later triples
+    for this very mask with request_triple.
+
+    Args:
+        crypto_provider: worker you would like to request the mask from
+        field: An integer representing the field size.
+        dtype: represents the dtype of shares
+        size: A tuple which is the size that the mask should be or
+                a torch.Size instance
+        locations: A list of workers where the mask should be shared between.
+        seeded: If True, the crypto provider sends PRG seeds instead of full shares
+            to all locations but one.
+
+    Returns:
+        A pointer to the mask on the crypto provider and the AdditiveSharedTensor of the mask.
+    """
+    mask = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, size)
+
+    mask_shared = (
+        mask.share(
+            *locations, field=field, dtype=dtype, crypto_provider=crypto_provider, seeded=seeded
+        )
+        .get()
+        .child
+    )
+
+    return mask, mask_shared
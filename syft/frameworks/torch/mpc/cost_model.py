@@ -0,0 +1,182 @@
+"""
+Automatic selection of the crypto protocol of an AdditiveSharingTensor
+
+An AdditiveSharingTensor shared with protocol="auto" runs each operation which
+has several implementations (see crypto_protocol) with the protocol predicted
+to be the fastest for its size and its workers.
+
+The prediction uses a linear model time = latency + size * time_per_value per
+operation, protocol and set of workers. It is calibrated by a micro-benchmark
+run on the workers the first time they need a decision, or explicitly with
+cost_model.calibrate. FSS only supports 2 parties, so SecureNN is always
+selected for more parties.
+
+Example:
+    ```
+    x = t.share(alice, bob, protocol="auto", crypto_provider=james)
+    cost_model.override("comp", "fss")  # force a protocol for an operation
+    x > 0
+    cost_model.decisions  # Counter (operation, size, protocol) -> number of calls
+    ```
+"""
+from collections import Counter
+import logging
+import time
+
+import torch
+
+import syft as sy
+
+logger = logging.getLogger(__name__)
+
+# The operation whose cost matters for each method with several implementations
+OPERATIONS = {"__gt__": "comp", "__ge__": "comp", "__lt__": "comp", "__le__": "comp", "eq": "eq"}
+
+# The FSS keys consumed per value by the methods which directly run a FSS protocol
+FSS_PRIMITIVES = {"__le__": ["fss_comp", "xor_add_couple"], "eq": ["fss_eq"]}
+
+
+class CostModel:
+    """
+    Predict the cost of the protocols and select the cheapest one
+
+    Attributes:
+        costs (dict): (operation, workers) -> protocol -> (latency, time_per_value)
+            in seconds, where workers is a tuple of worker ids
+        overrides (dict): operation -> protocol selected whatever the costs
+        decisions (Counter): number of selections of each (operation, size, protocol)
+        provide_primitives (bool): if True, the FSS keys are generated on demand by
+            the local worker when FSS is selected, and the benchmark includes their
+            generation. Otherwise they must be provided beforehand like for
+            protocol="fss" and the benchmark only measures the online phase.
+    """
+
+    def __init__(self, provide_primitives: bool = True):
+        self.costs = {}
+        self.overrides = {}
+        self.decisions = Counter()
+        self.provide_primitives = provide_primitives
+
+    @staticmethod
+    def _workers_key(locations, crypto_provider) -> tuple:
+        return tuple(sorted(str(location.id) for location in locations)) + (
+            str(crypto_provider.id),
+        )
+
+    def override(self, operation: str, protocol: str = None):
+        """
+        Select a protocol for an operation whatever the costs, or remove the
+        override if protocol is None
+        """
+        if protocol is None:
+            self.overrides.pop(operation, None)
+        else:
+            self.overrides[operation] = protocol
+
+    def predict(self, operation: str, workers: tuple, protocol: str, size: int) -> float:
+        """Predict the duration in seconds of an operation on size values"""
+        latency, time_per_value = self.costs[(operation, workers)][protocol]
+        return latency + size * time_per_value
+
+    def select(self, method_name: str, tensor, protocols: list) -> str:
+        """
+        Select the protocol to run a method of an AdditiveSharingTensor with
+
+        Args:
+            method_name (str): the name of the method, like "__gt__"
+            tensor (AdditiveSharingTensor): the tensor the method is called on
+            protocols (list): the protocols implementing the method
+
+        Returns:
+            the name of the protocol selected
+        """
+        operation = OPERATIONS.get(method_name, method_name)
+        size = tensor.shape.numel()
+        locations = tensor.locations
+
+        if operation in self.overrides:
+            protocol = self.overrides[operation]
+        elif len(locations) != 2 or "fss" not in protocols:
+            protocol = "snn"
+        else:
+            workers = self._workers_key(locations, tensor.crypto_provider)
+            if (operation, workers) not in self.costs:
+                self.calibrate(locations, tensor.crypto_provider, operations=(operation,))
+            protocol = min(protocols, key=lambda p: self.predict(operation, workers, p, size))
+
+        logger.debug("Protocol %s selected for %s on %d values", protocol, method_name, size)
+        self.decisions[(operation, size, protocol)] += 1
+
+        if protocol == "fss" and self.provide_primitives and method_name in FSS_PRIMITIVES:
+            self._provide_fss_keys(method_name, locations, size)
+
+        return protocol
+
+    @staticmethod
+    def _provide_fss_keys(method_name: str, locations: list, size: int):
+        """Have the local worker send the FSS keys needed by a method to the locations"""
+        sy.local_worker.crypto_store.provide_primitives(
+            FSS_PRIMITIVES[method_name], locations, n_instances=size
+        )
+
+    def calibrate(
+        self,
+        locations: list,
+        crypto_provider,
+        operations: tuple = ("comp", "eq"),
+        sizes: tuple = (16, 1024),
+        repeats: int = 2,
+    ):
+        """
+        Benchmark the protocols of some operations on the given workers and
+        fit their linear cost model
+
+        Args:
+            locations (list): the workers holding the shares
+            crypto_provider: the worker providing the crypto primitives
+            operations (tuple): the operations to benchmark, "comp" and/or "eq"
+            sizes (tuple): the 2 numbers of values the operations are run on
+            repeats (int): the fastest of repeats runs is kept for each size
+        """
+        workers = self._workers_key(locations, crypto_provider)
+        small, large = sizes
+
+        for operation in operations:
+            costs = {}
+            for protocol in ("snn", "fss"):
+                if protocol == "fss" and len(locations) != 2:
+                    continue
+                small_time, large_time = (
+                    self._benchmark(operation, protocol, locations, crypto_provider, size, repeats)
+                    for size in sizes
+                )
+                time_per_value = max(0.0, (large_time - small_time) / (large - small))
+                latency = max(0.0, small_time - small * time_per_value)
+                costs[protocol] = (latency, time_per_value)
+
+            self.costs[(operation, workers)] = costs
+            logger.info("Calibrated the cost of %s on %s: %s", operation, workers, costs)
+
+    def _benchmark(self, operation, protocol, locations, crypto_provider, size, repeats):
+        """Return the fastest duration of repeats runs of an operation on size values"""
+        kwargs = dict(protocol=protocol, crypto_provider=crypto_provider, no_wrap=True)
+        x = torch.randint(-100, 100, (size,)).share(*locations, **kwargs)
+        y = torch.randint(-100, 100, (size,)).share(*locations, **kwargs)
+        method_name = {"comp": "__le__", "eq": "eq"}[operation]
+
+        durations = []
+        for _ in range(repeats):
+            # The generation of the FSS keys is only timed if it is done on demand
+            generate_keys = protocol == "fss"
+            if generate_keys and not self.provide_primitives:
+                self._provide_fss_keys(method_name, locations, size)
+            start = time.time()
+            if generate_keys and self.provide_primitives:
+                self._provide_fss_keys(method_name, locations, size)
+            getattr(x, method_name)(y)
+            durations.append(time.time() - start)
+
+        return min(durations)
+
+
+cost_model = CostModel()
@@ -7,10 +7,13 @@ Useful papers are:
 
 Note that the protocols are quite different in aspect from those papers
 """
+import asyncio
 import hashlib
+import operator
 
 import torch as th
 import syft as sy
+from syft.generic import communication
 
 
 λ = 110  # 6  # 110 or 63  # security parameter
@@ -58,6 +61,18 @@ def initialize_crypto_plans(worker):
     )
     worker.register_obj(xor_add_plan)
 
+    eq_fused_plan_2 = sy.Plan(
+        forward_func=eq_eval_fused_plan, owner=worker, tags=["#fss_eq_fused_plan_2"], is_built=True
+    )
+    worker.register_obj(eq_fused_plan_2)
+    comp_fused_plan_2 = sy.Plan(
+        forward_func=comp_eval_fused_plan,
+        owner=worker,
+        tags=["#fss_comp_fused_plan_2"],
+        is_built=True,
+    )
+    worker.register_obj(comp_fused_plan_2)
+
 
 def request_run_plan(worker, plan_tag, location, return_value, args=tuple(), kwargs=dict()):
     response_ids = (sy.ID_PROVIDER.pop(),)
@@ -75,7 +90,55 @@ def request_run_plan(worker, plan_tag, location, return_value, args=tuple(), kwa
     return response
 
 
-def fss_op(x1, x2, type_op="eq"):
+def request_run_plans(worker, plan_tag, locations, return_value, args_list):
+    """
+    Run the same plan on several locations, each with its own args.
+
+    When all the locations are asynchronous workers (like WebsocketClientWorker),
+    the requests are sent concurrently, otherwise they are sent one after the other.
+    The requests are also sent one after the other when the event loop is already
+    running, as it can't be blocked on here: use async_request_run_plans instead.
+
+    Returns:
+        the list of responses, in the order of the locations
+    """
+    loop = asyncio.get_event_loop()
+    if not loop.is_running() and all(
+        hasattr(location, "async_send_command") for location in locations
+    ):
+        return loop.run_until_complete(
+            async_request_run_plans(plan_tag, locations, return_value, args_list)
+        )
+
+    return [
+        request_run_plan(worker, plan_tag, location, return_value, args=args)
+        for location, args in zip(locations, args_list)
+    ]
+
+
+async def async_request_run_plans(plan_tag, locations, return_value, args_list):
+    """
+    Asynchronous version of request_run_plans, the locations must be asynchronous
+    workers. The requests are sent concurrently.
+    """
+    requests = [
+        async_request_run_plan(plan_tag, location, return_value, args=args)
+        for location, args in zip(locations, args_list)
+    ]
+    return await asyncio.gather(*requests)
+
+
+async def async_request_run_plan(plan_tag, location, return_value, args=tuple(), kwargs=dict()):
+    response_ids = (sy.ID_PROVIDER.pop(),)
+    args = (args, response_ids)
+
+    response = await location.async_send_command(
+        message=("run", plan_tag, args, kwargs), return_ids=response_ids, return_value=return_value
+    )
+    return response
+
+
+def fss_op(x1, x2, type_op="eq", fused=False):
     """
     Define the workflow for a binary operation using Function Secret Sharing
 
@@ -86,60 +149,162 @@ def fss_op(x1, x2, type_op="eq"):
         x1: first AST
         x2: second AST
         type_op: type of operation to perform, should be 'eq' or 'comp'
+        fused: if True, use the round-fused workflow, see fused_fss_op
 
     Returns:
         shares of the comparison
     """
+    if fused:
+        return fused_fss_op(x1, x2, type_op)
 
     me = sy.local_worker
     locations = x1.locations
 
-    shares = []
-    for location in locations:
-        args = (x1.child[location.id], x2.child[location.id])
-        share = request_run_plan(
-            me, f"#fss_{type_op}_plan_1", location, return_value=True, args=args
-        )
-        shares.append(share)
+    args_list = [(x1.child[location.id], x2.child[location.id]) for location in locations]
+    shares = request_run_plans(
+        me, f"#fss_{type_op}_plan_1", locations, return_value=True, args_list=args_list
+    )
 
     mask_value = sum(shares) % 2 ** n
 
-    shares = []
-    for i, location in enumerate(locations):
-        args = (th.IntTensor([i]), mask_value)
-        share = request_run_plan(
-            me, f"#fss_{type_op}_plan_2", location, return_value=False, args=args
-        )
-        shares.append(share)
+    args_list = [(th.IntTensor([i]), mask_value) for i in range(len(locations))]
+    shares = request_run_plans(
+        me, f"#fss_{type_op}_plan_2", locations, return_value=False, args_list=args_list
+    )
 
     if type_op == "comp":
         prev_shares = shares
-        shares = []
-        for prev_share, location in zip(prev_shares, locations):
-            share = request_run_plan(
-                me, f"#xor_add_1", location, return_value=True, args=(prev_share,)
-            )
-            shares.append(share)
+        args_list = [(prev_share,) for prev_share in prev_shares]
+        shares = request_run_plans(
+            me, f"#xor_add_1", locations, return_value=True, args_list=args_list
+        )
 
         masked_value = shares[0] ^ shares[1]  # TODO case >2 workers ?
 
-        shares = {}
-        for i, prev_share, location in zip(range(len(locations)), prev_shares, locations):
-            share = request_run_plan(
-                me,
-                f"#xor_add_2",
-                location,
-                return_value=False,
-                args=(th.IntTensor([i]), masked_value),
-            )
-            shares[location.id] = share
-    else:
-        shares = {loc.id: share for loc, share in zip(locations, shares)}
+        args_list = [(th.IntTensor([i]), masked_value) for i in range(len(locations))]
+        shares = request_run_plans(
+            me, f"#xor_add_2", locations, return_value=False, args_list=args_list
+        )
+
+    shares = {loc.id: share for loc, share in zip(locations, shares)}
 
     response = sy.AdditiveSharingTensor(shares, **x1.get_class_attributes())
     return response
 
 
+def fused_fss_op(x1, x2, type_op="eq"):
+    """
+    Round-fused workflow for a binary operation using Function Secret Sharing
+
+    Compared to fss_op, the masked values are opened with a direct exchange
+    among the workers instead of going through the local worker, and the
+    evaluation of a comparison is merged with the masking of its boolean
+    result, which is then opened the same way. An equality takes 1 round
+    and a comparison 2 rounds, instead of 2 and 4.
+
+    Args:
+        x1: first AST
+        x2: second AST
+        type_op: type of operation to perform, should be 'eq' or 'comp'
+
+    Returns:
+        shares of the comparison
+    """
+    me = sy.local_worker
+    locations = x1.locations
+
+    # 1) Mask the shares and open the masked value among the workers
+    args_list = [(x1.child[location.id], x2.child[location.id]) for location in locations]
+    shares = request_run_plans(
+        me, f"#fss_{type_op}_plan_1", locations, return_value=False, args_list=args_list
+    )
+    mask_values = exchange_shares(shares, operator.add)
+
+    # 2) Evaluate the function on the masked value
+    args_list = [
+        (th.IntTensor([i]), mask_values[location.id]) for i, location in enumerate(locations)
+    ]
+    shares = request_run_plans(
+        me, f"#fss_{type_op}_fused_plan_2", locations, return_value=False, args_list=args_list
+    )
+
+    if type_op == "comp":
+        # 3) Open the masked boolean result and convert it to arithmetic shares
+        masked_values = exchange_shares(shares, operator.xor)
+
+        args_list = [
+            (th.IntTensor([i]), masked_values[location.id]) for i, location in enumerate(locations)
+        ]
+        shares = request_run_plans(
+            me, f"#xor_add_2", locations, return_value=False, args_list=args_list
+        )
+
+    shares = {loc.id: share for loc, share in zip(locations, shares)}
+
+    response = sy.AdditiveSharingTensor(shares, **x1.get_class_attributes())
+    return response
+
+
+def exchange_shares(shares, combine):
+    """
+    Have each worker send its share to all the other workers, which then
+    combine the shares they hold
+
+    Args:
+        shares: list of pointers to the shares, one per worker
+        combine: binary function used to combine two shares, like operator.add
+
+    Returns:
+        dict location id -> pointer to the combined value on this location
+    """
+    results = {}
+    for share in shares:
+        location = share.location
+        result = share
+        for other_share in shares:
+            if other_share.location.id != location.id:
+                result = combine(result, other_share.copy().move(location))
+        results[location.id] = result
+
+    return results
+
+
+def batch_fss_op(x1s, x2s, type_op="eq", fused=False):
+    """
+    Perform a binary operation on several pairs of AST with a single run of
+    the Function Secret Sharing workflow
+
+    All the operands are flattened and concatenated, so that the number of
+    communication rounds doesn't depend on the number of pairs.
+
+    Args:
+        x1s: list of first ASTs
+        x2s: list of second ASTs, x2s[i] should have the same shape as x1s[i]
+        type_op: type of operation to perform, should be 'eq' or 'comp'
+        fused: if True, use the round-fused workflow, see fused_fss_op
+
+    Returns:
+        list of the shares of the comparisons, in the same order as the pairs
+    """
+    assert len(x1s) == len(x2s), "There should be as many first and second operands"
+    for x1, x2 in zip(x1s, x2s):
+        assert x1.shape == x2.shape, "Operands of a pair should have the same shape"
+
+    x1 = th.cat([x.contiguous().view(-1) for x in x1s])
+    x2 = th.cat([x.contiguous().view(-1) for x in x2s])
+
+    result = fss_op(x1, x2, type_op, fused=fused)
+
+    results = []
+    start = 0
+    for x in x1s:
+        end = start + x.shape.numel()
+        results.append(result[start:end].view(x.shape))
+        start = end
+
+    return results
+
+
 # share level
 def mask_builder(x1, x2, type_op):
     x = x1 - x2
@@ -151,8 +316,10 @@ def mask_builder(x1, x2, type_op):
 
 
 # share level
-def eq_eval_plan(b, x_masked):
-    alpha, s_0, *CW = x_masked.owner.crypto_store.get_keys(
+def eq_eval_plan(b, x_masked, crypto_store=None):
+    if crypto_store is None:
+        crypto_store = x_masked.owner.crypto_store
+    alpha, s_0, *CW = crypto_store.get_keys(
         type_op="fss_eq", n_instances=x_masked.numel(), remove=True
     )
     result_share = DPF.eval(b, x_masked, s_0, *CW)
@@ -160,16 +327,34 @@ def eq_eval_plan(b, x_masked):
 
 
 # share level
-def comp_eval_plan(b, x_masked):
-    alpha, s_0, *CW = x_masked.owner.crypto_store.get_keys(
+def comp_eval_plan(b, x_masked, crypto_store=None):
+    if crypto_store is None:
+        crypto_store = x_masked.owner.crypto_store
+    alpha, s_0, *CW = crypto_store.get_keys(
         type_op="fss_comp", n_instances=x_masked.numel(), remove=True
     )
     result_share = DIF.eval(b, x_masked, s_0, *CW)
     return result_share
 
 
-def xor_add_convert_1(x):
-    xor_share, add_share = x.owner.crypto_store.get_keys(
+# share level
+# The tensors computed in these plans are owned by the local worker, so the keys are
+# taken from the store of the worker running the plan, which owns x_masked
+def eq_eval_fused_plan(b, x_masked):
+    return eq_eval_plan(b, x_masked % 2 ** n, x_masked.owner.crypto_store)
+
+
+# share level
+def comp_eval_fused_plan(b, x_masked):
+    crypto_store = x_masked.owner.crypto_store
+    result_share = comp_eval_plan(b, x_masked % 2 ** n, crypto_store)
+    return xor_add_convert_1(result_share, crypto_store)
+
+
+def xor_add_convert_1(x, crypto_store=None):
+    if crypto_store is None:
+        crypto_store = x.owner.crypto_store
+    xor_share, add_share = crypto_store.get_keys(
         type_op="xor_add_couple", n_instances=x.numel(), remove=False
     )
     return x ^ xor_share.reshape(x.shape)
@@ -182,12 +367,24 @@ def xor_add_convert_2(b, x):
     return add_share.reshape(x.shape) * (1 - 2 * x) + x * b
 
 
-def eq(x1, x2):
-    return fss_op(x1, x2, "eq")
+@communication.track("fss.eq")
+def eq(x1, x2, fused=False):
+    return fss_op(x1, x2, "eq", fused=fused)
+
+
+@communication.track("fss.le")
+def le(x1, x2, fused=False):
+    return fss_op(x1, x2, "comp", fused=fused)
+
+
+@communication.track("fss.batch_eq")
+def batch_eq(x1s, x2s, fused=False):
+    return batch_fss_op(x1s, x2s, "eq", fused=fused)
 
 
-def le(x1, x2):
-    return fss_op(x1, x2, "comp")
+@communication.track("fss.batch_le")
+def batch_le(x1s, x2s, fused=False):
+    return batch_fss_op(x1s, x2s, "comp", fused=fused)
 
 
 class DPF:
@@ -0,0 +1,198 @@
+"""
+Estimation of the crypto primitives consumed by an encrypted Plan
+
+A built Plan records the actions of its forward pass. Running these actions on
+zero tensors with the shapes of the placeholders gives the exact number of
+values going through each comparison and multiplication, and hence the number
+of crypto primitives that each party consumes for a run of the Plan:
+    - fss_comp and xor_add_couple: one per value compared with <, <=, > or >=,
+        including the comparisons of the tournaments of max and argmax
+    - fss_eq: one per value compared with ==
+    - beaver: one triple per multiplication or matrix multiplication of two
+        private tensors, identified by its equation and the shapes of its operands
+
+The composite operations sign, square and pow with an integer exponent are
+expanded into the comparisons and multiplications they run. The other composite
+operations, like relu which always runs the SecureNN protocol, division, pooling
+or the approximations of sigmoid or exp, are not expanded and their primitives
+are not counted.
+
+The FSS keys are stored by the workers and can be provided beforehand with
+PrimitiveStorage.provision. The Beaver triples are requested from the crypto
+provider at the time of the multiplication, so their estimate is informative.
+
+Example:
+    ```
+    plan.build(torch.zeros(1, 784))
+    plan.fix_precision().share(alice, bob, crypto_provider=james, protocol="fss")
+    estimate_primitives(plan, batch_size=64)  # {"fss_comp": 8192, ...}
+    me.crypto_store.provision(plan, batch_size=64, n_runs=10)
+    ```
+"""
+from collections import Counter
+
+import torch
+
+from syft.execution.communication import CommunicationAction
+from syft.execution.placeholder_id import PlaceholderId
+from syft.execution.role import Role
+
+COMPARISONS = {"__gt__", "__ge__", "__lt__", "__le__", "gt", "ge", "lt", "le"}
+EQUALITIES = {"__eq__", "eq"}
+TOURNAMENTS = {"max", "argmax"}
+MULTIPLICATIONS = {
+    "__mul__": "mul",
+    "mul": "mul",
+    "__matmul__": "matmul",
+    "matmul": "matmul",
+    "mm": "matmul",
+}
+
+# Composite operations and the number of comparisons they run per value
+SIGNS = {"sign": 2}
+# Composite operations multiplying a private tensor by itself, see _self_multiplications
+SELF_MULTIPLICATIONS = {"square", "pow", "__pow__"}
+
+# The crypto primitives which are stored by the workers
+STORED_PRIMITIVES = ("fss_eq", "fss_comp", "xor_add_couple")
+
+
+def _zeros(placeholder, shape=None):
+    """Return a zero tensor standing for the value of a placeholder"""
+    if shape is None:
+        shape = placeholder.expected_shape or ()
+    child = placeholder.child
+    dtype = child.dtype if isinstance(child, torch.Tensor) else None
+    return torch.zeros(shape, dtype=dtype)
+
+
+def _tournament_comparisons(shape, dim=None, method="tree"):
+    """Return the number of values compared to compute the max of a tensor along dim"""
+    n_values = torch.Size(shape).numel()
+    k = n_values if dim is None else shape[dim]
+    rest = n_values // k if k else 0
+
+    if method == "linear":
+        return (k - 1) * rest
+
+    n_comparisons = 0
+    while k > 1:
+        # Odd numbers of candidates are completed with a duplicate
+        k += k % 2
+        k //= 2
+        n_comparisons += k * rest
+    return n_comparisons
+
+
+def _self_multiplications(name, operands):
+    """Return the number of multiplications of a private tensor by itself run by an operation"""
+    if name in ("pow", "__pow__"):
+        power = operands[1] if len(operands) > 1 else None
+        if not isinstance(power, int) or power < 1:
+            return 0
+        # One square per bit of the exponent and one product per set bit but the first
+        return power.bit_length() + bin(power).count("1") - 1
+    return 1
+
+
+def _count_primitives(estimate, name, operands, private, kwargs, response):
+    """Add the primitives consumed by an action to the estimate"""
+    # Functions like torch.gt(x, y) are counted like methods like x.gt(y)
+    name = name.split(".")[-1] if name.startswith("torch.") else name
+
+    if not any(private):
+        return
+
+    if name in COMPARISONS:
+        estimate["fss_comp"] += response.numel()
+        estimate["xor_add_couple"] += response.numel()
+    elif name in EQUALITIES:
+        estimate["fss_eq"] += response.numel()
+    elif name in SIGNS and private[0]:
+        estimate["fss_comp"] += SIGNS[name] * response.numel()
+        estimate["xor_add_couple"] += SIGNS[name] * response.numel()
+    elif name in SELF_MULTIPLICATIONS and private[0]:
+        shape = tuple(operands[0].shape)
+        estimate["beaver"][("mul", shape, shape)] += _self_multiplications(name, operands)
+    elif name in TOURNAMENTS:
+        dim = operands[1] if len(operands) > 1 else kwargs.get("dim")
+        if isinstance(dim, torch.Tensor):
+            # Elementwise max of two tensors
+            n_comparisons = response.numel()
+        else:
+            n_comparisons = _tournament_comparisons(
+                operands[0].shape, dim, kwargs.get("method", "tree")
+            )
+        estimate["fss_comp"] += n_comparisons
+        estimate["xor_add_couple"] += n_comparisons
+    elif name in MULTIPLICATIONS and len(operands) == 2 and all(private):
+        a, b = operands
+        estimate["beaver"][(MULTIPLICATIONS[name], tuple(a.shape), tuple(b.shape))] += 1
+    elif name == "addmm" and len(operands) == 3 and all(private[1:]):
+        _, a, b = operands
+        estimate["beaver"][("matmul", tuple(a.shape), tuple(b.shape))] += 1
+
+
+def estimate_primitives(plan, batch_size: int = None) -> dict:
+    """
+    Compute the crypto primitives consumed by each party for one run of a Plan
+
+    Args:
+        plan (Plan): a built Plan
+        batch_size (int): the size of the first dimension of the inputs. If None,
+            the shapes of the inputs used to build the Plan are kept.
+
+    Returns:
+        a dict with the number of instances of each stored primitive, see
+        STORED_PRIMITIVES, and under "beaver" a Counter of the triples with
+        keys (equation, shape of the first operand, shape of the second operand)
+    """
+    if not plan.is_built:
+        raise RuntimeError("A plan needs to be built before its primitives can be estimated.")
+
+    role = plan.role
+    values = {}
+    for input_id in role.input_placeholder_ids:
+        placeholder = role.placeholders[input_id]
+        shape = placeholder.expected_shape
+        if batch_size is not None and shape:
+            shape = (batch_size, *shape[1:])
+        values[input_id] = _zeros(placeholder, shape)
+    for placeholder in role.state.state_placeholders:
+        values[placeholder.id.value] = _zeros(placeholder)
+
+    def fetch_value(ph_id):
+        if ph_id.value in values:
+            return values[ph_id.value]
+        return _zeros(role.placeholders[ph_id.value])
+
+    def fetch(obj):
+        return Role.nested_object_traversal(obj, fetch_value, PlaceholderId)
+
+    estimate = {crypto_type: 0 for crypto_type in STORED_PRIMITIVES}
+    estimate["beaver"] = Counter()
+
+    for action in role.actions:
+        target, args_, kwargs_ = fetch(action.target), fetch(action.args), fetch(action.kwargs)
+
+        if isinstance(action, CommunicationAction):
+            # Moving a value doesn't change it
+            response = target
+        elif target is None:
+            response = role._fetch_package_method(action.name)(*args_, **kwargs_)
+        else:
+            response = getattr(target, action.name)(*args_, **kwargs_)
+
+        if target is None:
+            operands, raw_operands = args_, action.args
+        else:
+            operands, raw_operands = (target, *args_), (action.target, *action.args)
+        private = [isinstance(operand, PlaceholderId) for operand in raw_operands]
+        _count_primitives(estimate, action.name, operands, private, kwargs_, response)
+
+        if action.return_ids:
+            responses = response if isinstance(response, (tuple, list)) else (response,)
+            for return_id, value in zip(action.return_ids, responses):
+                values[return_id.value] = value
+
+    return estimate
@@ -0,0 +1,95 @@
+"""
+Seed-based generation of random shares
+
+When additively sharing a secret among n parties, n - 1 shares are pure
+randomness. Instead of sending those shares in full, the dealer can send a
+short seed to each of these parties, who expand it locally into the very same
+random tensor with a deterministic pseudo-random generator.
+
+The generator is SHA-256 in counter mode: the i-th block of the stream derived
+from a seed is sha256(seed || stream counter || i), which keeps the full
+entropy of the seed.
+"""
+import hashlib
+import secrets
+
+import numpy as np
+import torch
+
+SEED_SIZE = 16  # in bytes
+
+DTYPES = {"long": (torch.int64, np.dtype("<u8")), "int": (torch.int32, np.dtype("<u4"))}
+
+
+class _KeyStream:
+    """Stream of pseudo-random bytes derived from a seed and a stream counter"""
+
+    def __init__(self, seed: bytes, counter: int):
+        self.prefix = seed + counter.to_bytes(8, byteorder="big")
+        self.block = 0
+
+    def read(self, nbytes: int) -> bytes:
+        digest_size = hashlib.sha256().digest_size
+        nr_blocks = -(-nbytes // digest_size)
+        blocks = b"".join(
+            hashlib.sha256(self.prefix + (self.block + i).to_bytes(8, byteorder="big")).digest()
+            for i in range(nr_blocks)
+        )
+        self.block += nr_blocks
+        return blocks[:nbytes]
+
+
+def generate_seed() -> bytes:
+    """Return a fresh random seed of SEED_SIZE bytes"""
+    return secrets.token_bytes(SEED_SIZE)
+
+
+def expand_seed(
+    seed: bytes, shape: tuple, dtype: str, min_value: int, max_value: int, counter: int = 0
+):
+    """
+    Deterministically expand a seed into a random tensor whose values are
+    uniform in [min_value, max_value)
+
+    Several independent streams can be derived from the same seed by
+    increasing the counter. When the size of the range isn't a power of two,
+    the values out of range are rejected and drawn again, so that there is no
+    modulo bias.
+
+    Args:
+        seed (bytes): the seed shared between the dealer and the receiver
+        shape (tuple): the shape of the tensor to generate
+        dtype (str): "long" or "int", the dtype of the tensor to generate
+        min_value (int): the lower bound of the values generated
+        max_value (int): the upper bound (excluded) of the values generated
+        counter (int): the index of the stream derived from the seed
+
+    Returns:
+        a torch tensor of the given shape and dtype
+    """
+    torch_dtype, word_dtype = DTYPES[dtype]
+    nr_bits = 8 * word_dtype.itemsize
+    value_range = max_value - min_value
+    if not 0 < value_range <= 2 ** nr_bits:
+        raise ValueError(f"Can't draw {dtype} values in [{min_value}, {max_value}).")
+
+    size = int(np.prod(shape, dtype=np.int64))
+    stream = _KeyStream(seed, counter)
+    range_bits = (value_range - 1).bit_length()
+    mask = word_dtype.type((1 << range_bits) - 1)
+
+    words = np.empty(0, dtype=word_dtype)
+    while words.size < size:
+        new_words = np.frombuffer(
+            stream.read((size - words.size) * word_dtype.itemsize), dtype=word_dtype
+        )
+        if range_bits < nr_bits:
+            new_words = new_words & mask
+        if value_range < 2 ** nr_bits:
+            new_words = new_words[new_words < word_dtype.type(value_range)]
+        words = np.concatenate([words, new_words])
+
+    # Shift the words by min_value modulo 2 ** nr_bits and read them as signed integers
+    values = words + word_dtype.type(min_value % 2 ** nr_bits)
+    values = values.view(word_dtype.str.replace("u", "i"))
+    return torch.from_numpy(values.reshape(shape).copy()).type(torch_dtype)
@@ -52,8 +52,9 @@ class PrimitiveStorage:
         """
         primitive_stack = getattr(self, type_op)
 
-        available_instances = len(primitive_stack[0]) if len(primitive_stack) > 0 else -1
-        if available_instances >= n_instances:
+        # The instances are stacked on the last dimension, see narrow below
+        available_instances = primitive_stack[0].shape[-1] if len(primitive_stack) > 0 else 0
+        if len(primitive_stack) > 0 and available_instances >= n_instances:
             keys = []
             # We iterate on the different elements that constitute a given primitive, for
             # example of the beaver triples, you would have 3 elements.
@@ -107,6 +108,53 @@ class PrimitiveStorage:
             )
             self._owner.send_msg(worker_message, worker)
 
+    def provision(
+        self, plan, batch_size: int = None, n_runs: int = 1, workers: List[AbstractWorker] = None
+    ):
+        """
+        Build and send at once the FSS keys needed to run an encrypted plan several times
+
+        Args:
+            plan: a built Plan, whose state is shared with protocol="fss"
+            batch_size: the size of the first dimension of the inputs, by default
+                the one of the inputs used to build the plan
+            n_runs: the number of runs of the plan to provide primitives for
+            workers: recipients of the primitives, by default the workers holding
+                the shares of the plan state
+
+        Returns:
+            the primitives consumed by a single run, see estimate_primitives
+        """
+        from syft.frameworks.torch.mpc.preprocessing import STORED_PRIMITIVES
+        from syft.frameworks.torch.mpc.preprocessing import estimate_primitives
+
+        estimate = estimate_primitives(plan, batch_size)
+
+        if workers is None:
+            workers = self._shares_locations(plan)
+
+        # The primitives needed in the same quantity are sent in a single message
+        types_by_n_instances = defaultdict(list)
+        for crypto_type in STORED_PRIMITIVES:
+            if estimate[crypto_type] > 0:
+                types_by_n_instances[estimate[crypto_type] * n_runs].append(crypto_type)
+
+        for n_instances, crypto_types in types_by_n_instances.items():
+            self.provide_primitives(crypto_types, workers, n_instances=n_instances)
+
+        return estimate
+
+    @staticmethod
+    def _shares_locations(plan):
+        """Return the workers holding the shares of the state of a plan"""
+        for tensor in plan.state.tensors():
+            while hasattr(tensor, "child"):
+                if isinstance(tensor, sy.AdditiveSharingTensor):
+                    return tensor.locations
+                tensor = tensor.child
+
+        raise ValueError("The state of the plan is not shared, the workers must be provided")
+
     def add_primitives(self, types_primitives: dict):
         """
         Include primitives in the store
@@ -7,9 +7,12 @@ Extended to a general case with N parties
 Note that there is a difference here in that our shares can be
 negative numbers while they are always positive in the paper
 """
+import itertools
 import math
 import torch
 import syft as sy
+from syft.frameworks.torch.mpc import prg
+from syft.generic import communication
 from syft.generic.utils import memorize
 
 # p is introduced in the SecureNN paper https://eprint.iacr.org/2018/442.pdf
@@ -65,7 +68,7 @@ def decompose(tensor, field):
     tensor = tensor.unsqueeze(-1)
     moduli = 2 ** powers
     tensor = torch.fmod((tensor / moduli.type_as(tensor)), 2)
-    return tensor
+    return tensor.type(torch_dtype)
 
 
 def flip(x, dim, dtype):
@@ -83,49 +86,144 @@ def flip(x, dim, dtype):
     return x.index_select(dim, indices)
 
 
-def _random_common_bit(*workers):
+def _party_selector(*workers):
     """
-    Return a bit chosen by a worker and sent to all workers,
+    Return j in the SecureNN paper: 1 on the first worker and 0 on the others,
     in the form of a MultiPointerTensor
     """
-    pointer = torch.tensor([1]).send(workers[0], **no_wrap).random_(2)
-    pointers = [pointer]
-    for worker in workers[1:]:
-        pointers.append(pointer.copy().move(worker))
-    bit = sy.MultiPointerTensor(children=pointers)
+    return sy.MultiPointerTensor(
+        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
+    )
+
+
+def _first_bit_mask(n_bits, *workers):
+    """
+    Return a mask of n_bits bits where only the first one is set, held by all
+    workers in the form of a MultiPointerTensor
+    """
+    mask = torch.zeros(n_bits, dtype=torch.int64)
+    mask[0] = 1
+    return mask.send(*workers, **no_wrap)
+
+
+# Seeds shared with sets of workers: worker ids -> (seed id, stream counter, connections)
+_common_seeds = {}
+
+
+def _connection(worker):
+    """
+    Return the object which is replaced when a worker restarts or reconnects, and
+    may then have lost its seeds: the websocket of remote workers, the worker itself
+    otherwise
+    """
+    return getattr(worker, "ws", worker)
+
+
+def _common_seed(*workers):
+    """
+    Send a seed common to a set of workers, once per set of workers
+
+    The cache is keyed by worker id and the seed is sent again when one of the
+    workers restarted or reconnected since, as it does not have the seed anymore.
+
+    Returns:
+        the id of the seed on the workers and the counter of its streams
+    """
+    worker_ids = tuple(worker.id for worker in workers)
+    connections = tuple(_connection(worker) for worker in workers)
+    if worker_ids in _common_seeds:
+        seed_id, counter, known_connections = _common_seeds[worker_ids]
+        if all(c is known for c, known in zip(connections, known_connections)):
+            return seed_id, counter
+
+    seed_id = sy.ID_PROVIDER.pop()
+    seed = prg.generate_seed()
+    owner = sy.local_worker
+    for worker in workers:
+        message = owner.create_worker_command_message("store_seed", None, seed_id, seed)
+        owner.send_msg(message, worker)
+
+    counter = itertools.count()
+    _common_seeds[worker_ids] = (seed_id, counter, connections)
+    return seed_id, counter
+
+
+def _common_random(shape, dtype, min_value, max_value, *workers):
+    """
+    Return a random tensor with values in [min_value, max_value) known by all
+    workers, in the form of a MultiPointerTensor
+
+    All workers expand the seed common to them with the same counter, so only
+    the counter is sent instead of the tensor.
+    """
+    seed_id, counter = _common_seed(*workers)
+    stream = next(counter)
+    owner = sy.local_worker
+
+    pointers = []
+    for worker in workers:
+        tensor_id = sy.ID_PROVIDER.pop()
+        message = owner.create_worker_command_message(
+            "expand_stored_seed", [tensor_id], seed_id, shape, dtype, min_value, max_value, stream
+        )
+        owner.send_msg(message, worker)
+        pointers.append(
+            sy.PointerTensor(
+                location=worker,
+                id_at_location=tensor_id,
+                owner=owner,
+                id=sy.ID_PROVIDER.pop(),
+                shape=torch.Size(shape),
+            )
+        )
 
-    return bit
+    return sy.MultiPointerTensor(children=pointers)
+
+
+def _random_common_bit(*workers):
+    """
+    Return a random bit known by all workers, in the form of a MultiPointerTensor
+    """
+    return _common_random((1,), "long", 0, 2, *workers)
 
 
 def _random_common_value(max_value, *workers):
     """
-    Return n in [0, max_value-1] chosen by a worker and sent to all workers,
+    Return n in [1, max_value // 2 - 1] known by all workers,
     in the form of a MultiPointerTensor
     """
-    torch_dtype = get_torch_dtype(max_value)
-    pointer = (
-        torch.tensor([1], dtype=torch_dtype)
-        .send(workers[0], **no_wrap)
-        .random_(1, get_max_val_field(max_value))
-    )
-    pointers = [pointer]
-    for worker in workers[1:]:
-        pointers.append(pointer.copy().move(worker))
-    common_value = sy.MultiPointerTensor(children=pointers)
+    return _common_random((1,), get_dtype(max_value), 1, get_max_val_field(max_value), *workers)
 
-    return common_value
+
+def _random_common_permutation(n, *workers):
+    """
+    Return a random permutation of range(n) known by all workers,
+    in the form of a MultiPointerTensor
+    """
+    # Sorting iid random keys gives a uniformly random permutation
+    return _common_random((n,), "long", 0, 2 ** 62, *workers).argsort()
 
 
 def _shares_of_zero(size, field, dtype, crypto_provider, *workers):
     """
     Return shares of zeros generated by a worker and sent to all workers,
     in the form of a MultiPointerTensor
+
+    The shares are seeded: the generating worker keeps the only full share and
+    the other workers expand theirs from a PRG seed.
     """
     torch_dtype = get_torch_dtype(field)
     u = (
         torch.zeros(size, dtype=torch_dtype)
         .send(workers[0])
-        .share(*workers, field=field, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
+        .share(
+            *workers,
+            field=field,
+            dtype=dtype,
+            crypto_provider=crypto_provider,
+            seeded=True,
+            **no_wrap,
+        )
         .get()
         .child
     )
@@ -133,6 +231,7 @@ def _shares_of_zero(size, field, dtype, crypto_provider, *workers):
     return u
 
 
+@communication.track("securenn.select_share")
 def select_share(alpha_sh, x_sh, y_sh):
     """ Performs select share protocol
     If the bit alpha_sh is 0, x_sh is returned
@@ -168,6 +267,7 @@ def select_share(alpha_sh, x_sh, y_sh):
     return z_sh
 
 
+@communication.track("securenn.private_compare")
 def private_compare(x_bit_sh, r, beta, L):
     """
     Perform privately x > r
@@ -196,13 +296,12 @@ def private_compare(x_bit_sh, r, beta, L):
     # https://eprint.iacr.org/2018/442.pdf
 
     # Common randomess
-    s = torch.randint(1, p, x_bit_sh.shape).send(*workers, **no_wrap)
-    u = torch.randint(1, p, x_bit_sh.shape).send(*workers, **no_wrap)
-    perm = torch.randperm(x_bit_sh.shape[-1]).send(*workers, **no_wrap)
+    shape = tuple(x_bit_sh.shape)
+    s = _common_random(shape, "long", 1, p, *workers)
+    u = _common_random(shape, "long", 1, p, *workers)
+    perm = _random_common_permutation(shape[-1], *workers)
 
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
+    j = _party_selector(*workers)
 
     # 1)
     t = r + 1
@@ -228,9 +327,7 @@ def private_compare(x_bit_sh, r, beta, L):
     c_igt1 = (1 - j) * (u + 1) - (j * u)
     c_ie1 = (1 - 2 * j) * u
 
-    l1_mask = torch.zeros(x_bit_sh.shape).long()
-    l1_mask[..., 0] = 1
-    l1_mask = l1_mask.send(*workers, **no_wrap)
+    l1_mask = _first_bit_mask(shape[-1], *workers)
     # c_else = if i == 1 c_ie1 else c_igt1
     c_else = (l1_mask * c_ie1) + ((1 - l1_mask) * c_igt1)
 
@@ -265,6 +362,7 @@ def private_compare(x_bit_sh, r, beta, L):
     return res
 
 
+@communication.track("securenn.msb")
 def msb(a_sh):
     """
     Compute the most significant bit in a_sh, this is an implementation of the
@@ -292,7 +390,7 @@ def msb(a_sh):
     u = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
 
     # 1)
-    x = torch.tensor(a_sh.shape).random_(get_max_val_field(L - 1))
+    x = torch.zeros(a_sh.shape, dtype=torch.int64).random_(get_max_val_field(L - 1))
     x_bit = decompose(x, L)
     x_sh = x.share(
         *workers, field=L - 1, dtype="custom", crypto_provider=crypto_provider, **no_wrap
@@ -320,9 +418,7 @@ def msb(a_sh):
     )
 
     # 7)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
+    j = _party_selector(*workers)
     gamma = beta_prime_sh + (j * beta) - (2 * beta * beta_prime_sh)
 
     # 8)
@@ -365,6 +461,7 @@ def msb(a_sh):
 #     return total.long()
 
 
+@communication.track("securenn.share_convert")
 def share_convert(a_sh):
     """
     Convert shares of a in field L to shares of a in field L - 1
@@ -472,6 +569,7 @@ def share_convert(a_sh):
     return y_sh
 
 
+@communication.track("securenn.relu_deriv")
 def relu_deriv(a_sh):
     """
     Compute the derivative of Relu
@@ -505,13 +603,12 @@ def relu_deriv(a_sh):
     alpha_sh = msb(y_sh)
 
     # 4)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
+    j = _party_selector(*workers)
     gamma_sh = j - alpha_sh + u
     return gamma_sh
 
 
+@communication.track("securenn.relu")
 def relu(a_sh):
     """
     Compute Relu
@@ -539,6 +636,7 @@ def relu(a_sh):
 
 # In division, bit_len_max is set to Q_BITS // 2 to avoid overflow problems (multiplying by
 # 2**64 would almost always lead to overflow).
+@communication.track("securenn.division")
 def division(x_sh, y_sh, bit_len_max=None):
     """ Performs division of encrypted numbers
 
@@ -597,6 +695,7 @@ def division(x_sh, y_sh, bit_len_max=None):
         return q
 
 
+@communication.track("securenn.maxpool")
 def maxpool(x_sh):
     """ Compute MaxPool: returns fresh shares of the max value in the input tensor
     and the index of this value in the flattened tensor
@@ -625,42 +724,84 @@ def maxpool(x_sh):
     u_sh = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
     v_sh = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
 
-    # 1)
-    max_sh = x_sh[0]
-    ind_sh = torch.tensor([0]).share(
-        *workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-    )  # I did not manage to create an AST with 0 and 0 as shares
+    max_sh, ind_sh = max_tree(x_sh)
 
-    for i in range(1, len(x_sh)):
-        # 3)
-        w_sh = x_sh[i] - max_sh
+    return max_sh + u_sh, ind_sh + v_sh
 
-        # 4)
-        beta_sh = relu_deriv(w_sh)
 
-        # 5)
-        max_sh = select_share(beta_sh, max_sh, x_sh[i])
+@communication.track("securenn.max_tree")
+def max_tree(x_sh):
+    """ Compute the max along the first dimension of a tensor with a tournament:
+    the candidates are compared by adjacent pairs in a single vectorized
+    comparison, until only one candidate remains. This takes log2(k) comparison
+    rounds where k = x_sh.shape[0], whatever the size of the other dimensions.
 
-        # 6)
-        k = torch.tensor([i]).share(
-            *workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-        )  # I did not manage to create an AST with 0 and i as shares
+    Like torch.max, the index of the first maximum is returned on ties.
 
-        # 7)
-        ind_sh = select_share(beta_sh, ind_sh, k)
+    Args:
+        x_sh (AdditiveSharingTensor): the private tensor on which the op applies,
+            of shape (k, *rest)
 
-    return max_sh + u_sh, ind_sh + v_sh
+    Returns:
+        maximum values along the first dimension, of shape (*rest)
+        index of these values along the first dimension, of shape (*rest),
+        as an AdditiveSharingTensor
+    """
+    workers = x_sh.locations
+    crypto_provider = x_sh.crypto_provider
+    L = x_sh.field
+    dtype = get_dtype(L)
+    torch_dtype = get_torch_dtype(L)
+
+    k, *rest = x_sh.shape
+    # The indices are shared so that they are selected like the values
+    ind_sh = (
+        torch.arange(k, dtype=torch_dtype)
+        .view(k, *[1] * len(rest))
+        .repeat(1, *rest)
+        .share(*workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
+    )
+    max_sh = x_sh
 
+    while k > 1:
+        if k % 2 == 1:
+            # Duplicate the last candidate: it doesn't change the max nor its index
+            max_sh = torch.cat((max_sh, max_sh[-1:]))
+            ind_sh = torch.cat((ind_sh, ind_sh[-1:]))
+            k += 1
 
-def maxpool_deriv(x_sh):
+        # The left candidate of each pair comes first, it is kept on ties
+        left_sh, right_sh = max_sh[0::2], max_sh[1::2]
+
+        beta_sh = right_sh > left_sh
+
+        max_sh = select_share(beta_sh, left_sh, right_sh)
+        ind_sh = select_share(beta_sh, ind_sh[0::2], ind_sh[1::2])
+
+        k = k // 2
+
+    return max_sh[0], ind_sh[0]
+
+
+@communication.track("securenn.maxpool_deriv")
+def maxpool_deriv(x_sh, dim: int = None):
     """ Compute derivative of MaxPool
 
+    The index of the max value is obtained with max_tree and is turned into a
+    one-hot vector with a single vectorized equality test against all positions.
+
+    Several windows can be processed at once by laying out their values along
+    dim, like the windows of maxpool2d: all the windows then share the same
+    comparison rounds.
+
     Args:
         x_sh (AdditiveSharingTensor): the private tensor on which the op applies
+        dim (int): the dimension along which the values of each window are laid
+            out. If None, the whole tensor is a single window.
 
     Returns:
         an AdditiveSharingTensor of the same shape as x_sh full of zeros except for
-        a 1 at the position of the max value
+        a 1 at the position of the max value of each window
     """
     assert (
         x_sh.dtype != "custom"
@@ -672,43 +813,41 @@ def maxpool_deriv(x_sh):
     dtype = get_dtype(L)
     torch_dtype = get_torch_dtype(L)
 
-    n1, n2 = x_sh.shape
-    n = n1 * n2
-    assert L % n == 0
-    x_sh = x_sh.view(-1)
-
-    # Common Randomness
-    U_sh = _shares_of_zero(n, L, dtype, crypto_provider, *workers)
-
-    r = _random_common_value(L, *workers)
+    input_shape = x_sh.shape
+    if dim is None:
+        x_sh = x_sh.contiguous().view(-1, 1)
+    elif dim != 0:
+        x_sh = x_sh.transpose(0, dim)
+    windows_shape = x_sh.shape
+    k = windows_shape[0]
+    x_sh = x_sh.contiguous().view(k, -1)
 
     # 1)
-    _, ind_max_sh = maxpool(x_sh)
+    _, ind_max_sh = max_tree(x_sh)
 
-    # 2)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
+    # 2) Equality test between the indices and all positions: -(ind - i)^2 >= 0 iff ind == i
+    positions_sh = (
+        torch.arange(k, dtype=torch_dtype)
+        .unsqueeze(1)
+        .share(*workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
     )
-    k_sh = ind_max_sh + j * r
-
-    # 3)
-    t = k_sh.get()
-    k = t % n
-    E_k = torch.zeros(n, dtype=torch_dtype)
-    E_k[k] = 1
-    E_sh = E_k.share(*workers, field=L, dtype=dtype, **no_wrap)
-
-    # 4)
-    g = r % n
-    D_sh = torch.roll(E_sh, -g)
+    diff_sh = ind_max_sh - positions_sh
+    maxpool_d_sh = relu_deriv(diff_sh * diff_sh * -1).view(*windows_shape)
 
-    maxpool_d_sh = D_sh + U_sh
-    return maxpool_d_sh.view(n1, n2)
+    if dim is not None and dim != 0:
+        maxpool_d_sh = maxpool_d_sh.transpose(0, dim)
+    return maxpool_d_sh.contiguous().view(*input_shape)
 
 
+@communication.track("securenn.maxpool2d")
 def maxpool2d(a_sh, kernel_size: int = 1, stride: int = 1, padding: int = 0):
     """Applies a 2D max pooling over an input signal composed of several input planes.
     This interface is similar to torch.nn.MaxPool2D.
+
+    The values of all the windows are gathered at once with unfold on the shares
+    and reduced with max_tree, so the number of comparison rounds only depends
+    on the kernel size.
+
     Args:
         kernel_size: the size of the window to take a max over
         stride: the stride of the window
@@ -725,19 +864,10 @@ def maxpool2d(a_sh, kernel_size: int = 1, stride: int = 1, padding: int = 0):
     padding = torch.nn.modules.utils._pair(padding)
 
     # TODO: support dilation.
-    dilation = torch.nn.modules.utils._pair(1)
 
     # Extract a few useful values
     batch_size, nb_channels, nb_rows_in, nb_cols_in = a_sh.shape
 
-    # Calculate output shapes
-    nb_rows_out = int(
-        (nb_rows_in + 2 * padding[0] - dilation[0] * (kernel[0] - 1) - 1) / stride[0] + 1
-    )
-    nb_cols_out = int(
-        (nb_cols_in + 2 * padding[1] - dilation[1] * (kernel[1] - 1) - 1) / stride[1] + 1
-    )
-
     # Apply padding to the input
     if padding != (0, 0):
         a_sh = torch.nn.functional.pad(
@@ -747,18 +877,30 @@ def maxpool2d(a_sh, kernel_size: int = 1, stride: int = 1, padding: int = 0):
         nb_rows_in += 2 * padding[0]
         nb_cols_in += 2 * padding[1]
 
-    res = []
-    # TODO: make this operation more efficient in order to be used with cnn modules.
-    for batch in range(batch_size):
-        for channel in range(nb_channels):
-            for r_in in range(0, nb_rows_in - (kernel[0] - 1), stride[0]):
-                for c_in in range(0, nb_cols_in - (kernel[1] - 1), stride[1]):
-                    m, _ = maxpool(
-                        a_sh[
-                            batch, channel, r_in : r_in + kernel[0], c_in : c_in + kernel[1],
-                        ].child
-                    )
-                    res.append(m.wrap())
-
-    res = torch.stack(res).reshape(batch_size, nb_channels, nb_rows_out, nb_cols_out)
-    return res
+    nb_rows_out = (nb_rows_in - kernel[0]) // stride[0] + 1
+    nb_cols_out = (nb_cols_in - kernel[1]) // stride[1] + 1
+
+    while a_sh.is_wrapper:
+        a_sh = a_sh.child
+    workers = a_sh.locations
+    crypto_provider = a_sh.crypto_provider
+    L = a_sh.field
+    dtype = get_dtype(L)
+
+    # Put the values of each window on the first dimension:
+    # (kernel rows * kernel cols, batch * channels * rows out * cols out)
+    windows = (
+        a_sh.unfold(2, kernel[0], stride[0])
+        .unfold(3, kernel[1], stride[1])
+        .permute(4, 5, 0, 1, 2, 3)
+        .contiguous()
+        .view(kernel[0] * kernel[1], -1)
+    )
+
+    # Common Randomness
+    u_sh = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
+
+    max_sh, _ = max_tree(windows)
+
+    res = (max_sh + u_sh).view(batch_size, nb_channels, nb_rows_out, nb_cols_out)
+    return res.wrap()
@@ -3,15 +3,75 @@ from typing import Callable
 import torch
 
 import syft as sy
+from syft.frameworks.torch.mpc.beaver import request_mask
 from syft.frameworks.torch.mpc.beaver import request_triple
 from syft.workers.abstract import AbstractWorker
 
 no_wrap = {"no_wrap": True}
 
 
+class PersistentMask:
+    """
+    The random mask b of a value y which doesn't change, like the weights of a
+    served model, with the masked value y - b opened once and for all.
+
+    The crypto provider keeps b to generate the triples (a, b, a * b) of the next
+    multiplications with y, so only x - a needs to be opened online.
+
+    Attributes:
+        mask: a pointer to b held by the crypto provider
+        mask_shared (AdditiveSharingTensor): the shares of b
+        masked_value (MultiPointerTensor): y - b, public to the parties
+    """
+
+    # The shape methods which can be applied to a fixed value and to its mask
+    shape_methods = ("t", "transpose", "permute", "view", "reshape", "squeeze", "unsqueeze")
+    # The in-place methods which aren't named like add_ or copy_
+    inplace_methods = ("__setitem__", "__iadd__", "__isub__", "__imul__", "__itruediv__")
+
+    def __init__(self, mask, mask_shared, masked_value):
+        self.mask = mask
+        self.mask_shared = mask_shared
+        self.masked_value = masked_value
+
+    @staticmethod
+    def is_inplace(method_name: str) -> bool:
+        """Return True if the method modifies the value, whose mask is then stale"""
+        return method_name in PersistentMask.inplace_methods or (
+            method_name.endswith("_") and not method_name.endswith("__")
+        )
+
+    def apply(self, method_name: str, *args, **kwargs) -> "PersistentMask":
+        """Return the mask of the value to which the shape method method_name was applied"""
+        return PersistentMask(
+            *(
+                getattr(value, method_name)(*args, **kwargs)
+                for value in (self.mask, self.mask_shared, self.masked_value)
+            )
+        )
+
+
+def persistent_mask(y_sh) -> PersistentMask:
+    """
+    Mask a fixed AdditiveSharingTensor and open the masked value
+
+    This is the only round of communication needed for y in all the following
+    multiplications with y.
+    """
+    mask, mask_shared = request_mask(
+        y_sh.crypto_provider, y_sh.field, y_sh.dtype, y_sh.shape, y_sh.locations, y_sh.seeded
+    )
+    masked_value = (y_sh - mask_shared).reconstruct()
+
+    return PersistentMask(mask, mask_shared, masked_value)
+
+
 def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field: int, dtype: str):
     """Abstractly multiplies two tensors (mul or matmul)
 
+    If x_sh or y_sh has a persistent mask, the triple is generated for this mask
+    and the masked value isn't opened again.
+
     Args:
         cmd: a callable of the equation to be computed (mul or matmul)
         x_sh (AdditiveSharingTensor): the left part of the operation
@@ -28,17 +88,44 @@ def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field:
 
     locations = x_sh.locations
     torch_dtype = x_sh.torch_dtype
+    x_mask, y_mask = x_sh.mask, y_sh.mask
 
     # Get triples
     a, b, a_mul_b = request_triple(
-        crypto_provider, cmd, field, dtype, x_sh.shape, y_sh.shape, locations
+        crypto_provider,
+        cmd,
+        field,
+        dtype,
+        x_sh.shape,
+        y_sh.shape,
+        locations,
+        seeded=x_sh.seeded,
+        a=None if x_mask is None else x_mask.mask,
+        b=None if y_mask is None else y_mask.mask,
     )
 
-    delta = x_sh - a
-    epsilon = y_sh - b
-    # Reconstruct and send to all workers
-    delta = delta.reconstruct()
-    epsilon = epsilon.reconstruct()
+    if x_mask is None and y_mask is None:
+        delta = x_sh - a
+        epsilon = y_sh - b
+        # Reconstruct delta and epsilon in a single exchange and send them to all workers.
+        # Their shares are cast to the same dtype, as y_sh can be shared on another field.
+        delta_epsilon = torch.cat(
+            (delta.reshape(-1).type(torch_dtype), epsilon.reshape(-1).type(torch_dtype))
+        )
+        delta_epsilon = delta_epsilon.reconstruct()
+        n_delta = x_sh.shape.numel()
+        delta = delta_epsilon[:n_delta].reshape(x_sh.shape)
+        epsilon = delta_epsilon[n_delta:].reshape(y_sh.shape)
+    else:
+        # Only the values without a persistent mask are opened
+        if x_mask is None:
+            delta = (x_sh - a).reconstruct()
+        else:
+            a, delta = x_mask.mask_shared, x_mask.masked_value
+        if y_mask is None:
+            epsilon = (y_sh - b).reconstruct()
+        else:
+            b, epsilon = y_mask.mask_shared, y_mask.masked_value
 
     delta_epsilon = cmd(delta, epsilon)
 
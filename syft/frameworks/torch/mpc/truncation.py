@@ -0,0 +1,159 @@
+"""
+Truncation protocols for additively shared fixed precision values
+
+After a multiplication, a fixed precision value has twice the number of
+fractional digits it should have and must be divided by base ** precision.
+The default "div" truncation divides each share by this public divisor,
+rounding towards zero. With 2 parties, this is correct up to the last digit
+unless the shares wrap around the field, like "secureml" below. With more
+parties, the sum of the shares is x plus a multiple of the field which is
+often not zero, and the divided shares are then wrong.
+
+The protocols below trade a bounded error on the last digit for fewer rounds:
+    - "secureml" (2 parties): each party truncates its own share locally, one
+        rounding down and the other one rounding up, as in SecureML (Mohassel &
+        Zhang, 2017). No communication at all, the result is off by at most 1.
+    - "pair" (n parties): the crypto provider deals a random pair ([r], [r / d]).
+        The parties open x - r on a single worker, which divides it publicly and
+        adds it to its share of r / d. A single round for any number of parties,
+        the result is off by at most 1.
+
+Both fail with a probability of about |x| / field, when the random values wrap
+around the field, which is negligible for fixed precision values.
+"""
+import torch
+
+import syft as sy
+from syft.workers.abstract import AbstractWorker
+
+METHODS = ("div", "secureml", "pair")
+
+
+def _floor_div(x, divisor: int):
+    """Floor division of an integer tensor or of a pointer to it by a public integer"""
+    quotient = x / divisor
+    # Integer division rounds towards 0, which is one too much for negative values
+    return quotient - (quotient * divisor > x).type_as(quotient)
+
+
+def request_truncation_pair(
+    crypto_provider: AbstractWorker,
+    field: int,
+    dtype: str,
+    shape: tuple,
+    divisor: int,
+    locations: list,
+    seeded: bool = False,
+):
+    """Generates a truncation pair and sends it to all locations.
+
+    Args:
+        crypto_provider: worker you would like to request the pair from
+        field: An integer representing the field size.
+        dtype: represents the dtype of shares
+        shape: the shape of the values to truncate
+        divisor: the public integer the values are divided by
+        locations: A list of workers where the pair should be shared between.
+        seeded: If True, the crypto provider sends PRG seeds instead of full shares
+            to all locations but one.
+
+    Returns:
+        A pair of AdditiveSharedTensors such that r_trunc_shared = floor(r_shared / divisor).
+    """
+    r = crypto_provider.remote.torch.randint(-(field // 2), (field - 1) // 2, shape)
+    r_trunc = _floor_div(r, divisor)
+
+    res = torch.cat((r.view(-1), r_trunc.view(-1)))
+
+    shares = (
+        res.share(
+            *locations, field=field, dtype=dtype, crypto_provider=crypto_provider, seeded=seeded
+        )
+        .get()
+        .child
+    )
+    r_shared = shares[: r.numel()].reshape(shape)
+    r_trunc_shared = shares[r.numel() :].reshape(shape)
+
+    return r_shared, r_trunc_shared
+
+
+def truncate_secureml(x_sh, divisor: int):
+    """
+    Truncate locally the shares of a 2-party AdditiveSharingTensor
+
+    Args:
+        x_sh (AdditiveSharingTensor): the value to truncate, shared between 2 parties
+        divisor (int): the public integer the value is divided by
+
+    Returns:
+        an AdditiveSharingTensor of floor(x / divisor) or floor(x / divisor) + 1
+    """
+    assert (
+        len(x_sh.locations) == 2
+    ), "SecureML truncation only works with 2 parties, use truncation='pair' instead"
+
+    (location_0, share_0), (location_1, share_1) = x_sh.child.items()
+    shares = {location_0: _floor_div(share_0, divisor), location_1: -_floor_div(-share_1, divisor)}
+
+    return sy.AdditiveSharingTensor(shares, **x_sh.get_class_attributes())
+
+
+def truncate_pair(x_sh, divisor: int):
+    """
+    Truncate an AdditiveSharingTensor shared between any number of parties,
+    using a truncation pair of the crypto provider
+
+    Args:
+        x_sh (AdditiveSharingTensor): the value to truncate
+        divisor (int): the public integer the value is divided by
+
+    Returns:
+        an AdditiveSharingTensor of floor(x / divisor) or floor(x / divisor) - 1
+    """
+    assert x_sh.crypto_provider is not None, "Pair truncation requires a crypto_provider"
+
+    locations = x_sh.locations
+    r_sh, r_trunc_sh = request_truncation_pair(
+        x_sh.crypto_provider,
+        x_sh.field,
+        x_sh.dtype,
+        x_sh.shape,
+        divisor,
+        locations,
+        seeded=x_sh.seeded,
+    )
+
+    # Open x - r on the first location only, which is the one adding it to its share
+    masked_sh = x_sh - r_sh
+    first_location = locations[0]
+    masked = masked_sh.child[first_location.id]
+    for location in locations[1:]:
+        masked = masked + masked_sh.child[location.id].move(first_location)
+
+    shares = dict(r_trunc_sh.child)
+    shares[first_location.id] = shares[first_location.id] + _floor_div(masked, divisor)
+
+    return sy.AdditiveSharingTensor(shares, **x_sh.get_class_attributes())
+
+
+def truncate(x_sh, divisor: int, method: str = "div"):
+    """
+    Divide an AdditiveSharingTensor by a public integer with the given truncation method
+
+    Args:
+        x_sh (AdditiveSharingTensor): the value to truncate
+        divisor (int): the public integer the value is divided by
+        method (str): "div", "secureml" or "pair", see the module docstring
+    """
+    if method == "div":
+        return x_sh / divisor
+
+    assert x_sh.dtype in ("long", "int"), "Truncation protocols only support dtype long or int"
+
+    if method == "secureml":
+        return truncate_secureml(x_sh, divisor)
+    elif method == "pair":
+        return truncate_pair(x_sh, divisor)
+    else:
+        raise ValueError(f"Unknown truncation method {method}, use one of {METHODS}")
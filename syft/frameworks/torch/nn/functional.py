@@ -90,48 +90,52 @@ def conv2d(input, weight, bias=None, stride=1, padding=0, dilation=1, groups=1):
         nb_rows_in += 2 * padding[0]
         nb_cols_in += 2 * padding[1]
 
-    # We want to get relative positions of values in the input tensor that are used by one filter convolution.
-    # It basically is the position of the values used for the top left convolution.
-    pattern_ind = []
-    for ch in range(nb_channels_in):
-        for r in range(nb_rows_kernel):
-            for c in range(nb_cols_kernel):
-                pixel = r * nb_cols_in * dilation[0] + c * dilation[1]
-                pattern_ind.append(pixel + ch * nb_rows_in * nb_cols_in)
-
     # The image tensor is reshaped for the matrix multiplication:
     # on each row of the new tensor will be the input values used for each filter convolution
     # We will get a matrix [[in values to compute out value 0],
     #                       [in values to compute out value 1],
     #                       ...
     #                       [in values to compute out value nb_rows_out*nb_cols_out]]
-    im_flat = input.view(batch_size, -1)
-    im_reshaped = []
-    for cur_row_out in range(nb_rows_out):
-        for cur_col_out in range(nb_cols_out):
-            # For each new output value, we just need to shift the receptive field
-            offset = cur_row_out * stride[0] * nb_cols_in + cur_col_out * stride[1]
-            tmp = [ind + offset for ind in pattern_ind]
-            im_reshaped.append(im_flat[:, tmp])
-    im_reshaped = torch.stack(im_reshaped).permute(1, 0, 2)
+    # The receptive fields of all the output values are gathered at once with unfold,
+    # which runs where the values are and doesn't need any index. A dilated kernel is
+    # unfolded over its whole span, which is then subsampled.
+    span_rows = dilation[0] * (nb_rows_kernel - 1) + 1
+    span_cols = dilation[1] * (nb_cols_kernel - 1) + 1
+    windows = input.unfold(2, span_rows, stride[0]).unfold(3, span_cols, stride[1])
+    if dilation != (1, 1):
+        windows = windows[:, :, :, :, :: dilation[0], :: dilation[1]]
+    # (batch, rows out, cols out, channels in, kernel rows, kernel cols)
+    im_reshaped = windows.permute(0, 2, 3, 1, 4, 5).reshape(
+        batch_size, nb_rows_out * nb_cols_out, nb_channels_in * nb_rows_kernel * nb_cols_kernel
+    )
 
     # The convolution kernels are also reshaped for the matrix multiplication
     # We will get a matrix [[weights for out channel 0],
     #                       [weights for out channel 1],
     #                       ...
     #                       [weights for out channel nb_channels_out]].TRANSPOSE()
-    weight_reshaped = weight.view(nb_channels_out // groups, -1).t()
-
-    # Now that everything is set up, we can compute the result
     if groups > 1:
-        res = []
-        chunks_im = torch.chunk(im_reshaped, groups, dim=2)
-        chunks_weights = torch.chunk(weight_reshaped, groups, dim=0)
-        for g in range(groups):
-            tmp = chunks_im[g].matmul(chunks_weights[g])
-            res.append(tmp)
-        res = torch.cat(res, dim=2)
+        # Each group is an independent convolution: groups are stacked on a leading
+        # dimension so that a single batched matrix multiplication computes all of them
+        nb_values_kernel = nb_channels_kernel * nb_rows_kernel * nb_cols_kernel
+        # The operands are made contiguous, as the shares are flattened by the multiplication
+        im_reshaped = (
+            im_reshaped.reshape(batch_size, nb_rows_out * nb_cols_out, groups, nb_values_kernel)
+            .permute(2, 0, 1, 3)
+            .contiguous()
+        )
+        weight_reshaped = (
+            weight.reshape(groups, nb_channels_out // groups, nb_values_kernel)
+            .permute(0, 2, 1)
+            .unsqueeze(1)
+            .contiguous()
+        )
+        res = im_reshaped.matmul(weight_reshaped)
+        res = res.permute(1, 2, 0, 3).reshape(
+            batch_size, nb_rows_out * nb_cols_out, nb_channels_out
+        )
     else:
+        weight_reshaped = weight.reshape(nb_channels_out, -1).t().contiguous()
         res = im_reshaped.matmul(weight_reshaped)
 
     # Add a bias if needed
@@ -152,54 +156,38 @@ def conv2d(input, weight, bias=None, stride=1, padding=0, dilation=1, groups=1):
     return res
 
 
-def _pool(tensor, kernel_size: int = 2, stride: int = 2, mode="max"):
-    output_shape = (
-        (tensor.shape[0] - kernel_size) // stride + 1,
-        (tensor.shape[1] - kernel_size) // stride + 1,
+def pool2d(tensor, kernel_size: int = 2, stride: int = 2, mode="max"):
+    """
+    Apply a 2d pooling on a tensor of 2, 3 or 4 dimensions
+
+    All the windows of all the batches and channels are laid out as the columns
+    of a single matrix, so that they are reduced together in one operation.
+    """
+    assert 2 <= len(tensor.shape) <= 4
+    *batch_shape, nb_rows_in, nb_cols_in = tensor.shape
+    out_shape = (
+        *batch_shape,
+        (nb_rows_in - kernel_size) // stride + 1,
+        (nb_cols_in - kernel_size) // stride + 1,
     )
-    kernel_size = (kernel_size, kernel_size)
-    b = torch.ones(tensor.shape)  # when torch.Tensor.stride() is supported: replace with A.stride()
-    a_strides = b.stride()
-    a_w = torch.as_strided(
-        tensor,
-        size=output_shape + kernel_size,
-        stride=(stride * a_strides[0], stride * a_strides[1]) + a_strides,
+
+    # Build a (kernel_size ** 2, nb_windows) matrix of the values in each window
+    windows = (
+        tensor.unfold(-2, kernel_size, stride)
+        .unfold(-2, kernel_size, stride)
+        .reshape(-1, kernel_size * kernel_size)
+        .t()
+        .contiguous()
     )
-    a_w = a_w.reshape(-1, *kernel_size)
-    result = []
-    if mode is "max":
-        for channel in range(a_w.shape[0]):
-            result.append(a_w[channel].max())
-    elif mode is "mean":
-        for channel in range(a_w.shape[0]):
-            result.append(torch.mean(a_w[channel]))
+
+    if mode == "max":
+        result = windows.max(dim=0)[0]
+    elif mode == "mean":
+        result = torch.mean(windows, 0)
     else:
         raise ValueError("unknown pooling mode")
 
-    result = torch.stack(result).reshape(output_shape)
-    return result
-
-
-def pool2d(tensor, kernel_size: int = 2, stride: int = 2, mode="max"):
-    assert len(tensor.shape) < 5
-    if len(tensor.shape) == 2:
-        return _pool(tensor, kernel_size, stride, mode)
-    if len(tensor.shape) == 3:
-        return torch.squeeze(pool2d(torch.unsqueeze(tensor, dim=0), kernel_size, stride, mode))
-    batches = tensor.shape[0]
-    channels = tensor.shape[1]
-    out_shape = (
-        batches,
-        channels,
-        (tensor.shape[2] - kernel_size) // stride + 1,
-        (tensor.shape[3] - kernel_size) // stride + 1,
-    )
-    result = []
-    for batch in range(batches):
-        for channel in range(channels):
-            result.append(_pool(tensor[batch][channel], kernel_size, stride, mode))
-    result = torch.stack(result).reshape(out_shape)
-    return result
+    return result.reshape(out_shape)
 
 
 def maxpool2d(tensor, kernel_size: int = 2, stride: int = 2):
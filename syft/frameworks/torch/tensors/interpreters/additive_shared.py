@@ -7,6 +7,8 @@ from syft.frameworks.torch.mpc import crypto_protocol
 from syft.frameworks.torch.mpc import spdz
 from syft.frameworks.torch.mpc import securenn
 from syft.frameworks.torch.mpc import fss
+from syft.frameworks.torch.mpc import prg
+from syft.generic import communication
 from syft.generic.utils import memorize
 
 from syft.generic.tensor import AbstractTensor
@@ -32,6 +34,7 @@ class AdditiveSharingTensor(AbstractTensor):
         protocol="snn",
         dtype=None,
         crypto_provider=None,
+        seeded=False,
         tags=None,
         description=None,
     ):
@@ -47,9 +50,13 @@ class AdditiveSharingTensor(AbstractTensor):
                 the tensor is located.
             id: An optional string or integer id of the AdditiveSharingTensor.
             field: size of the arithmetic field in which the shares live
+            protocol: the crypto protocol used for comparisons, 'snn', 'fss' or
+                'auto' to select the fastest one with the cost model
             dtype: dtype of the field in which shares live
             crypto_provider: an optional BaseWorker providing crypto elements
                 such as Beaver triples
+            seeded: if True, all the shares but one are distributed as short PRG
+                seeds which are expanded locally by their owners
             tags: an optional set of hashtags corresponding to this tensor
                 which this tensor should be searchable for
             description: an optional string describing the purpose of the
@@ -121,6 +128,9 @@ class AdditiveSharingTensor(AbstractTensor):
         )
 
         self.protocol = protocol
+        self.seeded = seeded
+        # Persistent mask of a fixed value, see persist_mask
+        self.mask = None
 
     def __repr__(self):
         return self.__str__()
@@ -193,6 +203,7 @@ class AdditiveSharingTensor(AbstractTensor):
             "dtype": self.dtype,
             "field": self.field,
             "protocol": self.protocol,
+            "seeded": self.seeded,
         }
 
     @property
@@ -266,6 +277,9 @@ class AdditiveSharingTensor(AbstractTensor):
             *owners the list of shareholders. Can be of any length.
 
             """
+        if self.seeded:
+            return self.init_seeded_shares(*owners)
+
         shares = self.generate_shares(
             self.child, n_workers=len(owners), random_type=self.torch_dtype
         )
@@ -278,6 +292,58 @@ class AdditiveSharingTensor(AbstractTensor):
         self.child = shares_dict
         return self
 
+    def init_seeded_shares(self, *owners):
+        """Initializes shares by sending PRG seeds instead of full random tensors
+
+        All the shares but one are pure randomness, so their owners only receive
+        a seed that they expand locally. The remaining share is the secret minus
+        the expanded shares: it is kept by the dealer if it is one of the owners,
+        otherwise it is sent in full to the last owner.
+
+        Args:
+            *owners the list of shareholders. Can be of any length.
+        """
+        secret = self.child.type(self.torch_dtype)
+        shape = tuple(secret.shape)
+        dtype = "long" if self.torch_dtype == torch.int64 else "int"
+
+        owner_ids = [owner.id for owner in owners]
+        if self.owner is not None and self.owner.id in owner_ids:
+            residual_idx = owner_ids.index(self.owner.id)
+        else:
+            residual_idx = len(owners) - 1
+
+        share_ptrs = [None] * len(owners)
+        residual = secret
+        for i, owner in enumerate(owners):
+            if i == residual_idx:
+                continue
+            seed = prg.generate_seed()
+            share = prg.expand_seed(seed, shape, dtype, self.min_value, self.max_value)
+            residual = self.modulo(residual - share)
+            share_ptrs[i] = self._send_seed(seed, shape, dtype, owner)
+
+        share_ptrs[residual_idx] = residual.send(owners[residual_idx], **no_wrap)
+
+        self.child = {share_ptr.location.id: share_ptr for share_ptr in share_ptrs}
+        return self
+
+    def _send_seed(self, seed, shape, dtype, owner):
+        """Ask owner to expand a seed into a share and return a pointer to this share"""
+        share_id = sy.ID_PROVIDER.pop()
+        message = self.owner.create_worker_command_message(
+            "expand_seeded_share", [share_id], seed, shape, dtype, self.min_value, self.max_value
+        )
+        self.owner.send_msg(message, owner)
+
+        return sy.PointerTensor(
+            location=owner,
+            id_at_location=share_id,
+            owner=self.owner,
+            id=sy.ID_PROVIDER.pop(),
+            shape=torch.Size(shape),
+        )
+
     def generate_shares(self, secret, n_workers, random_type):
         """The cryptographic method for generating shares given a secret tensor.
 
@@ -307,14 +373,29 @@ class AdditiveSharingTensor(AbstractTensor):
             shares.append(self.modulo(share))
         return shares
 
-    def reconstruct(self):
+    def reconstruct(self, mode="broadcast"):
         """
         Reconstruct the shares of the AdditiveSharingTensor remotely without
         its owner being able to see any sensitive value
 
+        Args:
+            mode (str): how shares are exchanged, can be:
+                - "broadcast": each worker sends its share to all the other workers
+                    and sums the shares it holds, so that all transfers are independent
+                - "relay": all shares are gathered on the first worker which sends the
+                    result to the other workers one after the other
+
         Returns:
             A MultiPointerTensor where all workers hold the reconstructed value
         """
+        if mode == "broadcast":
+            # Pointers can't be reduced modulo a custom field, in this case the shares
+            # are summed on a single worker where AdditiveSharingTensor.get is applied
+            if self.dtype != "custom" or self.field in (2 ** 32, 2 ** 64):
+                return self._reconstruct_broadcast()
+        elif mode != "relay":
+            raise ValueError(f"Unknown reconstruction mode: {mode}")
+
         workers = self.locations
 
         ptr_to_sh = self.copy().wrap().send(workers[0], **no_wrap)
@@ -326,6 +407,34 @@ class AdditiveSharingTensor(AbstractTensor):
 
         return sy.MultiPointerTensor(children=pointers)
 
+    def _reconstruct_broadcast(self):
+        """
+        Reconstruct the shares by having each worker send its share to all
+        the others and sum locally the shares it has received
+
+        Returns:
+            A MultiPointerTensor where all workers hold the reconstructed value
+        """
+        shares = list(self.child.values())
+
+        # 1) Each worker sends a copy of its share to all the other workers
+        received = {share.location.id: [share] for share in shares}
+        for share in shares:
+            for other_share in shares:
+                location = other_share.location
+                if location.id != share.location.id:
+                    received[location.id].append(share.copy().move(location))
+
+        # 2) Each worker sums the shares it holds
+        pointers = []
+        for location_shares in received.values():
+            result = location_shares[0]
+            for share in location_shares[1:]:
+                result = result + share
+            pointers.append(result)
+
+        return sy.MultiPointerTensor(children=pointers)
+
     def zero(self, shape=None):
         """
         Build an additive shared tensor of value zero with the same
@@ -339,6 +448,7 @@ class AdditiveSharingTensor(AbstractTensor):
             field=self.field,
             dtype=self.dtype,
             crypto_provider=self.crypto_provider,
+            seeded=self.seeded,
             **no_wrap,
         )
         return zero
@@ -513,6 +623,19 @@ class AdditiveSharingTensor(AbstractTensor):
     def __rsub__(self, other):
         return (self - other) * -1
 
+    def persist_mask(self):
+        """
+        Mask this tensor once and for all for the following multiplications
+
+        Only use this on values which don't change, like the weights of a model
+        used for inference: the masked value is opened now, and the multiplications
+        with this tensor then only open their other operand, which halves their
+        online communication. Shape methods like t() or view() keep the mask,
+        in-place modifications drop it.
+        """
+        self.mask = spdz.persistent_mask(self)
+        return self
+
     def _private_mul(self, other, equation: str):
         """Abstractly Multiplies two tensors
 
@@ -585,6 +708,7 @@ class AdditiveSharingTensor(AbstractTensor):
                     worker: (self.modulo(cmd(share, other))) for worker, share in shares.items()
                 }
 
+    @communication.track("AdditiveSharingTensor.mul")
     def mul(self, other):
         """Multiplies two tensors together
 
@@ -632,6 +756,7 @@ class AdditiveSharingTensor(AbstractTensor):
 
     __pow__ = pow
 
+    @communication.track("AdditiveSharingTensor.matmul")
     def matmul(self, other):
         """Multiplies two tensors matrices together
 
@@ -659,6 +784,7 @@ class AdditiveSharingTensor(AbstractTensor):
 
         result = self.__truediv__(*args, **kwargs)
         self.child = result.child
+        self.mask = None
 
     def _private_div(self, divisor):
         return securenn.division(self, divisor)
@@ -967,7 +1093,7 @@ class AdditiveSharingTensor(AbstractTensor):
     def __eq__(self, other):
         return self.eq(other)
 
-    def max(self, dim=None, return_idx=False):
+    def max(self, dim=None, return_idx=False, method="tree"):
         """
         Return the maximum value of an additive shared tensor
 
@@ -977,6 +1103,11 @@ class AdditiveSharingTensor(AbstractTensor):
             return_idx (bool): Return the index of the maximum value
                 Note that if dim is specified then the index is returned
                 anyway to match the Pytorch syntax.
+            method (str): how the candidates are compared, can be:
+                - "tree": a tournament where half of the candidates are compared
+                    to the other half at once, which takes log2(n) comparison rounds
+                - "linear": the candidates are compared one after the other to the
+                    running maximum, which takes n - 1 comparison rounds
 
         return:
             the maximum value (possibly across an axis)
@@ -987,14 +1118,30 @@ class AdditiveSharingTensor(AbstractTensor):
 
         # Make checks and transformation
         assert dim is None or (0 <= dim < n_dim), f"Dim overflow  0 <= {dim} < {n_dim}"
-        # FIXME make it cleaner and robust for more options
-        if n_dim == 2:
-            if dim == None:
-                values = values.view(-1)
-            elif dim == 1:
-                values = values.t()
-        assert n_dim <= 2, "Max on tensor with len(shape) > 2 is not supported."
+        if dim is None:
+            values = values.contiguous().view(-1)
+        elif dim != 0:
+            # Put the dimension to reduce first
+            other_dims = [d for d in range(n_dim) if d != dim]
+            values = values.permute(dim, *other_dims).contiguous()
+
+        if method == "tree":
+            max_value, max_index = securenn.max_tree(values)
+        elif method == "linear":
+            max_value, max_index = self._max_linear(values)
+        else:
+            raise ValueError(f"Unknown method for max: {method}")
 
+        if dim is None and return_idx is False:
+            return max_value
+        else:
+            return max_value, max_index * 1000
+
+    def _max_linear(self, values):
+        """
+        Compare sequentially the candidates on the first dimension of values
+        to the running maximum
+        """
         # Init max vals and idx to the first element
         max_value = values[0]
         max_index = torch.tensor([0]).share(
@@ -1011,14 +1158,11 @@ class AdditiveSharingTensor(AbstractTensor):
             max_index = max_index + beta * (i - max_index)
             max_value = max_value + beta * (a - max_value)
 
-        if dim is None and return_idx is False:
-            return max_value
-        else:
-            return max_value, max_index * 1000
+        return max_value, max_index
 
-    def argmax(self, dim=None):
+    def argmax(self, dim=None, method="tree"):
 
-        max_value, max_index = self.max(dim=dim, return_idx=True)
+        max_value, max_index = self.max(dim=dim, return_idx=True, method=method)
 
         return max_index
 
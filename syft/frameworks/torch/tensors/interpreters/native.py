@@ -875,6 +875,7 @@ class TorchTensor(AbstractTensor):
         field: Union[int, None] = None,
         dtype: Union[str, None] = None,
         crypto_provider: Union[BaseWorker, None] = None,
+        seeded: bool = False,
         requires_grad: bool = False,
         no_wrap: bool = False,
     ):
@@ -882,10 +883,13 @@ class TorchTensor(AbstractTensor):
 
         Args:
             owners (list): A list of BaseWorker objects determining who to send shares to.
-            protocol (str): the crypto protocol used to perform the computations ('snn' or 'fss')
+            protocol (str): the crypto protocol used to perform the computations ('snn', 'fss'
+                or 'auto' to select the fastest one for each operation)
             field (int or None): The arithmetic field where live the shares.
             dtype (str or None): The dtype of shares
             crypto_provider (BaseWorker or None): The worker providing the crypto primitives.
+            seeded (bool): If True, all the shares but one are sent as short PRG seeds
+                which are expanded by their owners, instead of full random tensors.
             requires_grad (bool): Should we add AutogradTensor to allow gradient computation,
                 default is False.
         """
@@ -901,6 +905,7 @@ class TorchTensor(AbstractTensor):
                 field=field,
                 dtype=dtype,
                 crypto_provider=crypto_provider,
+                seeded=seeded,
                 **kwargs_,
             )
         else:
@@ -913,6 +918,7 @@ class TorchTensor(AbstractTensor):
                     field=field,
                     dtype=dtype,
                     crypto_provider=crypto_provider,
+                    seeded=seeded,
                     owner=self.owner,
                 )
                 .on(self.copy(), wrap=False)
@@ -2,6 +2,9 @@ import torch
 import warnings
 
 import syft
+from syft.frameworks.torch.mpc import approximation
+from syft.frameworks.torch.mpc.truncation import METHODS as truncation_methods
+from syft.frameworks.torch.mpc.truncation import truncate as truncate_shares
 from syft.frameworks.torch.nn import nn
 from syft.frameworks.torch.tensors.interpreters.additive_shared import AdditiveSharingTensor
 from syft.generic.frameworks.hook import hook_args
@@ -21,6 +24,7 @@ class FixedPrecisionTensor(AbstractTensor):
         base: int = 10,
         precision_fractional: int = 3,
         kappa: int = 1,
+        truncation: str = "div",
         tags: set = None,
         description: str = None,
     ):
@@ -38,12 +42,21 @@ class FixedPrecisionTensor(AbstractTensor):
             owner: An optional BaseWorker object to specify the worker on which
                 the tensor is located.
             id: An optional string or integer id of the FixedPrecisionTensor.
+            truncation: the protocol truncating the shares after a multiplication
+                when the tensor is additively shared, "div", "secureml" (2 parties)
+                or "pair" (n parties with a crypto provider), see mpc.truncation
         """
         super().__init__(id=id, owner=owner, tags=tags, description=description)
 
+        if truncation not in truncation_methods:
+            raise ValueError(
+                f"Unsupported truncation {truncation}, use one of {truncation_methods}"
+            )
+
         self.base = base
         self.precision_fractional = precision_fractional
         self.kappa = kappa
+        self.truncation = truncation
         self.dtype = dtype
         if dtype == "long":
             self.field = 2 ** 64
@@ -81,6 +94,7 @@ class FixedPrecisionTensor(AbstractTensor):
             "precision_fractional": self.precision_fractional,
             "kappa": self.kappa,
             "dtype": self.dtype,
+            "truncation": self.truncation,
         }
 
     @property
@@ -145,7 +159,10 @@ class FixedPrecisionTensor(AbstractTensor):
         # We need to make sure that values are truncated "towards 0"
         # i.e. for a field of 100, 70 (equivalent to -30), should be truncated
         # at 97 (equivalent to -3), not 7
-        if isinstance(self.child, AdditiveSharingTensor) or not check_sign:  # Handle FPT>(wrap)>AST
+        if isinstance(self.child, AdditiveSharingTensor):
+            self.child = truncate_shares(self.child, truncation, method=self.truncation)
+            return self
+        elif not check_sign:  # Handle FPT>(wrap)>AST
             self.child = self.child / truncation
             return self
         else:
@@ -357,7 +374,19 @@ class FixedPrecisionTensor(AbstractTensor):
 
     mul_ = __imul__
 
-    def div(self, other):
+    def div(self, other, method="division", **kwargs):
+        """
+        Divide self by other
+
+        Args:
+            other: the divisor
+            method (str): how a private divisor is handled, see reciprocal.
+                (default = "division")
+            kwargs: extra arguments of the method, like bound for "nr"
+        """
+        if method != "division" and isinstance(other, FixedPrecisionTensor):
+            return self * other.reciprocal(method=method, **kwargs)
+
         return self.mul_and_div(other, "div")
 
     __truediv__ = div
@@ -443,9 +472,77 @@ class FixedPrecisionTensor(AbstractTensor):
     __matmul__ = matmul
     mm = matmul
 
-    def reciprocal(self):
-        ones = self * 0 + 1
-        return ones / self
+    @staticmethod
+    def _reciprocal_division(tensor):
+        """
+        Compute the reciprocal with an exact private division
+
+        When tensor is shared, this goes bit by bit through the SecureNN
+        division protocol, which costs one private comparison per bit.
+
+        Args:
+            tensor (tensor): values whose reciprocal should be computed
+        """
+        ones = tensor * 0 + 1
+        return ones / tensor
+
+    @staticmethod
+    def _reciprocal_nr(tensor, iterations: int = 10, bound: int = None):
+        """
+        Implementation inspired from FacebookResearch - CrypTen project
+
+        Approximates the reciprocal using Newton-Raphson iterations:
+            y_{n+1} = y_n * (2 - x * y_n)
+        with the initial guess y_0 = 3 * exp(0.5 - x) + 0.003
+
+        The number of communication rounds does not depend on the bit size of
+        the values. The iterations only converge for |x| in (0, 100], so a
+        public bound on the absolute values is required: when it is larger
+        than 100, the values are first divided by ceil(bound / 100).
+
+        Args:
+            tensor (tensor): values whose reciprocal should be approximated
+            iterations (int): number of Newton-Raphson iterations
+            bound (int): public upper bound on the absolute values
+        """
+        if bound is None or bound <= 0:
+            raise ValueError(
+                "The Newton-Raphson reciprocal needs a positive public bound on the absolute "
+                "values, like reciprocal(method='nr', bound=100)."
+            )
+        scale = -(-int(bound) // 100)
+
+        sign = tensor.sign()
+
+        # Make sure the elements are all positive
+        x = tensor * sign
+        if scale > 1:
+            x = x / scale
+
+        result = 3 * (-x + 0.5).exp() + 0.003
+        for _ in range(iterations):
+            result = result * (2 - x * result)
+
+        if scale > 1:
+            result = result / scale
+
+        return result * sign
+
+    def reciprocal(self, method="division", **kwargs):
+        """
+        Computes the reciprocal 1 / self using a given method
+
+        Args:
+            method (str): (default = "division")
+                Possible values: "division", "nr"
+            kwargs: extra arguments of the method, like iterations and bound for "nr"
+        """
+        if method not in ("division", "nr"):
+            raise ValueError(f"Unknown method for reciprocal: {method}")
+
+        reciprocal_f = getattr(self, f"_reciprocal_{method}")
+
+        return reciprocal_f(self, **kwargs)
 
     # Approximations:
     def inverse(self, iterations=8):
@@ -553,6 +650,17 @@ class FixedPrecisionTensor(AbstractTensor):
 
         return tanh_approx.div(2) + 0.5
 
+    @staticmethod
+    def _sigmoid_polynomial(tensor):
+        """
+        Approximates the sigmoid function with a piecewise polynomial of degree 6
+        over [-8, 8], saturated outside of it. See mpc.approximation
+
+        Args:
+            tensor (tensor): values where sigmoid should be approximated
+        """
+        return approximation.approximate(tensor, "sigmoid")
+
     def sigmoid(tensor, method="exp"):
         """
         Approximates the sigmoid function using a given method
@@ -560,7 +668,7 @@ class FixedPrecisionTensor(AbstractTensor):
         Args:
             tensor: the fixed precision tensor
             method (str): (default = "chebyshev")
-                Possible values: "exp", "maclaurin", "chebyshev"
+                Possible values: "exp", "maclaurin", "chebyshev", "polynomial"
         """
 
         sigmoid_f = getattr(tensor, f"_sigmoid_{method}")
@@ -648,6 +756,17 @@ class FixedPrecisionTensor(AbstractTensor):
 
         return 2 * torch.sigmoid(2 * tensor) - 1
 
+    @staticmethod
+    def _tanh_polynomial(tensor):
+        """
+        Approximates the tanh with a piecewise polynomial of degree 6 over [-4, 4],
+        saturated outside of it. See mpc.approximation
+
+        Args:
+            tensor (tensor): values where tanh should be approximated
+        """
+        return approximation.approximate(tensor, "tanh")
+
     def tanh(tensor, method="chebyshev"):
         tanh_f = getattr(tensor, f"_tanh_{method}")
 
@@ -793,7 +912,9 @@ class FixedPrecisionTensor(AbstractTensor):
 
         return response
 
-    def share(self, *owners, protocol=None, field=None, dtype=None, crypto_provider=None):
+    def share(
+        self, *owners, protocol=None, field=None, dtype=None, crypto_provider=None, seeded=False
+    ):
         """
         Forward the .share() command to the child tensor, and reconstruct a new
         FixedPrecisionTensor since the command is not inplace and should return
@@ -801,11 +922,13 @@ class FixedPrecisionTensor(AbstractTensor):
 
         Args:
             *owners: the owners of the shares of the resulting AdditiveSharingTensor
-            protocol: the crypto protocol used to perform the computations ('snn' or 'fss')
+            protocol: the crypto protocol used to perform the computations ('snn', 'fss'
+                or 'auto' to select the fastest one for each operation)
             field: the field size in which the share values live
             dtype: the dtype in which the share values live
             crypto_provider: the worker used to provide the crypto primitives used
                 to perform some computations on AdditiveSharingTensors
+            seeded: if True, all the shares but one are sent as short PRG seeds
 
         Returns:
             A FixedPrecisionTensor whose child has been shared
@@ -821,7 +944,12 @@ class FixedPrecisionTensor(AbstractTensor):
         tensor = FixedPrecisionTensor(owner=self.owner, **self.get_class_attributes())
 
         tensor.child = self.child.share(
-            *owners, protocol=protocol, dtype=dtype, crypto_provider=crypto_provider, no_wrap=True
+            *owners,
+            protocol=protocol,
+            dtype=dtype,
+            crypto_provider=crypto_provider,
+            seeded=seeded,
+            no_wrap=True,
         )
         return tensor
 
@@ -855,6 +983,7 @@ class FixedPrecisionTensor(AbstractTensor):
             tensor.base,
             tensor.precision_fractional,
             tensor.kappa,
+            syft.serde.msgpack.serde._simplify(worker, tensor.truncation),
             syft.serde.msgpack.serde._simplify(worker, tensor.tags),
             syft.serde.msgpack.serde._simplify(worker, tensor.description),
             chain,
@@ -880,6 +1009,7 @@ class FixedPrecisionTensor(AbstractTensor):
             base,
             precision_fractional,
             kappa,
+            truncation,
             tags,
             description,
             chain,
@@ -893,6 +1023,7 @@ class FixedPrecisionTensor(AbstractTensor):
             base=base,
             precision_fractional=precision_fractional,
             kappa=kappa,
+            truncation=syft.serde.msgpack.serde._detail(worker, truncation),
             tags=syft.serde.msgpack.serde._detail(worker, tags),
             description=syft.serde.msgpack.serde._detail(worker, description),
         )
@@ -0,0 +1,166 @@
+"""
+In-process accounting of the communication between workers
+
+Every message goes through BaseWorker.send_msg, or through
+WebsocketClientWorker.async_send_msg for the asynchronous commands, which
+report it to the active CommunicationMonitor. The messages are attributed to
+the high-level operations which caused them, as declared with the track
+decorator or the tracking context manager. This works with any kind of worker,
+including VirtualWorker.
+
+The round depth of the communication is computed with a logical clock per
+worker: a message from A to B sets the clock of B to at least the clock of A
+plus one. A response only creates a dependency when it carries a value back,
+so independent commands sent to several workers count as a single round.
+
+Example:
+    ```
+    with CommunicationMonitor() as monitor:
+        z = x * y
+    print(monitor)
+    monitor.report()["AdditiveSharingTensor.mul"]["bytes"]
+    ```
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+import functools
+
+# The monitors currently recording messages
+monitors = []
+# The names of the operations currently running, from the outermost to the innermost
+_running_ops = []
+
+
+class CommunicationMonitor:
+    """
+    Context manager recording the messages sent between workers in its scope
+
+    Attributes:
+        messages (int): number of messages sent
+        bytes (int): serialized size of the messages and of their responses
+        rounds (int): depth of the longest chain of dependent messages
+    """
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.clocks = defaultdict(int)
+        self.ops = defaultdict(lambda: {"calls": 0, "messages": 0, "bytes": 0, "rounds": 0})
+
+    @property
+    def rounds(self) -> int:
+        return max(self.clocks.values(), default=0)
+
+    def __enter__(self):
+        monitors.append(self)
+        return self
+
+    def __exit__(self, *args):
+        monitors.remove(self)
+
+    def record_message(self, sender_id, recipient_id, n_bytes: int, dependency: bool = True):
+        """
+        Record a message and attribute it to the operations running
+
+        Args:
+            sender_id: id of the worker sending the message
+            recipient_id: id of the worker receiving the message
+            n_bytes (int): serialized size of the message
+            dependency (bool): if False, the message carries no value the recipient
+                depends on, like the acknowledgement of a command, so it doesn't
+                change the round depth
+        """
+        self.bytes += n_bytes
+        if dependency:
+            self.clocks[recipient_id] = max(self.clocks[recipient_id], self.clocks[sender_id] + 1)
+
+        for op_name in set(_running_ops):
+            self.ops[op_name]["bytes"] += n_bytes
+
+    def record_request(self, sender_id, recipient_id, n_bytes: int):
+        """Record a message sent by a worker to another one, whose response is awaited"""
+        self.messages += 1
+        for op_name in set(_running_ops):
+            self.ops[op_name]["messages"] += 1
+
+        self.record_message(sender_id, recipient_id, n_bytes)
+
+    def report(self) -> dict:
+        """
+        Return the communication cost of each tracked operation and the total
+
+        Returns:
+            a dict: operation name -> dict with the number of calls, messages,
+            bytes and rounds of the operation, including the operations it called.
+            The "total" entry covers all the messages recorded.
+        """
+        report = {op_name: dict(stats) for op_name, stats in self.ops.items()}
+        report["total"] = {"messages": self.messages, "bytes": self.bytes, "rounds": self.rounds}
+        return report
+
+    def __str__(self):
+        lines = [f"{'operation':<40}{'calls':>8}{'messages':>10}{'bytes':>14}{'rounds':>8}"]
+        for op_name, stats in sorted(self.ops.items()):
+            lines.append(
+                f"{op_name:<40}{stats['calls']:>8}{stats['messages']:>10}"
+                f"{stats['bytes']:>14}{stats['rounds']:>8}"
+            )
+        lines.append(f"{'total':<40}{'':>8}{self.messages:>10}{self.bytes:>14}{self.rounds:>8}")
+        return "\n".join(lines)
+
+
+def record_request(sender, recipient, n_bytes: int):
+    """Report a message to all the active monitors"""
+    for monitor in monitors:
+        monitor.record_request(sender.id, recipient.id, n_bytes)
+
+
+def record_response(sender, recipient, n_bytes: int, dependency: bool):
+    """Report the response to a message to all the active monitors"""
+    for monitor in monitors:
+        monitor.record_message(sender.id, recipient.id, n_bytes, dependency=dependency)
+
+
+@contextmanager
+def tracking(op_name: str):
+    """
+    Attribute the messages sent in this scope to the operation op_name
+
+    Operations can be nested, the messages are then attributed to all of them.
+    """
+    if not monitors:
+        yield
+        return
+
+    active_monitors = list(monitors)
+    # Nested calls of an operation are already covered by its outermost call
+    outermost = op_name not in _running_ops
+    start_rounds = [monitor.rounds for monitor in active_monitors]
+    if outermost:
+        for monitor in active_monitors:
+            monitor.ops[op_name]["calls"] += 1
+
+    _running_ops.append(op_name)
+    try:
+        yield
+    finally:
+        _running_ops.pop()
+        if outermost:
+            for monitor, start in zip(active_monitors, start_rounds):
+                monitor.ops[op_name]["rounds"] += monitor.rounds - start
+
+
+def track(op_name: str):
+    """Decorator attributing the messages sent by a function to the operation op_name"""
+
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not monitors:
+                return f(*args, **kwargs)
+            with tracking(op_name):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,7 +1,10 @@
 from typing import List
 from typing import Union
 
+import torch
+
 import syft as sy
+from syft.generic.frameworks.hook import hook_args
 from syft.generic.pointers.object_pointer import ObjectPointer
 from syft.workers.abstract import AbstractWorker
 
@@ -100,6 +103,34 @@ class PointerDataset(ObjectPointer):
         )
         return data_elem.wrap(), target_elem.wrap()
 
+    def get_batch(self, indices):
+        """Gets several items of the remote dataset with a single command"""
+        args = [torch.tensor(indices, dtype=torch.long)]
+        data, targets = self.owner.send_command(
+            cmd_name="get_batch",
+            target=self.id_at_location,
+            args_=tuple(args),
+            recipient=self.location,
+        )
+        return data.wrap(), targets.wrap()
+
+    def get_batches(self, batches_indices):
+        """
+        Gets several batches of the remote dataset with a single command. As the
+        number of tensors in the response varies, their ids are generated by the
+        remote worker, in the order of the batches.
+        """
+        args = [[torch.tensor(indices, dtype=torch.long) for indices in batches_indices]]
+        responses = self.owner.send_command(
+            cmd_name="get_batches",
+            target=self.id_at_location,
+            args_=tuple(args),
+            recipient=self.location,
+        )
+        return [
+            (data.wrap(), targets.wrap()) for data, targets in zip(responses[::2], responses[1::2])
+        ]
+
     @staticmethod
     def simplify(worker: AbstractWorker, ptr: "PointerDataset") -> tuple:
 
@@ -142,3 +173,8 @@ class PointerDataset(ObjectPointer):
             )
 
             return ptr
+
+
+# The number of batches fetched by get_batches varies, so the registration of its response
+# must not be cached
+hook_args.register_ambiguous_method("get_batches")
@@ -19,6 +19,8 @@ class PrivateGridNetwork(AbstractGrid):
     def __init__(self, *workers):
         super().__init__()
         self.workers = list(workers)
+        # Encrypted models whose weights have persistent masks, by id
+        self._masked_models = {}
         self._connect_all_nodes(self.workers, NodeClient)
 
     def search(self, *query) -> Dict[Any, Any]:
@@ -48,6 +50,7 @@ class PrivateGridNetwork(AbstractGrid):
         allow_remote_inference: bool = False,
         allow_download: bool = False,
         n_replica: int = 1,
+        persistent_masks: bool = False,
     ):
         """ Choose some node(s) on grid network to host a unencrypted / encrypted model.
             Args:
@@ -57,6 +60,8 @@ class PrivateGridNetwork(AbstractGrid):
                 allow_remote_inference: Allow to run inference remotely.
                 allow_download: Allow to copy the model and run it locally.
                 n_replica: Number of copies distributed through grid network.
+                persistent_masks: With mpc, mask the weights of the model once for all
+                    the encrypted inferences, which then only open the masked inputs.
             Raises:
                 RuntimeError: If grid network doesn't have enough nodes to replicate the model.
                 NotImplementedError: If workers used by grid network aren't grid nodes.
@@ -82,6 +87,11 @@ class PrivateGridNetwork(AbstractGrid):
             else:
                 # Host encrypted model
                 self._host_encrypted_model(model)
+                # A previous version of the model and its masks are stale
+                self._masked_models.pop(model.id, None)
+                if persistent_masks:
+                    # The model is fetched and masked at its first inference
+                    self._masked_models[model.id] = None
 
     def run_remote_inference(self, id: str, data: torch.Tensor, mpc: bool = False) -> torch.Tensor:
         """ Search for a specific model registered on grid network, if found,
@@ -254,6 +264,27 @@ class PrivateGridNetwork(AbstractGrid):
         shared_data = data.fix_precision().share(*mpc_nodes, crypto_provider=crypto_provider)
 
         # Perform Inference
-        fetched_plan = host.hook.local_worker.fetch_plan(id, host, copy=True)
+        if id in self._masked_models:
+            # Reuse the model fetched at the first inference, along with its masks
+            fetched_plan = self._masked_models[id]
+            if fetched_plan is None:
+                fetched_plan = host.hook.local_worker.fetch_plan(id, host, copy=True)
+                self._persist_masks(fetched_plan)
+                self._masked_models[id] = fetched_plan
+        else:
+            fetched_plan = host.hook.local_worker.fetch_plan(id, host, copy=True)
 
         return fetched_plan(shared_data).get().float_prec()
+
+    def _persist_masks(self, model: Plan):
+        """ Mask the encrypted weights of a model once and for all, see
+            AdditiveSharingTensor.persist_mask
+            Args:
+                model: An encrypted model.
+        """
+        for tensor in model.state.tensors():
+            # Decrease in Tensor Hierarchy.
+            while not isinstance(tensor, AdditiveSharingTensor):
+                tensor = tensor.child
+
+            tensor.persist_mask()
@@ -11,9 +11,11 @@ from typing import TYPE_CHECKING
 import syft as sy
 from syft import codes
 from syft.execution.plan import Plan
+from syft.frameworks.torch.mpc import prg
 from syft.frameworks.torch.mpc.primitives import PrimitiveStorage
 from syft.execution.computation import ComputationAction
 from syft.execution.communication import CommunicationAction
+from syft.generic import communication
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.frameworks.remote import Remote
 from syft.generic.frameworks.types import FrameworkTensorType
@@ -190,6 +192,8 @@ class BaseWorker(AbstractWorker):
         self.rank_to_worker_id = None
         # storage object for crypto primitives
         self.crypto_store = PrimitiveStorage(owner=self)
+        # PRG seeds shared with other workers, see store_seed
+        self.seeds = {}
         # declare the plans used for crypto computations
         sy.frameworks.torch.mpc.fss.initialize_crypto_plans(self)
 
@@ -316,12 +320,20 @@ class BaseWorker(AbstractWorker):
         # Step 1: serialize the message to a binary
         bin_message = sy.serde.serialize(message, worker=self)
 
+        if communication.monitors:
+            communication.record_request(self, location, len(bin_message))
+
         # Step 2: send the message and wait for a response
         bin_response = self._send_msg(bin_message, location)
 
         # Step 3: deserialize the response
         response = sy.serde.deserialize(bin_response, worker=self)
 
+        if communication.monitors:
+            communication.record_response(
+                location, self, len(bin_response), dependency=response is not None
+            )
+
         return response
 
     def recv_msg(self, bin_message: bin) -> bin:
@@ -1282,6 +1294,55 @@ class BaseWorker(AbstractWorker):
     def feed_crypto_primitive_store(self, types_primitives: dict):
         self.crypto_store.add_primitives(types_primitives)
 
+    def expand_seeded_share(
+        self,
+        seed: bytes,
+        shape: tuple,
+        dtype: str,
+        min_value: int,
+        max_value: int,
+        counter: int = 0,
+    ):
+        """Expands a seed sent by a dealer into the random share it stands for
+
+        Args:
+            seed: the PRG seed chosen by the dealer
+            shape: the shape of the share
+            dtype: the dtype of the share, "long" or "int"
+            min_value: min value for shares in the field
+            max_value: max value for shares in the field
+            counter: the index of the stream derived from the seed
+
+        Returns:
+            the share, which is registered under the id requested by the dealer
+        """
+        return prg.expand_seed(seed, shape, dtype, min_value, max_value, counter)
+
+    def store_seed(self, seed_id: int, seed: bytes):
+        """Keeps a PRG seed common to several workers, see expand_stored_seed
+
+        Args:
+            seed_id: the id under which the seed is stored
+            seed: the PRG seed
+        """
+        self.seeds[seed_id] = seed
+
+    def expand_stored_seed(
+        self,
+        seed_id: int,
+        shape: tuple,
+        dtype: str,
+        min_value: int,
+        max_value: int,
+        counter: int = 0,
+    ):
+        """Expands a stream of a seed stored with store_seed, see expand_seeded_share
+
+        Returns:
+            the random tensor, which is registered under the id requested
+        """
+        return prg.expand_seed(self.seeds[seed_id], shape, dtype, min_value, max_value, counter)
+
     def list_tensors(self):
         return str(self.object_store._tensors)
 
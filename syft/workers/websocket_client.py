@@ -13,6 +13,7 @@ import asyncio
 import syft as sy
 
 from syft.exceptions import ResponseSignatureError
+from syft.generic import communication
 
 from syft.messaging.message import Message
 from syft.messaging.message import ObjectRequestMessage
@@ -165,6 +166,9 @@ class WebsocketClientWorker(BaseWorker):
             # Step 1: serialize the message to a binary
             bin_message = sy.serde.serialize(message, worker=self)
 
+            if communication.monitors:
+                communication.record_request(self.hook.local_worker, self, len(bin_message))
+
             # Step 2: send the message
             await websocket.send(bin_message)
 
@@ -174,6 +178,11 @@ class WebsocketClientWorker(BaseWorker):
             # Step 4: deserialize the response
             response = sy.serde.deserialize(bin_response, worker=self)
 
+            if communication.monitors:
+                communication.record_response(
+                    self, self.hook.local_worker, len(bin_response), dependency=response is not None
+                )
+
         return response
 
     async def async_send_command(
@@ -288,6 +297,30 @@ class WebsocketClientWorker(BaseWorker):
         response = self._send_msg(serialized_message)
         return sy.serde.deserialize(response)
 
+    def set_update_encoder(self, encoder_args: dict = None):
+        """Call the set_update_encoder() method on the remote worker, see FederatedClient."""
+        return self._send_msg_and_deserialize("set_update_encoder", encoder_args=encoder_args)
+
+    def get_encoded_update(self) -> dict:
+        """Call the get_encoded_update() method on the remote worker, see FederatedClient."""
+        return self._send_msg_and_deserialize("get_encoded_update")
+
+    def set_model_version(self, obj_id: Union[str, int], version: int):
+        """Call the set_model_version() method on the remote worker, see FederatedClient."""
+        return self._send_msg_and_deserialize("set_model_version", obj_id=obj_id, version=version)
+
+    def apply_model_delta(
+        self, obj_id: Union[str, int], version: int, encoded: dict, new_version: int
+    ) -> bool:
+        """Call the apply_model_delta() method on the remote worker, see FederatedClient."""
+        return self._send_msg_and_deserialize(
+            "apply_model_delta",
+            obj_id=obj_id,
+            version=version,
+            encoded=encoded,
+            new_version=new_version,
+        )
+
     def evaluate(
         self,
         dataset_key: str,
@@ -326,6 +359,12 @@ class WebsocketClientWorker(BaseWorker):
             device=device,
         )
 
+    def evaluate_metrics(self, dataset_key: str, nr_bins: int = -1, device: str = "cpu"):
+        """Call the evaluate_metrics() method on the remote worker, see FederatedClient."""
+        return self._send_msg_and_deserialize(
+            "evaluate_metrics", dataset_key=dataset_key, nr_bins=nr_bins, device=device
+        )
+
     def __str__(self):
         """Returns the string representation of a Websocket worker.
 
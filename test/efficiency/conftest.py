@@ -0,0 +1,17 @@
+import pytest
+
+from syft.frameworks.torch.mpc import securenn
+
+
+@pytest.fixture
+def comparison_counter(monkeypatch):
+    """Count the calls to relu_deriv, which is the comparison round of SecureNN"""
+    counter = {"comparisons": 0}
+    relu_deriv = securenn.relu_deriv
+
+    def counting_relu_deriv(a_sh):
+        counter["comparisons"] += 1
+        return relu_deriv(a_sh)
+
+    monkeypatch.setattr(securenn, "relu_deriv", counting_relu_deriv)
+    return counter
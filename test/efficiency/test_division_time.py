@@ -0,0 +1,34 @@
+import time
+
+import torch
+
+from test.efficiency.assertions import assert_time
+
+
+@assert_time(max_time=60)
+def test_reciprocal_nr_vs_division(workers, comparison_counter, record_property):
+    """Compare the comparison rounds, the time and the accuracy of the reciprocal methods"""
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+    t = torch.rand(100) * 20 + 0.5
+    x = t.fix_prec(precision_fractional=4).share(bob, alice, crypto_provider=james)
+
+    results = {}
+    for method, kwargs in (("division", {}), ("nr", {"bound": 100})):
+        comparison_counter["comparisons"] = 0
+        t0 = time.time()
+        r = x.reciprocal(method=method, **kwargs)
+        duration = time.time() - t0
+        error = (r.get().float_prec() - t.reciprocal()).abs().max().item()
+        results[method] = (comparison_counter["comparisons"], duration, error)
+
+        record_property(f"{method}_comparisons", results[method][0])
+        record_property(f"{method}_seconds", duration)
+        record_property(f"{method}_max_error", error)
+
+    division_rounds, division_time, _ = results["division"]
+    nr_rounds, nr_time, nr_error = results["nr"]
+
+    assert nr_rounds < division_rounds
+    # The bit-serial division runs a comparison per bit of the field
+    assert nr_time < division_time
+    assert nr_error < 1 / 100
@@ -0,0 +1,47 @@
+import math
+import time
+
+import pytest
+import torch
+
+from test.efficiency.assertions import assert_time
+
+
+@pytest.mark.parametrize("n", [8, 32])
+@assert_time(max_time=60)
+def test_max_tree_vs_linear(n, workers, comparison_counter, record_property):
+    """Compare the comparison rounds and the time of the tree and linear max"""
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+    t = torch.randn(n, 10)
+    x = t.fix_prec().share(bob, alice, crypto_provider=james).child.child
+
+    results = {}
+    for method in ("tree", "linear"):
+        comparison_counter["comparisons"] = 0
+        t0 = time.time()
+        max_value, _ = x.max(dim=0, method=method)
+        results[method] = (comparison_counter["comparisons"], time.time() - t0)
+
+        record_property(f"{method}_comparisons", results[method][0])
+        record_property(f"{method}_seconds", results[method][1])
+        assert (max_value.get() == t.fix_prec().child.child.max(dim=0)[0]).all()
+
+    tree_rounds, tree_time = results["tree"]
+    linear_rounds, linear_time = results["linear"]
+
+    assert tree_rounds == math.ceil(math.log2(n))
+    assert linear_rounds == n - 1
+    if n >= 32:
+        # With few values the gap is too small to be measured reliably
+        assert tree_time < linear_time
+
+
+@assert_time(max_time=20)
+def test_argmax_tree(workers):
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+
+    t = torch.randn(64, 64)
+    x = t.fix_prec().share(bob, alice, crypto_provider=james)
+    ids = x.argmax(dim=1).get().float_prec()
+
+    assert (ids.long() == torch.argmax(t, dim=1)).all()
@@ -0,0 +1,60 @@
+import pytest
+
+import torch
+import torch.nn as nn
+import syft as sy
+
+from syft.federated.metrics import EvaluationMetrics
+from syft.federated.metrics import evaluate_workers
+
+
+def test_evaluation_metrics():
+    output = torch.tensor([[0.9, 0.1, 0.0], [0.2, 0.7, 0.1], [0.1, 0.1, 0.8], [0.6, 0.3, 0.1]])
+    target = torch.tensor([0, 1, 1, 0])
+
+    metrics = EvaluationMetrics(nr_bins=3)
+    metrics.update(output[:2], target[:2], loss=torch.tensor(0.5))
+    other = EvaluationMetrics(nr_bins=3)
+    other.update(output[2:], target[2:], loss=torch.tensor(1.5))
+
+    # The metrics can be merged after being sent
+    metrics.merge(EvaluationMetrics.from_state(other.state()))
+
+    assert metrics.nr_predictions == 4
+    assert metrics.nr_correct.item() == 3
+    assert metrics.loss == 0.5
+    assert (metrics.histogram_target == torch.tensor([2, 2, 0])).all()
+    assert (metrics.histogram_pred == torch.tensor([2, 1, 1])).all()
+    assert (metrics.confusion_matrix == torch.tensor([[2, 0, 0], [0, 1, 1], [0, 0, 0]])).all()
+
+    with pytest.raises(ValueError):
+        metrics.merge(EvaluationMetrics())
+
+
+@pytest.mark.asyncio
+async def test_evaluate_workers(hook, workers):
+    alice, bob = workers["alice"], workers["bob"]
+
+    data = torch.tensor([[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [0.0, 1.0], [1.0, 0.0]])
+    target = torch.tensor([0, 1, 0, 0, 1])
+    alice.add_dataset(sy.BaseDataset(data[:3], target[:3]), key="eval")
+    bob.add_dataset(sy.BaseDataset(data[3:], target[3:]), key="eval")
+
+    @hook.torch.jit.script
+    def loss_fn(pred, target):
+        return ((pred[:, 0] - target.float()) ** 2).mean()
+
+    linear = nn.Linear(2, 2)
+    with torch.no_grad():
+        linear.weight.copy_(torch.eye(2))
+        linear.bias.zero_()
+    model = torch.jit.trace(linear, data)
+
+    metrics, worker_metrics = await evaluate_workers(
+        [alice, bob], "eval", nr_bins=2, model=model, loss_fn=loss_fn
+    )
+
+    assert metrics.nr_predictions == 5
+    assert metrics.nr_correct.item() == 3
+    assert worker_metrics["alice"].nr_correct.item() == 3
+    assert (metrics.confusion_matrix == torch.tensor([[2, 1], [1, 1]])).all()
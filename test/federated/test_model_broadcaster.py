@@ -0,0 +1,55 @@
+import torch
+import torch.nn as nn
+import syft as sy
+
+from syft.federated.model_broadcaster import ModelBroadcaster
+
+
+def test_model_broadcaster(workers):
+    alice = workers["alice"]
+    model = torch.jit.trace(nn.Linear(3, 2), torch.zeros(1, 3))
+
+    broadcaster = ModelBroadcaster()
+    train_config = sy.TrainConfig(model=model, loss_fn=None)
+    train_config.send(alice, broadcaster=broadcaster)
+    model_id = train_config._model_id
+
+    assert broadcaster.full_sends == 1
+
+    # The next versions are applied in place to the model held by alice
+    for _ in range(2):
+        with torch.no_grad():
+            for param in model.parameters():
+                param.add_(1.0)
+        ptr, obj_id = broadcaster.send(model, alice)
+
+        assert obj_id == model_id
+        remote_model = alice.object_store.get_obj(obj_id).obj
+        assert (remote_model.weight.data == model.weight.data).all()
+        assert (remote_model.bias.data == model.bias.data).all()
+
+    assert broadcaster.delta_sends == 2
+
+    # Full send when alice doesn't hold the model anymore
+    alice.object_store.rm_obj(model_id)
+    _, obj_id = broadcaster.send(model, alice)
+    assert obj_id != model_id
+    assert broadcaster.full_sends == 2
+
+
+def test_model_broadcaster_compressed(workers):
+    bob = workers["bob"]
+    model = torch.jit.trace(nn.Linear(10, 10), torch.zeros(1, 10))
+
+    broadcaster = ModelBroadcaster(encoder_args={"bits": 8})
+    _, obj_id = broadcaster.send(model, bob)
+    full_size = broadcaster.sent_bytes
+
+    with torch.no_grad():
+        for param in model.parameters():
+            param.add_(torch.randn(param.shape))
+    broadcaster.send(model, bob)
+
+    remote_model = bob.object_store.get_obj(obj_id).obj
+    assert ((remote_model.weight.data - model.weight.data).abs() < 0.1).all()
+    assert broadcaster.sent_bytes - full_size < full_size / 3
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+import torch
+import torch.nn as nn
+import syft as sy
+
+from syft.federated.round_scheduler import RoundScheduler
+from syft.frameworks.torch.fl import utils
+
+
+@pytest.mark.asyncio
+async def test_round_scheduler(hook, workers):
+    alice, bob, charlie = workers["alice"], workers["bob"], workers["charlie"]
+
+    data, target = utils.create_gaussian_mixture_toy_data(nr_samples=20)
+    alice.add_dataset(sy.BaseDataset(data[:10], target[:10]), key="gaussian_mixture")
+    bob.add_dataset(sy.BaseDataset(data[10:], target[10:]), key="gaussian_mixture")
+    # charlie has no dataset, so its fit fails
+
+    @hook.torch.jit.script
+    def loss_fn(pred, target):
+        return ((pred[:, 0] - target.float()) ** 2).mean()
+
+    model = torch.jit.trace(nn.Linear(2, 1), data)
+
+    scheduler = RoundScheduler(
+        [alice, bob, charlie],
+        loss_fn,
+        "gaussian_mixture",
+        max_concurrency=2,
+        retries=1,
+        aggregator_args={"weights": {"alice": 1, "bob": 3}},
+        batch_size=5,
+    )
+    new_model = await scheduler.fit(model, rounds=2)
+
+    assert len(scheduler.history) == 2
+    report = scheduler.history[-1]
+    assert set(report["latencies"]) == {"alice", "bob"}
+    assert set(report["failures"]) == {"charlie"}
+    assert report["dropped"] == ["charlie"]
+    assert not (new_model.weight.data == model.weight.data).all()
+
+
+@pytest.mark.asyncio
+async def test_round_scheduler_compressed_updates(hook, workers):
+    alice, bob = workers["alice"], workers["bob"]
+
+    data, target = utils.create_gaussian_mixture_toy_data(nr_samples=20)
+    alice.add_dataset(sy.BaseDataset(data[:10], target[:10]), key="gaussian_mixture")
+    bob.add_dataset(sy.BaseDataset(data[10:], target[10:]), key="gaussian_mixture")
+
+    @hook.torch.jit.script
+    def loss_fn(pred, target):
+        return ((pred[:, 0] - target.float()) ** 2).mean()
+
+    model = torch.jit.trace(nn.Linear(2, 1), data)
+
+    scheduler = RoundScheduler(
+        [alice, bob], loss_fn, "gaussian_mixture", encoder_args={"bits": 8}, batch_size=5
+    )
+    new_model = await scheduler.fit(model, rounds=2)
+
+    assert set(scheduler.history[-1]["upload_bytes"]) == {"alice", "bob"}
+    # The residuals of the compression are kept on the workers
+    assert alice.update_encoder.residual is not None
+    assert not (new_model.weight.data == model.weight.data).all()
+
+
+class AsyncWorker(sy.VirtualWorker):
+    """A VirtualWorker whose fit is awaited like the one of a WebsocketClientWorker."""
+
+    def __init__(self, *args, delay=0.0, failures=0, running=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.failures = failures
+        self.running = running
+
+    async def async_fit(self, dataset_key, return_ids=None):
+        self.running["now"] += 1
+        self.running["max"] = max(self.running["max"], self.running["now"])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures > 0:
+                self.failures -= 1
+                raise RuntimeError("fit failed")
+            return self.fit(dataset_key=dataset_key)
+        finally:
+            self.running["now"] -= 1
+
+
+@pytest.mark.asyncio
+async def test_round_scheduler_async_workers(hook):
+    running = {"now": 0, "max": 0}
+    fast, flaky, slow, other = (
+        AsyncWorker(hook, id="fast", delay=0.05, running=running),
+        AsyncWorker(hook, id="flaky", delay=0.05, failures=1, running=running),
+        AsyncWorker(hook, id="slow", delay=2.0, running=running),
+        AsyncWorker(hook, id="other", delay=0.05, running=running),
+    )
+    data, target = utils.create_gaussian_mixture_toy_data(nr_samples=20)
+    for i, worker in enumerate([fast, flaky, slow, other]):
+        dataset = sy.BaseDataset(data[5 * i : 5 * (i + 1)], target[5 * i : 5 * (i + 1)])
+        worker.add_dataset(dataset, key="gaussian_mixture")
+
+    @hook.torch.jit.script
+    def loss_fn(pred, target):
+        return ((pred[:, 0] - target.float()) ** 2).mean()
+
+    model = torch.jit.trace(nn.Linear(2, 1), data)
+
+    scheduler = RoundScheduler(
+        [fast, flaky, slow, other],
+        loss_fn,
+        "gaussian_mixture",
+        max_concurrency=2,
+        timeout=0.5,
+        retries=1,
+        batch_size=5,
+    )
+    await scheduler.fit(model)
+
+    # The workers train concurrently, but never more than max_concurrency at a time
+    assert running["max"] == 2
+    report = scheduler.history[-1]
+    # The failed fit is retried, the fit which times out twice is dropped
+    assert set(report["latencies"]) == {"fast", "flaky", "other"}
+    assert set(report["failures"]) == {"slow"}
+    assert "TimeoutError" in report["failures"]["slow"]
+    assert report["dropped"] == ["slow"]
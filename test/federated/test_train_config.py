@@ -242,6 +242,19 @@ def test_send(workers):
     assert alice.train_config.location == train_config.location
 
 
+def test_send_loader_args(workers):
+    alice = workers["alice"]
+
+    train_config = sy.TrainConfig(
+        model=None, loss_fn=None, num_workers=2, prefetch_factor=4, persistent_workers=True
+    )
+    train_config.send(alice)
+
+    assert alice.train_config.num_workers == 2
+    assert alice.train_config.prefetch_factor == 4
+    assert alice.train_config.persistent_workers
+
+
 def test_send_model_and_loss_fn(workers):
     train_config = sy.TrainConfig(
         batch_size=2, id="send_model_and_loss_fn_tc", model=None, loss_fn=None
@@ -0,0 +1,92 @@
+import torch
+
+from syft.generic import communication
+from syft.generic.communication import CommunicationMonitor
+
+
+def test_monitor_counts_messages(workers):
+    bob, alice = workers["bob"], workers["alice"]
+    x = torch.tensor([1, 2, 3])
+
+    with CommunicationMonitor() as monitor:
+        x_ptr = x.send(bob)
+        y_ptr = x.send(alice)
+
+    # Independent messages only take a single round
+    assert monitor.messages == 2
+    assert monitor.bytes > 0
+    assert monitor.rounds == 1
+
+    with monitor:
+        x_ptr.get()
+
+    # The response carries a value back to the local worker
+    assert monitor.messages == 3
+    assert monitor.rounds == 2
+
+
+def test_monitor_inactive(workers):
+    bob = workers["bob"]
+
+    monitor = CommunicationMonitor()
+    torch.tensor([1, 2, 3]).send(bob).get()
+
+    assert monitor.messages == 0
+    assert monitor.report() == {"total": {"messages": 0, "bytes": 0, "rounds": 0}}
+
+
+def test_monitor_attributes_ops(workers):
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+    x = torch.tensor([1, 2, 3]).share(bob, alice, crypto_provider=james).child
+    y = torch.tensor([4, 5, 6]).share(bob, alice, crypto_provider=james).child
+
+    with CommunicationMonitor() as monitor:
+        z = x * y
+        z = z * y
+
+    report = monitor.report()
+    mul = report["AdditiveSharingTensor.mul"]
+    assert mul["calls"] == 2
+    assert 0 < mul["messages"] <= report["total"]["messages"]
+    assert 0 < mul["bytes"] <= report["total"]["bytes"]
+    assert 0 < mul["rounds"] <= report["total"]["rounds"]
+    assert "AdditiveSharingTensor.mul" in str(monitor)
+
+    assert (z.get() == torch.tensor([16, 50, 108])).all()
+
+
+def test_tracking_nested_ops(workers):
+    bob = workers["bob"]
+
+    @communication.track("outer")
+    def outer():
+        return inner().get()
+
+    @communication.track("inner")
+    def inner():
+        return torch.tensor([1]).send(bob)
+
+    with CommunicationMonitor() as monitor:
+        outer()
+
+    report = monitor.report()
+    assert report["inner"]["messages"] == 1
+    assert report["outer"]["messages"] == 2
+    assert report["outer"]["rounds"] == 2
+
+
+def test_tracking_counts_outermost_calls(workers):
+    bob = workers["bob"]
+
+    @communication.track("recursive")
+    def recursive(n):
+        if n == 0:
+            return torch.tensor([1]).send(bob)
+        return recursive(n - 1)
+
+    with CommunicationMonitor() as monitor:
+        recursive(3)
+
+    report = monitor.report()
+    assert report["recursive"]["calls"] == 1
+    assert report["recursive"]["messages"] == 1
@@ -551,7 +551,7 @@ def make_fixedprecisiontensor(**kwargs):
     workers = kwargs["workers"]
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
     t = torch.tensor([[3.1, 4.3]])
-    fpt_tensor = t.fix_prec(base=12, precision_fractional=5).share(
+    fpt_tensor = t.fix_prec(base=12, precision_fractional=5, truncation="pair").share(
         alice, bob, crypto_provider=james
     )
     fpt = fpt_tensor.child
@@ -571,6 +571,7 @@ def make_fixedprecisiontensor(**kwargs):
         assert detailed.base == original.base
         assert detailed.precision_fractional == original.precision_fractional
         assert detailed.kappa == original.kappa
+        assert detailed.truncation == original.truncation
         assert detailed.tags == original.tags
         assert detailed.description == original.description
         return True
@@ -589,6 +590,7 @@ def make_fixedprecisiontensor(**kwargs):
                     12,  # (int) base
                     5,  # (int) precision_fractional
                     fpt.kappa,  # (int) kappa
+                    (CODE[str], (b"pair",)),  # (str) truncation
                     (CODE[set], ((CODE[str], (b"tag1",)),)),  # (set of str) tags
                     (CODE[str], (b"desc",)),  # (str) description
                     msgpack.serde._simplify(
@@ -1238,6 +1240,9 @@ def make_trainconfig(**kwargs):
         assert detailed.optimizer_args == original.optimizer_args
         assert detailed.max_nr_batches == original.max_nr_batches
         assert detailed.shuffle == original.shuffle
+        assert detailed.num_workers == original.num_workers
+        assert detailed.prefetch_factor == original.prefetch_factor
+        assert detailed.persistent_workers == original.persistent_workers
         return True
 
     return [
@@ -1255,6 +1260,9 @@ def make_trainconfig(**kwargs):
                     conf.id,  # (int or str)
                     -1,  # (int) max_nr_batches
                     True,  # (bool) shuffle
+                    0,  # (int) num_workers
+                    2,  # (int) prefetch_factor
+                    False,  # (bool) persistent_workers
                 ),
             ),
             "cmp_detailed": compare,
@@ -0,0 +1,43 @@
+import pytest
+
+import torch as th
+
+from syft.frameworks.torch.fl.compression import UpdateEncoder
+from syft.frameworks.torch.fl.compression import decode_update
+from syft.frameworks.torch.fl.compression import encoded_size
+
+
+@pytest.mark.parametrize("bits", [4, 8])
+def test_quantization(bits):
+    update = th.randn(1001)
+    encoder = UpdateEncoder(bits=bits, error_feedback=False)
+
+    encoded = encoder.encode(update)
+    decoded = decode_update(encoded)
+
+    assert decoded.shape == update.shape
+    # Each value is rounded to one of the 2 levels around it
+    step = (update.max() - update.min()) / (2 ** bits - 1)
+    assert ((decoded - update).abs() <= step + 1e-5).all()
+    assert encoded_size(encoded) == (1001 if bits == 8 else 501)
+    assert encoder.compression_ratio > 32 / bits - 0.1
+
+
+def test_sparsification():
+    update = th.tensor([0.1, -5.0, 0.2, 3.0, -0.3, 0.0])
+
+    encoder = UpdateEncoder(top_k=0.34)
+    decoded = decode_update(encoder.encode(update))
+    assert (decoded == th.tensor([0.0, -5.0, 0.0, 3.0, 0.0, 0.0])).all()
+
+    # The dropped values are sent with the next update
+    decoded = decode_update(encoder.encode(th.zeros(6)))
+    assert (decoded == th.tensor([0.0, 0.0, 0.2, 0.0, -0.3, 0.0])).all()
+
+    encoder = UpdateEncoder(threshold=0.15, error_feedback=False)
+    encoded = encoder.encode(update)
+    assert (decode_update(encoded) == th.tensor([0.0, -5.0, 0.2, 3.0, -0.3, 0.0])).all()
+    assert encoder.relative_error < 0.1
+
+    with pytest.raises(ValueError):
+        UpdateEncoder(top_k=0.1, threshold=0.1)
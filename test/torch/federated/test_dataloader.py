@@ -1,6 +1,9 @@
 import torch as th
 import syft as sy
 from syft.frameworks.torch import fl
+from syft.frameworks.torch.fl.dataloader import collate_samples
+from syft.frameworks.torch.fl.dataloader import default_collate
+from syft.generic.communication import CommunicationMonitor
 
 
 def test_federated_dataloader(workers):
@@ -136,3 +139,66 @@ def test_federated_dataloader_one_worker(workers):
     num_iterators = len(datasets)
     fdataloader = sy.FederatedDataLoader(fed_dataset, batch_size=2, shuffle=True)
     assert fdataloader.num_iterators == 1, f"{fdataloader.num_iterators} == {1}"
+
+
+def test_federated_dataloader_batched_indexing(workers):
+    bob = workers["bob"]
+    alice = workers["alice"]
+    data = th.arange(12.0).view(6, 2)
+    targets = th.arange(6)
+
+    # Pointers to datasets, and datasets of pointers
+    fed_datasets = [
+        sy.FederatedDataset([fl.BaseDataset(data, targets).send(bob)]),
+        fl.BaseDataset(data, targets).federate((bob, alice)),
+    ]
+    # A single command, or sending the indices and indexing data and targets
+    # (and deleting the indices)
+    for fed_dataset, max_messages in zip(fed_datasets, (1, 4)):
+        dataset = fed_dataset[fed_dataset.workers[0]]
+        indices = [2, 0, 1]
+
+        with CommunicationMonitor() as monitor:
+            batch_data, batch_targets = collate_samples(dataset, indices)
+        assert monitor.messages <= max_messages
+
+        expected_data, expected_targets = default_collate([dataset[i] for i in indices])
+        assert (batch_data.get() == expected_data.get()).all()
+        assert (batch_targets.get() == expected_targets.get()).all()
+
+
+def test_federated_dataloader_prefetch(workers):
+    bob = workers["bob"]
+    data = th.arange(20.0).view(10, 2)
+    targets = th.arange(10)
+    fed_dataset = sy.FederatedDataset([fl.BaseDataset(data, targets).send(bob)])
+
+    fdataloader = sy.FederatedDataLoader(fed_dataset, batch_size=2, prefetch_factor=2)
+    with CommunicationMonitor() as monitor:
+        # Not list(fdataloader), which would also request the length of the dataset
+        batches = [batch for batch in fdataloader]
+    # 5 batches fetched 2 by 2
+    assert monitor.messages == 3
+
+    assert len(batches) == len(fdataloader)
+    assert (th.cat([batch_data.get() for batch_data, _ in batches]) == data).all()
+    assert (th.cat([batch_targets.get() for _, batch_targets in batches]) == targets).all()
+
+    # Each data point stays with its target across groups of different sizes
+    fdataloader = sy.FederatedDataLoader(fed_dataset, batch_size=2, prefetch_factor=3, shuffle=True)
+    for _ in range(2):
+        seen_targets = []
+        for batch_data, batch_targets in fdataloader:
+            batch_data, batch_targets = batch_data.get(), batch_targets.get()
+            assert batch_data.shape == (2, 2) and batch_targets.shape == (2,)
+            assert (batch_data == data[batch_targets]).all()
+            seen_targets += batch_targets.tolist()
+        assert sorted(seen_targets) == list(range(10))
+
+    # Prefetched batches are dropped when a new epoch starts
+    iterator = iter(fdataloader)
+    next(iterator)
+    queue = fdataloader.iterators[0].batch_queues["bob"]
+    assert len(queue.batches) == 2
+    iter(fdataloader)
+    assert len(queue.batches) == 0
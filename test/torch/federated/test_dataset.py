@@ -2,7 +2,9 @@ import pytest
 import torch as th
 import syft as sy
 
+from syft.federated.federated_client import FederatedClient
 from syft.frameworks.torch.fl import BaseDataset
+from syft.frameworks.torch.fl import MemmapDataset
 
 
 def test_base_dataset(workers):
@@ -40,6 +42,55 @@ def test_base_dataset_transform():
     assert expected_val.equal(th.tensor(transformed_val).long())
 
 
+def test_base_dataset_batch_transform():
+    inputs = th.tensor([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    targets = th.tensor([0, 1, 2])
+    calls = []
+
+    def normalize(batch):
+        calls.append(batch.shape)
+        return (batch - batch.mean(dim=1, keepdim=True)) * 2
+
+    dataset = BaseDataset(inputs, targets, transform=normalize, batch_transform=True)
+
+    data, target = dataset[1]
+    assert (data == th.tensor([-1.0, 1.0])).all() and target == 1
+
+    # The transform is applied once to the whole batch
+    calls.clear()
+    data, target = dataset.get_batch([2, 0])
+    assert calls == [th.Size([2, 2])]
+    assert (data == th.tensor([[-1.0, 1.0], [-1.0, 1.0]])).all()
+    assert (target == th.tensor([2, 0])).all()
+
+
+def test_memmap_dataset(tmp_path):
+    inputs = th.arange(20.0).view(10, 2)
+    targets = th.arange(10)
+    dataset = MemmapDataset.create(
+        inputs, targets, str(tmp_path / "data.npy"), str(tmp_path / "targets.npy")
+    )
+
+    assert len(dataset) == 10
+    data, target = dataset[3]
+    assert (data == inputs[3]).all() and target == 3
+
+    data, target = dataset.get_batch([7, 2, 5])
+    assert (data == inputs[[7, 2, 5]]).all()
+    assert (target == th.tensor([7, 2, 5])).all()
+
+    # FederatedClient reads the dataset batch by batch
+    fed_client = FederatedClient()
+    fed_client.add_dataset(dataset, key="memmap")
+    fed_client.set_obj(sy.TrainConfig(model=None, loss_fn=None, batch_size=4))
+    batches = list(fed_client._create_data_loader("memmap"))
+    assert [len(target) for _, target in batches] == [4, 4, 2]
+    assert (th.cat([data for data, _ in batches]) == inputs).all()
+
+    with pytest.raises(TypeError):
+        dataset.transform(lambda x: x * 2)
+
+
 def test_federated_dataset(workers):
     bob = workers["bob"]
     alice = workers["alice"]
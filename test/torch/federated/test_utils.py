@@ -1,3 +1,6 @@
+import asyncio
+import weakref
+
 import pytest
 
 import torch as th
@@ -116,6 +119,103 @@ def test_scale_model():
     assert (new_model.fc1.bias.data == (bias1 * scale)).all()
 
 
+def test_federated_avg():
+    class Net(th.nn.Module):
+        def __init__(self):
+            super(Net, self).__init__()
+            self.fc1 = th.nn.Linear(2, 2)
+
+    weights = [th.tensor([[1.0, 2.0], [3.0, 4.0]]), th.tensor([[11.0, 22.0], [33.0, 44.0]])]
+    biases = [th.tensor([-1.0, -2.0]), th.tensor([1.0, 2.0])]
+
+    models = {}
+    for i, (weight, bias) in enumerate(zip(weights, biases)):
+        net = Net()
+        with th.no_grad():
+            net.fc1.weight.set_(weight.clone())
+            net.fc1.bias.set_(bias.clone())
+        models[i] = net
+
+    avg_model = utils.federated_avg(models)
+
+    assert (avg_model.fc1.weight.data == (weights[0] + weights[1]) / 2).all()
+    assert (avg_model.fc1.bias.data == (biases[0] + biases[1]) / 2).all()
+    # The client models are not modified
+    assert (models[0].fc1.weight.data == weights[0]).all()
+    assert avg_model is not models[0]
+
+    avg_model = utils.federated_avg(models, weights={0: 3, 1: 1})
+    assert (avg_model.fc1.weight.data == (3 * weights[0] + weights[1]) / 4).all()
+
+    # Models can be added one at a time
+    averager = utils.ModelAverager(Net())
+    for i in models:
+        averager.add(models[i], weight=i + 1)
+    assert averager.nr_models == 2
+    assert (averager.result().fc1.bias.data == (biases[0] + 2 * biases[1]) / 3).all()
+
+    # Without a template, the first model added is not kept
+    averager = utils.ModelAverager()
+    model = Net()
+    model_ref = weakref.ref(model)
+    averager.add(model)
+    del model
+    assert model_ref() is None
+    assert isinstance(averager.result(), Net)
+
+
+def test_federated_avg_script_modules():
+    data = th.zeros(1, 2)
+    models = {}
+    for i in range(2):
+        model = th.nn.Linear(2, 1)
+        with th.no_grad():
+            model.weight.fill_(i)
+        models[i] = th.jit.trace(model, data)
+
+    # Script modules can't be deep copied, the result is a copy through serialization
+    avg_model = utils.federated_avg(models)
+    assert isinstance(avg_model, th.jit.ScriptModule)
+    assert (avg_model.weight.data == 0.5).all()
+    assert (models[0].weight.data == 0.0).all()
+
+
+@pytest.mark.asyncio
+async def test_streaming_aggregator():
+    def linear(value):
+        model = th.nn.Linear(2, 1)
+        with th.no_grad():
+            model.weight.fill_(value)
+            model.bias.fill_(value)
+        return model
+
+    async def update(value, delay):
+        await asyncio.sleep(delay)
+        return linear(value), value * 10
+
+    # All the updates are waited for without deadline
+    aggregator = utils.StreamingAggregator(weights={"alice": 3, "bob": 1})
+    model = await aggregator.aggregate({"alice": update(1.0, 0.02), "bob": update(5.0, 0.0)})
+    assert (model.weight.data == 2.0).all()
+    assert aggregator.received == ["bob", "alice"]
+    assert aggregator.results == {"alice": 10.0, "bob": 50.0}
+
+    # Stragglers are dropped after the deadline
+    aggregator = utils.StreamingAggregator(deadline=0.05)
+    updates = {"alice": update(1.0, 0.0), "bob": update(3.0, 0.0), "charlie": update(8.0, 2.0)}
+    model = await aggregator.aggregate(updates)
+    assert (model.bias.data == 2.0).all()
+    assert aggregator.dropped == ["charlie"]
+
+    # Updates received after the deadline until the quorum are discounted
+    aggregator = utils.StreamingAggregator(deadline=0.01, quorum=2, late_weight=0.5)
+    updates = {"alice": update(1.0, 0.0), "bob": update(4.0, 0.1), "charlie": update(8.0, 2.0)}
+    model = await aggregator.aggregate(updates)
+    assert (model.bias.data == 2.0).all()
+    assert aggregator.late == ["bob"]
+    assert aggregator.dropped == ["charlie"]
+
+
 def test_accuracy():
     pred = th.tensor([[0.95, 0.02, 0.03], [0.3, 0.4, 0.3], [0.0, 0.0, 1.0]])
 
@@ -0,0 +1,49 @@
+import pytest
+import torch
+
+from syft.frameworks.torch.mpc.approximation import FUNCTIONS
+from syft.frameworks.torch.mpc.approximation import approximate
+from syft.frameworks.torch.mpc.approximation import get_approximation
+
+
+@pytest.mark.parametrize("name", list(FUNCTIONS))
+def test_default_approximations(name):
+    approximation = get_approximation(name)
+
+    assert approximation.max_error < 1e-3
+    # The coefficients are only computed once
+    assert get_approximation(name) is approximation
+
+    function, intervals, _ = FUNCTIONS[name]
+    x = torch.linspace(intervals[0][0], intervals[-1][1], 100, dtype=torch.float64)
+    assert ((approximation.evaluate_plain(x) - function(x)).abs() < 1e-3).all()
+
+
+def test_approximation_cost():
+    approximation = get_approximation(torch.exp, ((-2, 2),), 15)
+
+    powers = approximation.cost("powers", clamp=False)
+    paterson_stockmeyer = approximation.cost("paterson_stockmeyer", clamp=False)
+
+    assert powers == {"comparisons": 0, "rounds": 4, "multiplications": 14}
+    assert paterson_stockmeyer["multiplications"] < powers["multiplications"]
+
+
+@pytest.mark.parametrize("method", ["powers", "paterson_stockmeyer"])
+def test_approximate(method, workers):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+
+    t = torch.tensor(range(-12, 12)) * 0.5
+    x = t.fix_prec(precision_fractional=4).share(alice, bob, crypto_provider=james)
+
+    # Any elementwise function can be approximated
+    r = approximate(x, torch.erf, intervals=((-3, 0), (0, 3)), degree=7, method=method)
+    assert ((r.get().float_prec() - torch.erf(t)).abs() < 1e-2).all()
+
+    # Default approximations, clamped to their domain
+    r = approximate(x, "tanh", method=method)
+    assert ((r.get().float_prec() - torch.tanh(t)).abs() < 1e-2).all()
+
+    y = (t / 2 + 4).fix_prec(precision_fractional=4).share(alice, bob, crypto_provider=james)
+    r = approximate(y, "log", method=method, clamp=False)
+    assert ((r.get().float_prec() - torch.log(t / 2 + 4)).abs() < 1e-2).all()
@@ -0,0 +1,52 @@
+import pytest
+import torch
+
+from syft.frameworks.torch.mpc.cost_model import CostModel
+from syft.frameworks.torch.mpc.cost_model import cost_model
+
+
+def test_predict():
+    model = CostModel()
+    workers = ("alice", "bob", "james")
+    model.costs[("comp", workers)] = {"snn": (0.5, 0.001), "fss": (0.1, 0.002)}
+
+    assert model.predict("comp", workers, "snn", 100) == pytest.approx(0.6)
+    assert model.predict("comp", workers, "fss", 100) < model.predict("comp", workers, "snn", 100)
+    assert model.predict("comp", workers, "fss", 1000) > model.predict("comp", workers, "snn", 1000)
+
+
+def test_auto_protocol(workers):
+    alice, bob, charlie, james = (
+        workers["alice"],
+        workers["bob"],
+        workers["charlie"],
+        workers["james"],
+    )
+    cost_model.decisions.clear()
+
+    args = (alice, bob)
+    kwargs = dict(protocol="auto", crypto_provider=james)
+
+    x = torch.tensor([3.1, -2.0, 1.5]).fix_prec().share(*args, **kwargs)
+    y = torch.tensor([3.1, 2.1, -1.5]).fix_prec().share(*args, **kwargs)
+
+    assert ((x >= y).get().float_prec() == torch.tensor([1.0, 0.0, 1.0])).all()
+    assert ((x == y).get().float_prec() == torch.tensor([1.0, 0.0, 0.0])).all()
+    assert any(operation == "comp" for operation, _, _ in cost_model.decisions)
+    assert any(operation == "eq" for operation, _, _ in cost_model.decisions)
+    # The tensors keep the auto protocol after the operations
+    assert x.child.child.protocol == "auto"
+
+    # Overrides take precedence over the costs
+    cost_model.override("comp", "snn")
+    cost_model.decisions.clear()
+    assert ((x < y).get().float_prec() == torch.tensor([0.0, 1.0, 0.0])).all()
+    assert set(protocol for _, _, protocol in cost_model.decisions) == {"snn"}
+    cost_model.override("comp")
+
+    # FSS only supports 2 parties
+    cost_model.decisions.clear()
+    x = torch.tensor([3.1, -2.0]).fix_prec().share(alice, bob, charlie, **kwargs)
+    y = torch.tensor([1.0, 1.0]).fix_prec().share(alice, bob, charlie, **kwargs)
+    assert ((x > y).get().float_prec() == torch.tensor([1.0, 0.0])).all()
+    assert set(protocol for _, _, protocol in cost_model.decisions) == {"snn"}
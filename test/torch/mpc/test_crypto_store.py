@@ -1,5 +1,7 @@
 import pytest
+import torch
 
+import syft as sy
 from syft.exceptions import EmptyCryptoPrimitiveStoreError
 
 
@@ -22,3 +24,38 @@ def test_primitives_usage(workers):
 
     with pytest.raises(EmptyCryptoPrimitiveStoreError):
         _ = alice.crypto_store.get_keys("fss_eq", 4, remove=True)
+
+
+def test_provision(workers):
+    me, alice, bob, crypto_provider = (
+        workers["me"],
+        workers["alice"],
+        workers["bob"],
+        workers["james"],
+    )
+
+    @sy.func2plan(args_shape=[(1, 3), (1, 3)], state=(torch.tensor([1.0, -1.0, 0.5]),))
+    def plan(x, y, state):
+        (w,) = state.read()
+        z = x + w
+        return (z > y) + z.eq(y)
+
+    kwargs = dict(crypto_provider=crypto_provider, protocol="fss")
+    plan.fix_precision().share(alice, bob, **kwargs)
+
+    estimate = me.crypto_store.provision(plan, batch_size=2, n_runs=2)
+    assert estimate["fss_comp"] == estimate["fss_eq"] == 6
+    assert len(alice.crypto_store.fss_comp[0]) == len(bob.crypto_store.fss_eq[0]) == 12
+
+    x = torch.tensor([[1.0, 1.0, 1.0], [0.0, 2.0, -1.0]])
+    y = torch.tensor([[2.0, 0.0, 1.5], [0.0, 1.0, -0.5]])
+    for _ in range(2):
+        x_sh = x.fix_prec().share(alice, bob, **kwargs)
+        y_sh = y.fix_prec().share(alice, bob, **kwargs)
+        result = plan(x_sh, y_sh).get().float_prec()
+        z = x + torch.tensor([1.0, -1.0, 0.5])
+        assert (result == (z > y).float() + (z == y).float()).all()
+
+    # The primitives provided were exactly consumed
+    for crypto_type in ("fss_comp", "fss_eq", "xor_add_couple"):
+        assert len(getattr(alice.crypto_store, crypto_type)[0]) == 0
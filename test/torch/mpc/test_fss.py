@@ -2,7 +2,9 @@ import pytest
 import syft
 import torch as th
 
-from syft.frameworks.torch.mpc.fss import DPF, DIF, n
+from syft.frameworks.torch.mpc import fss
+from syft.frameworks.torch.mpc.fss import DPF, DIF, n, batch_eq, batch_le
+from syft.generic.communication import CommunicationMonitor
 
 
 @pytest.mark.parametrize("op", ["eq", "le"])
@@ -62,3 +64,51 @@ def test_fss_class(op):
     y1 = class_.eval(1, x_masked, *k1[1:])
 
     assert (getattr(y0, gather_op)(y1) == th_op(x, 0)).all()
+
+
+@pytest.mark.parametrize("op", ["eq", "le"])
+def test_batch_fss_op(op, workers):
+    me, alice, bob, james = (workers["me"], workers["alice"], workers["bob"], workers["james"])
+    batch_op = {"eq": batch_eq, "le": batch_le}[op]
+    th_op = {"eq": th.eq, "le": th.le}[op]
+    primitive = {"eq": ["fss_eq"], "le": ["fss_comp", "xor_add_couple"]}[op]
+
+    me.crypto_store.provide_primitives(primitive, [alice, bob], n_instances=9)
+
+    t1s = [th.tensor([1, -2, 3]), th.tensor([[0, 5], [-1, 2]]), th.tensor([7, 8])]
+    t2s = [th.tensor([1, 2, -3]), th.tensor([[0, 4], [-1, 3]]), th.tensor([8, 8])]
+    kwargs = dict(protocol="fss", crypto_provider=james)
+    x1s = [t.share(alice, bob, **kwargs).child for t in t1s]
+    x2s = [t.share(alice, bob, **kwargs).child for t in t2s]
+
+    results = batch_op(x1s, x2s)
+
+    assert len(results) == len(t1s)
+    for result, t1, t2 in zip(results, t1s, t2s):
+        assert result.shape == t1.shape
+        assert (result.get() == th_op(t1, t2).long()).all()
+
+
+@pytest.mark.parametrize("op", ["eq", "le"])
+def test_fss_op_rounds(op, workers):
+    me, alice, bob, james = (workers["me"], workers["alice"], workers["bob"], workers["james"])
+    fss_op = {"eq": fss.eq, "le": fss.le}[op]
+    th_op = {"eq": th.eq, "le": th.le}[op]
+    primitive = {"eq": ["fss_eq"], "le": ["fss_comp", "xor_add_couple"]}[op]
+
+    t1 = th.tensor([[1, -2], [3, 4]])
+    t2 = th.tensor([[1, 2], [-3, 5]])
+    kwargs = dict(protocol="fss", crypto_provider=james)
+    x1 = t1.share(alice, bob, **kwargs).child
+    x2 = t2.share(alice, bob, **kwargs).child
+
+    rounds = {}
+    for fused in (False, True):
+        me.crypto_store.provide_primitives(primitive, [alice, bob], n_instances=t1.numel())
+        with CommunicationMonitor() as monitor:
+            result = fss_op(x1, x2, fused=fused)
+        assert (result.get() == th_op(t1, t2).long()).all()
+        rounds[fused] = monitor.rounds
+
+    # The masked values are opened among the workers instead of through the local worker
+    assert 0 < rounds[True] < rounds[False]
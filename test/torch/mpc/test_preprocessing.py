@@ -0,0 +1,34 @@
+import torch
+
+import syft as sy
+from syft.frameworks.torch.mpc.preprocessing import estimate_primitives
+
+
+def test_estimate_primitives(workers):
+    @sy.func2plan(args_shape=[(2, 3), (2, 3)], state=(torch.tensor([1.0, -1.0, 0.5]),))
+    def plan(x, y, state):
+        (w,) = state.read()
+        z = x * y + w
+        return (z > y) + z.eq(y) + z.max(dim=1)[0].unsqueeze(1)
+
+    estimate = estimate_primitives(plan)
+    # 6 values compared with >, and a tournament of 3 candidates per row: 2 + 1 comparisons
+    assert estimate["fss_comp"] == estimate["xor_add_couple"] == 6 + 2 * 3
+    assert estimate["fss_eq"] == 6
+    assert estimate["beaver"] == {("mul", (2, 3), (2, 3)): 1}
+
+    estimate = estimate_primitives(plan, batch_size=5)
+    assert estimate["fss_comp"] == 15 + 5 * 3
+    assert estimate["fss_eq"] == 15
+    assert estimate["beaver"] == {("mul", (5, 3), (5, 3)): 1}
+
+
+def test_estimate_primitives_composite_ops(workers):
+    @sy.func2plan(args_shape=[(2, 3)])
+    def plan(x):
+        return x.sign() + x * x + x.pow(5)
+
+    estimate = estimate_primitives(plan)
+    assert estimate["fss_comp"] == estimate["xor_add_couple"] == 2 * 6
+    # x * x takes 1 multiplication and x ** 5 takes 3 squares and 1 product
+    assert estimate["beaver"] == {("mul", (2, 3), (2, 3)): 1 + 4}
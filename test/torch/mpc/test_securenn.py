@@ -4,15 +4,20 @@ import torch
 
 import syft
 from syft.frameworks.torch.mpc.securenn import (
+    _common_random,
+    _party_selector,
+    _random_common_permutation,
     private_compare,
     decompose,
     share_convert,
     relu_deriv,
     division,
+    max_tree,
     maxpool,
     maxpool2d,
     maxpool_deriv,
 )
+from syft.generic.communication import CommunicationMonitor
 from syft.generic.pointers.multi_pointer import MultiPointerTensor
 
 
@@ -53,6 +58,39 @@ def test_xor_implementation(workers):
     assert (w.virtual_get() == w_real).all()
 
 
+def test_common_randomness(workers):
+    alice, bob, charlie = workers["alice"], workers["bob"], workers["charlie"]
+
+    r1 = _common_random((3, 2), "int", 1, 67, alice, bob, charlie)
+    r2 = _common_random((3, 2), "int", 1, 67, alice, bob, charlie)
+    r1_alice, r1_bob, r1_charlie = r1.virtual_get()
+    assert r1_alice.dtype == torch.int32 and r1_alice.shape == (3, 2)
+    assert (r1_alice == r1_bob).all() and (r1_alice == r1_charlie).all()
+    assert ((r1_alice >= 1) & (r1_alice < 67)).all()
+    # Each call derives a new stream from the seed
+    assert (r2.virtual_get()[0] != r1_alice).any()
+
+    perm_alice, perm_bob = _random_common_permutation(10, alice, bob).virtual_get()
+    assert (perm_alice == perm_bob).all()
+    assert (perm_alice.sort()[0] == torch.arange(10)).all()
+
+    # The seed is only sent once per set of workers, then each worker gets a counter
+    # (the result is kept so that its deletion is not counted)
+    with CommunicationMonitor() as monitor:
+        r3 = _common_random((3, 2), "long", 1, 67, alice, bob, charlie)
+    assert monitor.messages == 3
+
+    # A restarted worker has lost the seed, which is sent again
+    alice = syft.VirtualWorker(id="alice", hook=alice.hook, is_client_worker=False)
+    with CommunicationMonitor() as monitor:
+        r4 = _common_random((3, 2), "long", 1, 67, alice, bob, charlie)
+    assert monitor.messages == 6
+    r4_alice, r4_bob, r4_charlie = r4.virtual_get()
+    assert (r4_alice == r4_bob).all() and (r4_alice == r4_charlie).all()
+
+    assert [j.item() for j in _party_selector(alice, bob).virtual_get()] == [1, 0]
+
+
 def test_private_compare(workers):
     """
     Test private compare which returns: β′ = β ⊕ (x > r).
@@ -268,6 +306,28 @@ def test_maxpool(workers):
     assert ind.get() == torch.tensor(2)
 
 
+@pytest.mark.parametrize("dtype", ["long", "int"])
+def test_max_tree(workers, dtype):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+    t = torch.tensor([[10, 0, -3], [15, 7, 2], [-1, 9, 2], [4, 8, 11], [6, -5, 1]])
+    x = t.share(alice, bob, crypto_provider=james, dtype=dtype).child
+
+    max, ind = max_tree(x)
+    expected_max, expected_ind = t.max(dim=0)
+
+    assert (max.get() == expected_max).all()
+    assert (ind.get() == expected_ind).all()
+
+    # On ties, the index of the first max is returned
+    t = torch.tensor([[3, 5], [7, 5], [7, 1], [2, 5]])
+    x = t.share(alice, bob, crypto_provider=james, dtype=dtype).child
+
+    max, ind = max_tree(x)
+
+    assert (max.get() == torch.tensor([7, 5])).all()
+    assert (ind.get() == torch.tensor([1, 0])).all()
+
+
 def test_maxpool_deriv(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
     x = (
@@ -285,6 +345,13 @@ def test_maxpool_deriv(workers):
 
     assert (max_d.get() == torch.tensor([[0, 0], [1, 0]])).all()
 
+    # Several windows laid out along a dimension are processed at once
+    t = torch.tensor([[3, 9, 4], [8, 1, 4], [5, 2, 7]])
+    x = t.share(alice, bob, crypto_provider=james, dtype="long").child
+    max_d = maxpool_deriv(x, dim=1)
+
+    assert (max_d.get() == torch.tensor([[0, 1, 0], [1, 0, 0], [0, 0, 1]])).all()
+
 
 @pytest.mark.parametrize(
     "kernel_size, stride", [(1, 1), (2, 1), (3, 1), (1, 2), (2, 2), (3, 2), (3, 3)]
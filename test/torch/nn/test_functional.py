@@ -126,6 +126,40 @@ def test_torch_nn_functional_conv2d(workers):
     assert (res1 == expected1).all()
 
 
+def test_torch_nn_functional_conv2d_groups(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    im = torch.tensor([[[[1.0, 2.0, 0.5], [3.0, -1.0, 2.0], [0.0, 1.5, 4.0]]] * 4])
+    w = torch.tensor(
+        [
+            [[[1.0, 0.0], [0.5, -1.0]], [[2.0, 1.0], [0.0, 0.5]]],
+            [[[0.0, 1.5], [1.0, 1.0]], [[-0.5, 0.0], [1.0, 2.0]]],
+            [[[1.0, 1.0], [1.0, 1.0]], [[0.0, 0.0], [0.0, 1.0]]],
+            [[[2.0, 0.0], [0.0, 2.0]], [[1.0, -1.0], [-1.0, 1.0]]],
+        ]
+    )
+    expected = torch.conv2d(im, w, stride=1, groups=2)
+
+    res = F.conv2d(im.fix_prec(), w.fix_prec(), stride=1, groups=2).float_prec()
+    assert (res == expected).all()
+
+    im_shared = im.fix_prec().share(bob, alice, crypto_provider=james)
+    w_shared = w.fix_prec().share(bob, alice, crypto_provider=james)
+    res = F.conv2d(im_shared, w_shared, stride=1, groups=2).get().float_prec()
+    assert (res == expected).all()
+
+
+def test_im2col_indices_are_cached():
+    from syft.frameworks.torch.nn.functional import _im2col_indices
+
+    args = (2, 4, 4, 2, 2, 3, 3, (1, 1), (1, 1))
+    indices = _im2col_indices(*args)
+
+    assert len(indices) == 3 * 3
+    assert indices[0] == [0, 1, 4, 5, 16, 17, 20, 21]
+    assert indices[4] == [5, 6, 9, 10, 21, 22, 25, 26]
+    assert _im2col_indices(*args) is indices
+
+
 def test_torch_nn_functional_maxpool(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
     enc_tensor = torch.tensor(
@@ -184,3 +218,17 @@ def test_torch_nn_functional_avgpool(workers):
     r_avg = r_avg.get().float_prec()
     exp_avg = torch.tensor([[3.2500, 5.2500], [2.0000, 2.0000]])
     assert (r_avg == exp_avg).all()
+
+
+def test_torch_nn_functional_pool_batches_channels(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    t = torch.tensor([[1.0, 1, 2, 4], [5, 6, 7, 8], [3, 2, 1, 0], [1, 2, 3, 4]])
+    t = torch.stack([torch.stack([t, -t]), torch.stack([t * 2, t - 1])])
+
+    enc_tensor = t.fix_prec().share(bob, alice, crypto_provider=james)
+
+    r_max = F.max_pool2d(enc_tensor, kernel_size=2).get().float_prec()
+    assert (r_max == torch.max_pool2d(t, kernel_size=2)).all()
+
+    r_avg = F.avg_pool2d(enc_tensor, kernel_size=2).get().float_prec()
+    assert torch.allclose(r_avg, torch.nn.functional.avg_pool2d(t, kernel_size=2), atol=1e-2)
@@ -6,7 +6,9 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 import syft
+from syft.frameworks.torch.mpc import prg
 from syft.frameworks.torch.tensors.interpreters.additive_shared import AdditiveSharingTensor
+from syft.generic.communication import CommunicationMonitor
 
 
 def test_wrap(workers):
@@ -37,6 +39,48 @@ def test_share_get(workers):
     assert (x == t).all()
 
 
+def test_seeded_share_get(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+
+    t = torch.tensor([1, -2, 3])
+    x = t.share(bob, alice, james, seeded=True)
+
+    assert x.child.seeded
+    assert (x.get() == t).all()
+
+    t = torch.tensor([1.5, -2.25])
+    x = t.fix_prec().share(bob, alice, crypto_provider=james, seeded=True)
+
+    assert (x.get().float_prec() == t).all()
+
+
+def test_seeded_share_ops(workers):
+    bob, alice, james, charlie = (
+        workers["bob"],
+        workers["alice"],
+        workers["james"],
+        workers["charlie"],
+    )
+
+    t = torch.tensor([1, 2, 3, 4])
+    x = t.share(bob, alice, charlie, crypto_provider=james, seeded=True)
+
+    assert ((x * x).get() == t * t).all()
+    assert (x.child.refresh().get() == t).all()
+
+
+def test_expand_seed():
+    seed = prg.generate_seed()
+    x = prg.expand_seed(seed, (1000,), "long", -33, 34)
+
+    assert (x == prg.expand_seed(seed, (1000,), "long", -33, 34)).all()
+    assert ((x >= -33) & (x < 34)).all()
+    assert not (x == prg.expand_seed(seed, (1000,), "long", -33, 34, counter=1)).all()
+
+    x = prg.expand_seed(seed, (2, 3), "int", -(2 ** 31), 2 ** 31)
+    assert x.dtype == torch.int32 and x.shape == (2, 3)
+
+
 def test___bool__(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
     x_sh = torch.tensor([[3, 4]]).share(alice, bob, crypto_provider=james)
@@ -572,6 +616,38 @@ def test_matmul(workers):
     assert (z == (m @ m)).all()
 
 
+def test_matmul_persistent_mask(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+
+    w = torch.tensor([[1, -2, 3], [4, 5, -6]])
+    w_sh = w.share(bob, alice, crypto_provider=james)
+    w_masked_sh = w.share(bob, alice, crypto_provider=james)
+    w_masked_sh.child.persist_mask()
+
+    for t in (torch.tensor([[1, 2], [3, 4]]), torch.tensor([[-5, 6], [7, 8], [9, 0]])):
+        x = t.share(bob, alice, crypto_provider=james)
+
+        with CommunicationMonitor() as monitor:
+            z = (x @ w_sh).get()
+        with CommunicationMonitor() as masked_monitor:
+            z_masked = (x @ w_masked_sh).get()
+
+        assert (z == t @ w).all()
+        assert (z_masked == t @ w).all()
+        # Only x - a is opened
+        assert masked_monitor.bytes < monitor.bytes
+
+    # Shape methods keep the mask
+    w_t = w_masked_sh.t()
+    assert w_t.child.mask is not None
+    assert (torch.matmul(w_t, x.t()).get() == w.t() @ t.t()).all()
+
+    # In-place modifications drop the mask
+    w_masked_sh.add_(w_masked_sh)
+    assert w_masked_sh.child.mask is None
+    assert ((x @ w_masked_sh).get() == t @ (2 * w)).all()
+
+
 def test_mm(workers):
     torch.manual_seed(121)  # Truncation might not always work so we set the random seed
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
@@ -840,6 +916,21 @@ def test_argmax(workers, protocol):
     assert (ids.long() == torch.argmax(t, dim=1)).all()
 
 
+@pytest.mark.parametrize("method", ["tree", "linear"])
+def test_max_dim(workers, method):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+
+    t = torch.tensor([[[1, 7, -4], [3, 2, 8]], [[5, -1, 0], [9, 4, 6]]])
+    x = t.share(alice, bob, crypto_provider=james).child
+
+    for dim in range(3):
+        max_value, max_index = x.max(dim=dim, method=method)
+        expected_value, expected_index = t.max(dim=dim)
+
+        assert (max_value.get() == expected_value).all()
+        assert (max_index.get() == expected_index * 1000).all()
+
+
 def test_mod(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
 
@@ -1038,14 +1129,32 @@ def test_dtype(workers):
     )
 
 
+@pytest.mark.parametrize("mode", ["broadcast", "relay"])
+def test_reconstruct(workers, mode):
+    bob, alice, james, charlie = (
+        workers["bob"],
+        workers["alice"],
+        workers["james"],
+        workers["charlie"],
+    )
+    t = torch.tensor([[1, -2], [3, 4]])
+    x_sh = t.share(alice, bob, charlie, crypto_provider=james)
+
+    x = x_sh.child.reconstruct(mode=mode)
+
+    assert isinstance(x, syft.MultiPointerTensor)
+    for worker in (alice, bob, charlie):
+        assert (x.child[worker.id].get() == t).all()
+
+
 def test_garbage_collect_reconstruct(workers):
     bob, alice, james, me = (workers["bob"], workers["alice"], workers["james"], workers["me"])
     a = torch.ones(1, 5)
     a_sh = a.encrypt(workers=[alice, bob], crypto_provider=james)
     a_recon = a_sh.child.child.reconstruct()
 
-    assert len(alice.object_store._objects) == 8
-    assert len(bob.object_store._objects) == 8
+    assert len(alice.object_store._objects) == 10
+    assert len(bob.object_store._objects) == 10
 
 
 def test_garbage_collect_move(workers):
@@ -1053,8 +1162,8 @@ def test_garbage_collect_move(workers):
     a = torch.ones(1, 5).send(alice)
     b = a.copy().move(bob)
 
-    assert len(alice.object_store._objects) == 7
-    assert len(bob.object_store._objects) == 7
+    assert len(alice.object_store._objects) == 9
+    assert len(bob.object_store._objects) == 9
 
 
 def test_garbage_collect_mul(workers):
@@ -1068,5 +1177,5 @@ def test_garbage_collect_mul(workers):
     for _ in range(3):
         c = a * b
 
-    assert len(alice.object_store._objects) == 9
-    assert len(bob.object_store._objects) == 9
+    assert len(alice.object_store._objects) == 11
+    assert len(bob.object_store._objects) == 11
@@ -340,6 +340,89 @@ def test_torch_div(workers):
     assert (z.float_prec() == torch.tensor([[-3.0, -4.1], [1.0, 0.0]])).all()
 
 
+@pytest.mark.parametrize(
+    "truncation, n_workers", [("div", 2), ("secureml", 2), ("pair", 2), ("pair", 3)]
+)
+def test_torch_mul_truncation(truncation, n_workers, workers):
+    bob, alice, charlie, james = (
+        workers["bob"],
+        workers["alice"],
+        workers["charlie"],
+        workers["james"],
+    )
+    owners = (bob, alice, charlie)[:n_workers]
+
+    t = torch.randn(1000) * 10
+    u = torch.randn(1000) * 10
+    x = t.fix_prec(truncation=truncation).share(*owners, crypto_provider=james)
+    y = u.fix_prec(truncation=truncation).share(*owners, crypto_provider=james)
+
+    z = (x * y).get()
+
+    assert z.child.truncation == truncation
+    # The truncated product is off by at most one unit in the last place
+    exact = t.fix_prec().child.child * u.fix_prec().child.child
+    error = (z.child.child * 1000 - exact).abs()
+    assert (error < 2 * 1000).all()
+
+    # Matmul is truncated the same way
+    z = x.view(10, 100).matmul(y.view(100, 10)).get().float_prec()
+    assert ((z - t.view(10, 100).matmul(u.view(100, 10))).abs() < 1).all()
+
+
+def test_truncation_validation(workers):
+    bob, alice, charlie, james = (
+        workers["bob"],
+        workers["alice"],
+        workers["charlie"],
+        workers["james"],
+    )
+
+    with pytest.raises(ValueError):
+        torch.tensor([1.0]).fix_prec(truncation="unknown")
+
+    x = torch.tensor([1.0]).fix_prec(truncation="secureml")
+    x = x.share(bob, alice, charlie, crypto_provider=james)
+    with pytest.raises(AssertionError):
+        x * x
+
+
+@pytest.mark.parametrize("prec_frac, tolerance", [(3, 1 / 100), (4, 1 / 1000)])
+def test_torch_reciprocal_nr(prec_frac, tolerance, workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+
+    t = torch.tensor([0.5, 2.0, -4.0, 10.0, -50.0])
+    t_sh = t.fix_prec(precision_fractional=prec_frac).share(bob, alice, crypto_provider=james)
+    r = t_sh.reciprocal(method="nr", bound=100).get().float_prec()
+    assert ((r - t.reciprocal()).abs() <= tolerance).all()
+
+    with pytest.raises(ValueError):
+        t_sh.reciprocal(method="unknown")
+
+    # The values could be out of the range where the iterations converge
+    with pytest.raises(ValueError):
+        t_sh.reciprocal(method="nr")
+
+    # With a public bound to normalize large values
+    t = torch.tensor([200.0, -500.0, 1000.0])
+    t_sh = t.fix_prec(precision_fractional=prec_frac).share(bob, alice, crypto_provider=james)
+    r = t_sh.reciprocal(method="nr", bound=1000).get().float_prec()
+    assert ((r - t.reciprocal()).abs() <= tolerance).all()
+
+
+def test_torch_div_nr(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+
+    x = torch.tensor([[9.0, 25.42], [-3.3, 0.0]])
+    y = torch.tensor([[3.0, 6.2], [3.3, -4.7]])
+    x_sh = x.fix_prec(precision_fractional=4).share(bob, alice, crypto_provider=james)
+    y_sh = y.fix_prec(precision_fractional=4).share(bob, alice, crypto_provider=james)
+
+    z = x_sh.div(y_sh, method="nr", bound=10).get().float_prec()
+
+    assert ((z - x / y).abs() <= 1 / 100).all()
+
+
 def test_inplace_operations():
     a = torch.tensor([5.0, 6.0]).fix_prec()
     b = torch.tensor([2.0]).fix_prec()
@@ -465,6 +548,8 @@ def test_torch_exp_approx(prec_frac, tolerance, workers):
         ("exp", 4, 1 / 100),
         ("maclaurin", 3, 7 / 100),
         ("maclaurin", 4, 15 / 100),
+        ("polynomial", 3, 2 / 100),
+        ("polynomial", 4, 3 / 1000),
     ],
 )
 def test_torch_sigmoid_approx(method, prec_frac, tolerance, workers):
@@ -492,6 +577,8 @@ def test_torch_sigmoid_approx(method, prec_frac, tolerance, workers):
         ("chebyshev", 4, 2 / 100),
         ("sigmoid", 3, 10 / 100),
         ("sigmoid", 4, 5 / 100),
+        ("polynomial", 3, 2 / 100),
+        ("polynomial", 4, 3 / 1000),
     ],
 )
 def test_torch_tanh_approx(method, prec_frac, tolerance, workers):